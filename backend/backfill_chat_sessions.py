@@ -0,0 +1,81 @@
+import os
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+from repository import message_preview
+
+# Load environment variables
+load_dotenv()
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+
+BATCH_SIZE = 500
+
+def backfill_chat_sessions():
+    """Recompute message_count and last_message_preview for every chat session.
+    
+    Safe to re-run at any time: it repairs counters that drifted as well as
+    filling them in for sessions created before they were maintained.
+    """
+    try:
+        # Connect to MongoDB
+        print("Connecting to MongoDB...")
+        client = MongoClient(MONGODB_URI)
+        db = client["empowHER"]
+        
+        # One pass over chat_messages, newest message first within each session
+        print("Aggregating chat messages per session...")
+        pipeline = [
+            {"$sort": {"session_id": 1, "timestamp": -1}},
+            {"$group": {
+                "_id": "$session_id",
+                "message_count": {"$sum": 1},
+                "last_content": {"$first": "$content"},
+                "last_timestamp": {"$first": "$timestamp"}
+            }}
+        ]
+        
+        updated = 0
+        batch = []
+        counted_sessions = []
+        for summary in db["chat_messages"].aggregate(pipeline, allowDiskUse=True):
+            counted_sessions.append(summary["_id"])
+            batch.append(UpdateOne(
+                {"session_id": summary["_id"]},
+                {"$set": {
+                    "message_count": summary["message_count"],
+                    "last_message_preview": message_preview(summary["last_content"]),
+                    "last_message_timestamp": summary["last_timestamp"]
+                }}
+            ))
+            if len(batch) >= BATCH_SIZE:
+                updated += db["chat_sessions"].bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            updated += db["chat_sessions"].bulk_write(batch, ordered=False).modified_count
+        
+        # Sessions whose messages were all deleted, or that never had any
+        emptied = 0
+        counted_sessions = set(counted_sessions)
+        stale_sessions = [
+            session["session_id"]
+            for session in db["chat_sessions"].find(
+                {"message_count": {"$ne": 0}},
+                projection={"session_id": 1}
+            )
+            if session["session_id"] not in counted_sessions
+        ]
+        for i in range(0, len(stale_sessions), BATCH_SIZE):
+            emptied += db["chat_sessions"].update_many(
+                {"session_id": {"$in": stale_sessions[i:i + BATCH_SIZE]}},
+                {"$set": {"message_count": 0, "last_message_preview": None}}
+            ).modified_count
+        
+        print(f"Updated {updated} sessions with messages and {emptied} without")
+        return True
+    
+    except Exception as e:
+        print(f"Error backfilling chat sessions: {e}")
+        return False
+
+if __name__ == "__main__":
+    backfill_chat_sessions()
@@ -0,0 +1,37 @@
+import os
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+# Load environment variables
+load_dotenv()
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+
+def backfill_search_ids():
+    """Seed search_ids on job results stored before it was maintained.
+
+    Search results are listed by search_ids, which collects every search that
+    returned a job. Older rows only know the last search that stored them
+    (search_id), so that is all they can be listed under. Safe to re-run; rows
+    that already have search_ids are left alone.
+    """
+    try:
+        # Connect to MongoDB
+        print("Connecting to MongoDB...")
+        client = MongoClient(MONGODB_URI)
+        db = client["empowHER"]
+
+        print("Copying search_id into search_ids...")
+        result = db["job_results"].update_many(
+            {"search_ids": {"$exists": False}, "search_id": {"$exists": True}},
+            [{"$set": {"search_ids": ["$search_id"]}}]
+        )
+
+        print(f"Backfilled search_ids on {result.modified_count} job results")
+        return True
+
+    except Exception as e:
+        print(f"Error backfilling search ids: {e}")
+        return False
+
+if __name__ == "__main__":
+    backfill_search_ids()
@@ -0,0 +1,62 @@
+import os
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+# Load environment variables
+load_dotenv()
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+
+BATCH_SIZE = 500
+
+def backfill_user_jobs():
+    """Fill user_jobs from the searches each user ran before it was maintained.
+
+    Best effort: job_results only remembers the last search that stored a job,
+    so jobs a later search took over are attributed to that search's user.
+    Safe to re-run; existing user_jobs documents are upserted in place.
+    """
+    try:
+        # Connect to MongoDB
+        print("Connecting to MongoDB...")
+        client = MongoClient(MONGODB_URI)
+        db = client["empowHER"]
+
+        print("Loading searches with a user...")
+        users_by_search = {
+            search["search_id"]: search["user_id"]
+            for search in db["job_searches"].find(
+                {"user_id": {"$ne": None}},
+                projection={"search_id": 1, "user_id": 1}
+            )
+        }
+
+        upserted = 0
+        batch = []
+        search_ids = list(users_by_search)
+        for i in range(0, len(search_ids), BATCH_SIZE):
+            jobs = db["job_results"].find(
+                {"search_id": {"$in": search_ids[i:i + BATCH_SIZE]}},
+                projection={"_id": 0}
+            )
+            for job in jobs:
+                user_id = users_by_search[job["search_id"]]
+                batch.append(UpdateOne(
+                    {"user_id": user_id, "application_url": job["application_url"]},
+                    {"$set": dict(job, user_id=user_id)},
+                    upsert=True
+                ))
+                if len(batch) >= BATCH_SIZE:
+                    upserted += db["user_jobs"].bulk_write(batch, ordered=False).upserted_count
+                    batch = []
+        if batch:
+            upserted += db["user_jobs"].bulk_write(batch, ordered=False).upserted_count
+
+        print(f"Added {upserted} user jobs from {len(search_ids)} searches")
+        return True
+
+    except Exception as e:
+        print(f"Error backfilling user jobs: {e}")
+        return False
+
+if __name__ == "__main__":
+    backfill_user_jobs()
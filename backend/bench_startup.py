@@ -0,0 +1,120 @@
+"""Measure how long a worker takes to come online.
+
+Reports, each in fresh interpreters:
+
+* the time to ``import main`` and whether langchain was loaded by it,
+* the slowest modules in that import (from ``python -X importtime``),
+* the time from launching uvicorn until the first request is answered.
+
+Run from backend/ with the same .env the API uses:
+
+    python bench_startup.py --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(elapsed, any(name == "langchain" or name.startswith("langchain") for name in sys.modules))
+"""
+
+
+def measure_import() -> Tuple[float, bool]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[-2]), output[-1] == "True"
+
+
+def slowest_imports(count: int) -> List[Tuple[float, str]]:
+    """Cumulative import time per module, slowest first"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR, capture_output=True, text=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative) / 1_000_000, name.rstrip()))
+    # Modules imported directly by main (one level of two-space indent), so
+    # nested modules aren't counted twice
+    top_level = [
+        (seconds, name.strip()) for seconds, name in modules
+        if name.startswith("   ") and not name.startswith("     ")
+    ]
+    return sorted(top_level, reverse=True)[:count]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(path: str, timeout: float) -> float:
+    """Seconds from launching uvicorn until ``path`` answers"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        raise TimeoutError(f"No response from {url} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import and first-request time")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--path", default="/", help="Endpoint to request once the server is up")
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    import_times = []
+    for _ in range(args.runs):
+        seconds, loaded_langchain = measure_import()
+        import_times.append(seconds)
+    print(f"import main:    median {statistics.median(import_times):.3f}s, "
+          f"min {min(import_times):.3f}s over {args.runs} runs")
+    print(f"langchain loaded at import: {'yes' if loaded_langchain else 'no'}")
+
+    print("slowest imports:")
+    for seconds, name in slowest_imports(args.top):
+        print(f"  {seconds:7.3f}s  {name}")
+
+    request_times = [measure_first_request(args.path, args.timeout) for _ in range(args.runs)]
+    print(f"first request ({args.path}): median {statistics.median(request_times):.3f}s, "
+          f"min {min(request_times):.3f}s over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
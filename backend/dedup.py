@@ -0,0 +1,246 @@
+"""Duplicate job detection.
+
+Two layers, both cheap enough to run on every search:
+
+* URL canonicalization catches the same page behind different tracking
+  parameters, hosts or fragments before any Diffbot call is made.
+* 64-bit SimHash fingerprints of a job's title, company and text catch the
+  same role reposted under different URLs (LinkedIn reposts, job board
+  mirrors). Fingerprints are split into bands for LSH lookup, so finding a
+  near duplicate touches a handful of candidates instead of the whole corpus.
+  Job boards repeat the same company blurb and highlights on every role, so
+  a near match only counts when the normalized title and company agree too.
+
+The index is kept in memory and persisted as gzipped JSON, so duplicates are
+recognised against every job seen before, not just the current search. Like
+the search index, the file records the watermark up to which it is complete.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'refid', 'ref_src',
+    'src', 'source', 'trk', 'trkinfo', 'trackingid', 'tracking_id', 'referrer',
+    'originalsubdomain', 'lipi', 'from', 'campaign', 'feature', 'sid',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+# Fingerprints this close are the same job; with 4 bands of 16 bits any pair
+# within 3 bits is guaranteed to share at least one band
+MAX_HAMMING_DISTANCE = 3
+# Too little text makes every short placeholder look alike
+MIN_FINGERPRINT_TOKENS = 8
+SHINGLE_SIZE = 3
+
+_WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a job URL so tracking and cosmetic variants compare equal"""
+    parts = urlsplit((url or '').strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host.endswith(':443') or host.endswith(':80'):
+        host = host.rsplit(':', 1)[0]
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash over word shingles; None when the text is too short"""
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < MIN_FINGERPRINT_TOKENS:
+        return None
+
+    counts = [0] * FINGERPRINT_BITS
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        h = _hash64(' '.join(words[i:i + SHINGLE_SIZE]))
+        for bit in range(FINGERPRINT_BITS):
+            counts[bit] += 1 if h >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, count in enumerate(counts):
+        if count > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def job_fingerprint(job: Dict[str, Any]) -> Optional[int]:
+    """SimHash of the text that identifies a role, independent of where it is posted"""
+    parts = [job.get('title') or '', job.get('company') or '', job.get('summary') or '']
+    parts.extend(job.get('job_highlights') or [])
+    return simhash(' '.join(parts))
+
+
+def job_identity(job: Dict[str, Any]) -> str:
+    """Normalized title and company; near duplicates must share it"""
+    def normalize(value: Optional[str]) -> str:
+        return ' '.join(_WORD_RE.findall((value or '').lower()))
+    return f"{normalize(job.get('title'))}|{normalize(job.get('company'))}"
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    mask = (1 << BAND_BITS) - 1
+    return [(band, fingerprint >> (band * BAND_BITS) & mask) for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    """Canonical URLs and SimHash fingerprints of every job seen so far.
+
+    Each job is represented by the URL it was first stored under; later
+    copies resolve to that representative URL.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # canonical URL -> representative application URL
+        self._urls: Dict[str, str] = {}
+        # representative URL -> fingerprint
+        self._fingerprints: Dict[str, int] = {}
+        # representative URL -> job_identity
+        self._identities: Dict[str, str] = {}
+        # (band, band value) -> representative URLs
+        self._buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self.url_duplicates = 0
+        self.near_duplicates = 0
+        self.version = 0
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._fingerprints
+
+    def resolve_url(self, url: str) -> str:
+        """The representative URL for any variant of ``url`` seen before"""
+        representative = self._urls.get(canonicalize_url(url))
+        if representative is not None and representative != url:
+            self.url_duplicates += 1
+            return representative
+        return url
+
+    def find_near_duplicate(self, fingerprint: int, identity: str) -> Optional[str]:
+        """Representative URL of a stored job with the same identity within MAX_HAMMING_DISTANCE bits"""
+        with self._lock:
+            candidates: Set[str] = set()
+            for key in _bands(fingerprint):
+                candidates.update(self._buckets.get(key, ()))
+            best, best_distance = None, MAX_HAMMING_DISTANCE + 1
+            for url in candidates:
+                if self._identities.get(url) != identity:
+                    continue
+                distance = bin(fingerprint ^ self._fingerprints[url]).count('1')
+                if distance < best_distance:
+                    best, best_distance = url, distance
+        if best is not None:
+            self.near_duplicates += 1
+        return best
+
+    def add(
+        self,
+        url: str,
+        fingerprint: Optional[int] = None,
+        alias_of: Optional[str] = None,
+        identity: Optional[str] = None,
+    ):
+        """Record a job URL, optionally as another copy of ``alias_of``"""
+        representative = alias_of or url
+        canonical = canonicalize_url(url)
+        with self._lock:
+            if canonical not in self._urls:
+                self._urls[canonical] = representative
+                self.version += 1
+            if alias_of is None and fingerprint is not None and url not in self._fingerprints:
+                self._fingerprints[url] = fingerprint
+                self._identities[url] = identity or ''
+                for key in _bands(fingerprint):
+                    self._buckets.setdefault(key, set()).add(url)
+                self.version += 1
+
+    def add_job(self, job: Dict[str, Any]):
+        url = job.get('application_url')
+        if url:
+            self.add(url, job_fingerprint(job), identity=job_identity(job))
+
+    def add_many(self, jobs: Iterable[Dict[str, Any]]):
+        for job in jobs:
+            self.add_job(job)
+
+    def save(self, path: str, watermark: Optional[datetime] = None):
+        with self._lock:
+            data = {
+                "version": INDEX_FORMAT_VERSION,
+                "watermark": watermark.isoformat() if watermark else None,
+                "urls": dict(self._urls),
+                # Hex keeps 64-bit values exact in JSON
+                "fingerprints": {url: format(fp, 'x') for url, fp in self._fingerprints.items()},
+                "identities": dict(self._identities),
+            }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["DuplicateIndex"]:
+        """Read an index written by ``save``; None if missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable duplicate index {path}: {e}")
+            return None
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            return None
+
+        index = cls()
+        if data.get("watermark"):
+            index.watermark = datetime.fromisoformat(data["watermark"])
+        index._urls = data["urls"]
+        index._identities = data["identities"]
+        for url, fp in data["fingerprints"].items():
+            fingerprint = int(fp, 16)
+            index._fingerprints[url] = fingerprint
+            for key in _bands(fingerprint):
+                index._buckets.setdefault(key, set()).add(url)
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "urls": len(self._urls),
+            "fingerprints": len(self._fingerprints),
+            "url_duplicates": self.url_duplicates,
+            "near_duplicates": self.near_duplicates,
+        }
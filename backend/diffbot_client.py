@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DIFFBOT_ANALYZE_URL = "https://api.diffbot.com/v3/analyze"
+
+
+class DiffbotClient:
+    """Shared async client for the Diffbot Analyze API.
+
+    Holds one keep-alive connection pool for the whole worker so every search
+    reuses the same TLS sessions, and caps how many Diffbot calls can be in
+    flight at once across all requests.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        timeout: float = 15.0,
+    ):
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        """Open the connection pool (called from the app lifespan)"""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.info(
+            f"Diffbot client started (pool={self.max_connections}, "
+            f"concurrency={self.max_concurrency}, timeout={self.timeout}s)"
+        )
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            logger.info("Diffbot client closed")
+
+    async def analyze(self, url: str) -> httpx.Response:
+        """Run the Analyze API against a page URL"""
+        if self._client is None:
+            # Lazily start when used outside the lifespan (scripts, tests)
+            await self.start()
+
+        params = {
+            "token": self.api_key,
+            "url": url,
+            "fields": "links,meta,images,sentiment,facts",
+            "discussion": "false",
+            "timeout": str(int(self.timeout * 1000)),
+        }
+
+        async with self._semaphore:
+            return await self._client.get(DIFFBOT_ANALYZE_URL, params=params)
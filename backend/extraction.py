@@ -0,0 +1,174 @@
+"""Precompiled field extraction for job page text.
+
+All patterns are compiled once at import time and ``extract_text_fields``
+collects every field in a single call. Job type alternatives are combined into
+one pattern and found in one scan. The other fields keep one scan per pattern:
+their patterns are tried in priority order, and a combined alternation would
+return the leftmost match instead of the first pattern that matches anywhere.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+DEADLINE_PATTERNS = [
+    re.compile(r'(?:apply by|application deadline|closing date|deadline)(?::|is|.*?:)?\s*(\w+\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4})', re.IGNORECASE),
+    re.compile(r'(?:apply by|application deadline|closing date|deadline)(?::|is|.*?:)?\s*(\d{1,2}(?:st|nd|rd|th)?\s+\w+,?\s+\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}/\d{1,2}/\d{4})(?:.*?deadline)', re.IGNORECASE),
+]
+
+# In priority order: the earliest type found anywhere in the text wins, not
+# the type that appears first
+JOB_TYPES = [
+    ('full-time', r'full[- ]time|full time'),
+    ('part-time', r'part[- ]time|part time'),
+    ('contract', r'contract|contractor'),
+    ('freelance', r'freelance'),
+    ('internship', r'internship|intern'),
+    ('remote', r'remote|work from home|wfh'),
+    ('hybrid', r'hybrid'),
+]
+
+# One named group per type, matched against the lowercased text. No match of
+# one type can overlap the start of another's, so a single finditer pass sees
+# every type present.
+JOB_TYPE_PATTERN = re.compile('|'.join(
+    f'(?P<type{rank}>{pattern})' for rank, (_, pattern) in enumerate(JOB_TYPES)
+))
+
+SALARY_PATTERNS = [
+    re.compile(r'\$\d{2,3}(?:,\d{3})+(?:\s*-\s*\$\d{2,3}(?:,\d{3})+)?(?:\s*per\s*year|\s*annually|\s*/\s*year)?'),
+    re.compile(r'\$\d{2,3}K\s*-\s*\$\d{2,3}K'),
+    re.compile(r'\d{2,3},\d{3}\s*-\s*\d{2,3},\d{3}\s*(?:USD|EUR|GBP)?'),
+]
+
+_EDUCATION_TERMS = [
+    r'(?:bachelor|master|phd|bs|ms|ba|degree|diploma)',
+    r'(?:education|educational)(?:\s+requirements|\s+qualifications)?(?::|.{0,10})(.*?)(?:\n|\n\n)',
+]
+
+# The sentence surrounding the first education mention. A sentence match
+# implies the bare term matches, so no separate probe search is needed.
+EDUCATION_SENTENCE_PATTERNS = [
+    re.compile(r'[^.!?]*(?:' + term + r')[^.!?]*[.!?]', re.IGNORECASE)
+    for term in _EDUCATION_TERMS
+]
+
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+(?:-\d+)?\+?\s+years?(?:\s+of)?\s+experience)', re.IGNORECASE),
+    re.compile(r'experience(?::|.*?:)?\s+(\d+(?:-\d+)?\+?\s+years)', re.IGNORECASE),
+]
+
+HIGHLIGHT_PATTERN = re.compile(
+    r'(?:highlights|why you\'ll love this role|what you\'ll do|responsibilities|key responsibilities)(?::|.{0,10})(.*?)(?:\n\n\w|requirements|qualifications)',
+    re.IGNORECASE | re.DOTALL
+)
+
+QUALIFICATIONS_PATTERN = re.compile(
+    r'(?:requirements|qualifications|what you\'ll need)(?::|.*?:)(.*?)(?:responsibilities|benefits|about us|\n\n\w)',
+    re.DOTALL | re.IGNORECASE
+)
+
+COMPANY_DESCRIPTION_PATTERN = re.compile(
+    r'(?:about us|about the company|company overview)(?::|.{0,10})(.*?)(?:\n\n|\n\s*\n)',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+@dataclass
+class ExtractedFields:
+    """Fields recovered from the free text of a job page"""
+    application_deadline: Optional[str] = None
+    job_type: Optional[str] = None
+    salary_range: Optional[str] = None
+    education_required: Optional[str] = None
+    experience_required: Optional[str] = None
+    job_highlights: List[str] = field(default_factory=list)
+    company_description: Optional[str] = None
+
+
+def _split_points(section: str, keep) -> List[str]:
+    """Split a section into bullet points, falling back to lines"""
+    if '•' in section:
+        return [p.strip() for p in section.split('•') if p.strip()]
+    if '-' in section:
+        return [p.strip() for p in section.split('-') if p.strip()]
+    return [p.strip() for p in section.split('\n') if keep(p.strip())]
+
+
+def _first_group(patterns, text: str, group: int = 1) -> Optional[str]:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(group).strip() if group else match.group(0)
+    return None
+
+
+def extract_qualifications(text: str) -> List[str]:
+    """Up to five points from the page's requirements section, lowercased"""
+    match = QUALIFICATIONS_PATTERN.search(text.lower()) if text else None
+    if not match:
+        return []
+    qualifications = _split_points(match.group(1).strip(), lambda q: bool(q))
+    # Limit to top few qualifications
+    return [q for q in qualifications[:5] if len(q) > 10]
+
+
+def _job_type(lowered: str) -> Optional[str]:
+    best = None
+    for match in JOB_TYPE_PATTERN.finditer(lowered):
+        rank = int(match.lastgroup[len('type'):])
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return JOB_TYPES[best][0] if best is not None else None
+
+
+def extract_text_fields(
+    text: str,
+    want_job_type: bool = True,
+    want_salary: bool = True,
+    want_company_description: bool = True,
+) -> ExtractedFields:
+    """Extract every text-derived job field from the page text in one call.
+
+    The ``want_*`` flags skip fields the caller already has from structured
+    Diffbot data. Qualifications are only shown in job details, which get them
+    from ``extract_qualifications``.
+    """
+    fields = ExtractedFields()
+    if not text:
+        return fields
+
+    if want_company_description:
+        match = COMPANY_DESCRIPTION_PATTERN.search(text)
+        if match:
+            description = match.group(1).strip()
+            if len(description) > 150:
+                description = description[:147] + "..."
+            fields.company_description = description
+
+    fields.application_deadline = _first_group(DEADLINE_PATTERNS, text)
+
+    if want_job_type:
+        fields.job_type = _job_type(text.lower())
+
+    if want_salary:
+        fields.salary_range = _first_group(SALARY_PATTERNS, text, group=0)
+
+    for pattern in EDUCATION_SENTENCE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            # Mirror re.findall: the captured group when there is one
+            fields.education_required = (match.group(1) if pattern.groups else match.group(0)).strip()
+            break
+
+    fields.experience_required = _first_group(EXPERIENCE_PATTERNS, text)
+
+    match = HIGHLIGHT_PATTERN.search(text)
+    if match:
+        points = _split_points(match.group(1).strip(), lambda p: p and len(p) > 15)
+        # Take just 3-5 key highlights
+        fields.job_highlights = points[:5]
+
+    return fields
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from job_parsing import parse_job_basic
+from metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker():
+    """Build the compiled skill and women-friendly tables once per process"""
+    from skills import get_skill_taxonomy
+    from women_friendly import get_women_friendly_classifier
+
+    get_skill_taxonomy()
+    get_women_friendly_classifier()
+
+
+def _ping() -> bool:
+    return True
+
+
+class ExtractionPool:
+    """Optional process pool for parsing Diffbot payloads.
+
+    Page parsing is pure-Python regex and classification work, so on the event
+    loop (or in threads) it competes for the one GIL with every request. With
+    ``workers > 0`` payloads are parsed in separate processes that preload the
+    pattern tables when they start; with ``workers == 0`` parsing runs in a
+    thread, which still keeps it off the event loop.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = max(0, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.latency = LatencyRecorder()
+        self.parsed = 0
+        self.threaded = 0
+        self.failures = 0
+
+    async def start(self):
+        """Spawn and warm the worker processes (called from the app lifespan)"""
+        if self.workers == 0 or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        # Processes start lazily; one task per worker brings them all up now
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+        logger.info(f"Extraction pool started ({self.workers} worker processes)")
+
+    async def close(self):
+        """Shut the worker processes down"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+            logger.info("Extraction pool closed")
+
+    async def parse(self, url: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """JobBasic fields for a payload, parsed in a worker process when enabled"""
+        start = time.perf_counter()
+        try:
+            if self._executor is None:
+                self.threaded += 1
+                return await asyncio.to_thread(parse_job_basic, url, data)
+            executor = self._executor
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(executor, parse_job_basic, url, data)
+            except BrokenProcessPool:
+                # A crashed worker poisons the whole pool; parse this one in a
+                # thread and replace the pool (once) for the next requests
+                if self._executor is executor:
+                    logger.error("Extraction pool broke, restarting it")
+                    self.failures += 1
+                    self._executor = None
+                    executor.shutdown(wait=False)
+                    await self.start()
+                self.threaded += 1
+                return await asyncio.to_thread(parse_job_basic, url, data)
+        finally:
+            self.parsed += 1
+            self.latency.record((time.perf_counter() - start) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self._executor is not None,
+            "parsed": self.parsed,
+            "threaded": self.threaded,
+            "pool_failures": self.failures,
+            "parse_latency_ms": self.latency.stats(),
+        }
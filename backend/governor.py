@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit is open, retrying in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted AIMD-style from observed latency and errors.
+
+    Each fast success grows the limit by about one slot per "round" of calls
+    (additive increase); a failure or a call slower than the latency target
+    multiplies it by ``backoff`` (multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        latency_target_ms: float = 5000.0,
+        backoff: float = 0.5,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(initial_limit or self.max_limit)
+        self.latency_target_ms = latency_target_ms
+        self.backoff = backoff
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency_ms: Optional[float], ok: bool):
+        """Free a slot and adapt the limit (``latency_ms`` None skips adapting)"""
+        async with self._condition:
+            self.in_flight -= 1
+            if latency_ms is not None:
+                if ok and latency_ms <= self.latency_target_ms:
+                    if self.limit < self.max_limit:
+                        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                        self.increases += 1
+                else:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self.decreases += 1
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probes -> closed"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; counts it as a probe when half-open"""
+        if self.state == self.OPEN:
+            if self.retry_in() > 0:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self.half_open_calls = 0
+
+        if self.state == self.HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.rejected += 1
+                return False
+            self.half_open_calls += 1
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("Circuit closed after a successful probe")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": round(self.retry_in(), 1) if self.state == self.OPEN else 0,
+        }
+
+
+class Governor:
+    """Adaptive limiter plus circuit breaker around one outbound dependency.
+
+    Shared by every request in the worker, so the limit reflects the
+    dependency's health as a whole rather than one search's view of it.
+    """
+
+    def __init__(self, name: str, limiter: AdaptiveLimiter, breaker: CircuitBreaker):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.latency = LatencyRecorder()
+        self.calls = 0
+        self.failures = 0
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        is_failure: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Run ``fn`` under the limiter; raises CircuitOpenError when the circuit is open.
+
+        ``is_failure`` flags results that count as failures without raising,
+        such as HTTP 5xx responses.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+
+        await self.limiter.acquire()
+        start = time.perf_counter()
+        latency_ms = None
+        ok = False
+        try:
+            result = await fn()
+            ok = not (is_failure and is_failure(result))
+            latency_ms = self._record(start, ok)
+            return result
+        except asyncio.CancelledError:
+            # The caller gave up, which says nothing about the dependency's health;
+            # free the probe slot so the circuit doesn't stay half-open forever
+            if self.breaker.state == CircuitBreaker.HALF_OPEN:
+                self.breaker.half_open_calls = max(0, self.breaker.half_open_calls - 1)
+            raise
+        except Exception:
+            latency_ms = self._record(start, False)
+            raise
+        finally:
+            await asyncio.shield(self.limiter.release(latency_ms, ok))
+
+    def _record(self, start: float, ok: bool) -> float:
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.calls += 1
+        self.latency.record(latency_ms)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.failures += 1
+            was_open = self.breaker.state == CircuitBreaker.OPEN
+            self.breaker.record_failure()
+            if not was_open and self.breaker.state == CircuitBreaker.OPEN:
+                logger.warning(f"{self.name} circuit opened after {self.breaker.consecutive_failures} consecutive failures")
+        return latency_ms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "latency_ms": self.latency.stats(),
+            "limiter": self.limiter.stats(),
+            "circuit": self.breaker.stats(),
+        }
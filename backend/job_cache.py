@@ -0,0 +1,197 @@
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def approximate_size(value: Any) -> int:
+    """Rough in-memory size of a cached value in bytes"""
+    if hasattr(value, "json"):
+        # Pydantic models: the serialized form tracks the payload size well
+        return len(value.json())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUTTLCache:
+    """Bounded in-process cache with LRU eviction and a per-entry TTL.
+
+    Entries are evicted oldest-first once either ``max_entries`` or
+    ``max_bytes`` is exceeded, and are treated as misses after ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 50 * 1024 * 1024,
+        ttl_seconds: float = 3600,
+        sizeof: Callable[[Any], int] = approximate_size,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def _is_expired(self, entry: tuple) -> bool:
+        return time.monotonic() - entry[1] > self.ttl_seconds
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_with_age(key)[0]
+
+    def get_with_age(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Like ``get`` but also return how many seconds ago the entry was set"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            if self._is_expired(entry):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], time.monotonic() - entry[1]
+
+    def set(self, key: str, value: Any, size: Optional[int] = None):
+        if size is None:
+            size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Never let a single oversized value flush the whole cache
+                return
+            self._entries[key] = (value, time.monotonic(), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TieredJobCache:
+    """Two-tier cache for extracted jobs.
+
+    L1 is an in-process ``LRUTTLCache``. L2 reads through to the
+    ``job_results`` collection, which already stores every extracted job keyed
+    by ``application_url``; documents older than ``l2_max_age_seconds`` are
+    ignored so stale listings get re-crawled.
+    """
+
+    def __init__(
+        self,
+        l1: LRUTTLCache,
+        lookup: Optional[Callable[[str, datetime], Awaitable[Optional[Dict[str, Any]]]]],
+        loader: Callable[[Dict[str, Any]], Any],
+        l2_max_age_seconds: float = 24 * 3600,
+    ):
+        self.l1 = l1
+        self.lookup = lookup
+        self.loader = loader
+        self.l2_max_age_seconds = l2_max_age_seconds
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.l1
+
+    async def get(self, url: str) -> Optional[Any]:
+        """Look a job up in L1, then in job_results, promoting L2 hits to L1"""
+        value = self.l1.get(url)
+        if value is not None:
+            return value
+
+        if self.lookup is None or self.l2_max_age_seconds <= 0:
+            return None
+
+        try:
+            fresh_after = datetime.utcnow() - timedelta(seconds=self.l2_max_age_seconds)
+            doc = await self.lookup(url, fresh_after)
+        except Exception as e:
+            logger.warning(f"L2 job cache lookup failed for {url}: {e}")
+            self.l2_errors += 1
+            return None
+
+        if not doc:
+            self.l2_misses += 1
+            return None
+
+        try:
+            value = self.loader(doc)
+        except Exception as e:
+            logger.warning(f"Could not load cached job document for {url}: {e}")
+            self.l2_errors += 1
+            return None
+
+        self.l2_hits += 1
+        self.l1.set(url, value)
+        return value
+
+    def set(self, url: str, value: Any):
+        # L2 is written by the search pipeline alongside the search_id
+        self.l1.set(url, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "l1": self.l1.stats(),
+            "l2": {
+                "max_age_seconds": self.l2_max_age_seconds,
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "errors": self.l2_errors,
+            },
+        }
@@ -0,0 +1,194 @@
+"""Parsing of raw Diffbot payloads into job fields.
+
+Everything here is plain CPU work on JSON-compatible data with no app state,
+so it can run inline or in an extraction worker process (see
+``extraction_pool``). Results are returned as dicts rather than models so they
+pickle cheaply across the process boundary.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from extraction import extract_text_fields
+from skills import get_skill_taxonomy
+from women_friendly import get_women_friendly_classifier
+
+
+def parse_job_basic(url: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """JobBasic fields parsed from a raw Diffbot analyze payload"""
+    # Extract job information from Diffbot response
+    if 'objects' in data and len(data['objects']) > 0:
+        job_data = data['objects'][0]
+        
+        # Safely extract fields with default values
+        title = job_data.get('title', 'Unknown Job')
+        company = job_data.get('publisher', 'Unknown Company')
+        
+        # Extract text for analysis
+        text = job_data.get('text', '')
+        html = job_data.get('html', '')
+        
+        # Extract summary if available or create one
+        summary = None
+        if job_data.get('summary'):
+            summary = job_data.get('summary')
+        elif len(text) > 100:
+            # Create a more concise summary - first paragraph or first 200 chars
+            paragraphs = text.split('\n\n')
+            if paragraphs and len(paragraphs[0]) > 20:
+                summary = paragraphs[0].strip()
+                if len(summary) > 250:
+                    summary = summary[:247] + "..."
+            else:
+                summary = text[:200] + "..." if len(text) > 200 else text
+        
+        # Find more detailed location info
+        location = None
+        if job_data.get('location'):
+            location = job_data.get('location')
+        elif 'address' in job_data and job_data['address'] and 'locality' in job_data['address']:
+            if job_data['address'].get('region'):
+                location = f"{job_data['address'].get('locality')}, {job_data['address'].get('region')}"
+            else:
+                location = job_data['address'].get('locality')
+        
+        # Extract free-text fields with the precompiled extraction patterns
+        extracted = extract_text_fields(
+            text,
+            want_job_type=not job_data.get('jobType'),
+            want_salary=not job_data.get('salaryRange'),
+            want_company_description='description' not in job_data
+        )
+        
+        # Extract company description
+        company_description = None
+        if 'description' in job_data:
+            company_description = job_data.get('description')
+        else:
+            company_description = extracted.company_description
+        
+        # Determine availability (could be inferred from posting date)
+        availability = "Available"
+        posting_date = job_data.get('date')
+        if not posting_date and 'estimatedDate' in job_data:
+            posting_date = job_data['estimatedDate']
+            
+        if posting_date:
+            try:
+                from dateutil import parser
+                posted_date = parser.parse(posting_date)
+                if (datetime.now(posted_date.tzinfo) - posted_date).days > 30:
+                    availability = "May Be Filled"
+            except:
+                pass
+        
+        # Extract application deadline
+        application_deadline = extracted.application_deadline
+        
+        # Enhanced job type detection
+        job_type = job_data.get('jobType')
+        if not job_type and extracted.job_type:
+            job_type = extracted.job_type
+        
+        # Enhanced salary extraction
+        salary_range = job_data.get('salaryRange')
+        if not salary_range and extracted.salary_range:
+            salary_range = extracted.salary_range
+        
+        # Extract education, experience and highlights
+        education_required = extracted.education_required
+        experience_required = extracted.experience_required
+        job_highlights = extracted.job_highlights
+        
+        # Look for images with better prioritization
+        company_logo_url = None
+        banner_image_url = None
+        additional_images = []
+        
+        # First try to find a logo in the page data
+        if 'logo' in job_data and job_data['logo'] and 'url' in job_data['logo']:
+            company_logo_url = job_data['logo']['url']
+        
+        # Extract all images for further processing
+        if 'images' in job_data:
+            # Sort images by size, prioritizing larger ones for banner
+            sorted_images = sorted(
+                [img for img in job_data.get('images', []) if img.get('url')],
+                key=lambda x: (x.get('width', 0) * x.get('height', 0)), 
+                reverse=True
+            )
+            
+            for img in sorted_images:
+                img_url = img.get('url')
+                img_alt = img.get('alt', '').lower()
+                
+                # Skip tiny images and icons
+                if img.get('width', 0) < 100 or img.get('height', 0) < 100:
+                    continue
+                    
+                # Specific logo detection
+                if not company_logo_url and ('logo' in img_alt or 'company' in img_alt or 'brand' in img_alt):
+                    company_logo_url = img_url
+                    continue
+                
+                # Banner image - want a large, wide image
+                if not banner_image_url and img.get('width', 0) > 400 and img.get('width', 0) > img.get('height', 0):
+                    banner_image_url = img_url
+                    continue
+                
+                # Collect other useful images that might be relevant
+                additional_images.append(img_url)
+        
+        # If we have additional images but no banner, use the first additional image
+        if not banner_image_url and additional_images:
+            banner_image_url = additional_images[0]
+            additional_images = additional_images[1:]
+        
+        # If no logo found but we have a company name, use a generated one
+        if not company_logo_url and company:
+            company_initial = company.strip()[0].upper() if company.strip() else "C"
+            bg_color = "f8a5c2"  # Pink background
+            company_logo_url = f"https://ui-avatars.com/api/?name={company_initial}&background={bg_color}&color=fff&size=128&bold=true&font-size=0.6"
+        
+        # Determine if job is women-friendly
+        is_women_friendly_job = get_women_friendly_classifier().classify(title, company, text).is_women_friendly
+        
+        # Extract skills
+        skills = get_skill_taxonomy().extract(text) if text else []
+        
+        # Determine job category based on title and content
+        category = "Tech Jobs"
+        if any(keyword in title.lower() for keyword in ["data", "analyst", "scientist", "ml", "ai"]):
+            category = "Data Science"
+        elif any(keyword in title.lower() for keyword in ["developer", "engineer", "programmer", "code"]):
+            category = "Software Engineering"
+        elif any(keyword in title.lower() for keyword in ["design", "ux", "ui", "user experience"]):
+            category = "Design"
+        elif any(keyword in title.lower() for keyword in ["product", "manager", "owner"]):
+            category = "Product"
+        elif any(keyword in title.lower() for keyword in ["marketing", "growth", "seo"]):
+            category = "Marketing"
+        
+        # Plain dict so the result can be sent back from a worker process
+        return dict(
+            title=title,
+            company=company,
+            location=location,
+            job_type=job_type,
+            posting_date=posting_date,
+            salary_range=salary_range,
+            application_url=url,
+            is_women_friendly=is_women_friendly_job,
+            skills=skills,
+            company_logo_url=company_logo_url,
+            banner_image_url=banner_image_url,
+            summary=summary,
+            company_description=company_description,
+            availability=availability,
+            category=category,
+            education_required=education_required,
+            experience_required=experience_required,
+            application_deadline=application_deadline,
+            job_highlights=job_highlights
+        )
+    
+    return None
@@ -1,26 +1,43 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks, Body, Header
+from fastapi import FastAPI, HTTPException, Query, Depends, Body, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Dict, Any, Optional, Set, Union
+from typing import List, Dict, Any, Optional, Set, Union, AsyncIterator, TYPE_CHECKING
 from pydantic import BaseModel, Field, validator
 import os
 from dotenv import load_dotenv
-import requests
 import json
-from langchain_groq import ChatGroq
-from langchain_community.tools.tavily_search.tool import TavilySearchResults
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+from contextlib import asynccontextmanager
 import re
-from datetime import datetime
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationChain
-from langchain.prompts import PromptTemplate
+from datetime import datetime, timedelta
 import uuid
-from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 from bson.objectid import ObjectId
 import jwt
+from diffbot_client import DiffbotClient
+from job_cache import LRUTTLCache, TieredJobCache
+from singleflight import SingleFlight
+from metrics import BulkWriteStats, LatencyRecorder
+from extraction_pool import ExtractionPool
+from extraction import extract_qualifications
+from governor import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, Governor
+from prefetch import DetailPrefetcher
+from search_index import JobSearchIndex
+from dedup import DuplicateIndex, canonicalize_url, job_fingerprint, job_identity
+from women_friendly import WOMEN_FRIENDLY_COMPANIES, get_women_friendly_classifier
+from repository import Database
+from pagination import InvalidCursorError, decode_cursor
+from session_memory import SessionMemoryStore
+
+# langchain and its integrations take seconds to import, so they are loaded on
+# first use (or in the background after startup) rather than with this module
+if TYPE_CHECKING:
+    from langchain_community.tools.tavily_search.tool import TavilySearchResults
+    from langchain_groq import ChatGroq
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -34,6 +51,70 @@ DIFFBOT_API_KEY = os.getenv("DIFFBOT_API_KEY", "939b1f619b77603bacb76713807e5c15
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 JWT_SECRET = os.getenv("JWT_SECRET", "your_jwt_secret_key")  # Use the same secret as in Node.js backend
 
+# Diffbot HTTP client tuning
+DIFFBOT_MAX_CONNECTIONS = int(os.getenv("DIFFBOT_MAX_CONNECTIONS", "20"))
+DIFFBOT_MAX_CONCURRENCY = int(os.getenv("DIFFBOT_MAX_CONCURRENCY", "10"))
+DIFFBOT_TIMEOUT_SECONDS = float(os.getenv("DIFFBOT_TIMEOUT_SECONDS", "15"))
+
+# Outbound call governors: adaptive concurrency below the caps above, and a
+# circuit breaker that stops calling a failing dependency for a while
+DIFFBOT_LATENCY_TARGET_MS = float(os.getenv("DIFFBOT_LATENCY_TARGET_MS", "5000"))
+TAVILY_MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "4"))
+TAVILY_LATENCY_TARGET_MS = float(os.getenv("TAVILY_LATENCY_TARGET_MS", "8000"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Background warming of job details for search results
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+PREFETCH_QUEUE_SIZE = int(os.getenv("PREFETCH_QUEUE_SIZE", "500"))
+
+# Where the local job search index is persisted between restarts
+SEARCH_INDEX_PATH = os.getenv(
+    "SEARCH_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "search_index.json.gz")
+)
+DUPLICATE_INDEX_PATH = os.getenv(
+    "DUPLICATE_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "duplicate_index.json.gz")
+)
+
+# Import langchain in a background thread once the app is up, so the first
+# chat or search doesn't pay for it (false leaves it to the first request)
+PRELOAD_LLM_MODULES = os.getenv("PRELOAD_LLM_MODULES", "true").lower() in ("1", "true", "yes")
+
+# Chat memory kept in process; evicted sessions are rebuilt from chat_messages
+CHAT_MEMORY_MAX_SESSIONS = int(os.getenv("CHAT_MEMORY_MAX_SESSIONS", "1000"))
+CHAT_MEMORY_MAX_BYTES = int(os.getenv("CHAT_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+CHAT_MEMORY_IDLE_SECONDS = float(os.getenv("CHAT_MEMORY_IDLE_SECONDS", "1800"))
+
+# Messages of history the LLM sees; also how many are loaded on rehydration
+CHAT_MEMORY_WINDOW = int(os.getenv("CHAT_MEMORY_WINDOW", "10"))
+
+# How often each worker catches its job indexes up with job_results and saves them
+JOB_INDEX_SAVE_SECONDS = float(os.getenv("JOB_INDEX_SAVE_SECONDS", "300"))
+# Overlap between syncs, covering jobs queued before a sync but written after it
+JOB_INDEX_SYNC_SLACK_SECONDS = float(os.getenv("JOB_INDEX_SYNC_SLACK_SECONDS", "600"))
+
+# Worker processes for parsing Diffbot payloads (0 parses in threads)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "0"))
+
+# Job cache tuning
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "2000"))
+JOB_CACHE_MAX_BYTES = int(os.getenv("JOB_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+JOB_CACHE_TTL_SECONDS = float(os.getenv("JOB_CACHE_TTL_SECONDS", "3600"))
+JOB_CACHE_L2_MAX_AGE_SECONDS = float(os.getenv("JOB_CACHE_L2_MAX_AGE_SECONDS", str(24 * 3600)))
+DIFFBOT_PAYLOAD_CACHE_MAX_ENTRIES = int(os.getenv("DIFFBOT_PAYLOAD_CACHE_MAX_ENTRIES", "500"))
+DIFFBOT_PAYLOAD_CACHE_MAX_BYTES = int(os.getenv("DIFFBOT_PAYLOAD_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DIFFBOT_PAYLOAD_CACHE_TTL_SECONDS = float(os.getenv("DIFFBOT_PAYLOAD_CACHE_TTL_SECONDS", "3600"))
+JOB_DETAIL_CACHE_MAX_ENTRIES = int(os.getenv("JOB_DETAIL_CACHE_MAX_ENTRIES", "1000"))
+JOB_DETAIL_CACHE_MAX_BYTES = int(os.getenv("JOB_DETAIL_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Search cache tuning: fresh responses are served as-is, stale ones are
+# served while a background refresh runs, expired ones are recomputed
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "500"))
+SEARCH_CACHE_FRESH_SECONDS = float(os.getenv("SEARCH_CACHE_FRESH_SECONDS", "300"))
+SEARCH_CACHE_STALE_SECONDS = float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "3600"))
+
 # Validate API keys
 if not GROQ_API_KEY:
     logger.error("GROQ_API_KEY is missing. Set it in environment variables.")
@@ -45,62 +126,67 @@ if not DIFFBOT_API_KEY:
     logger.error("DIFFBOT_API_KEY is missing. Set it in environment variables.")
     raise ValueError("DIFFBOT_API_KEY is missing. Set it in environment variables.")
 
-# Initialize MongoDB connection
-try:
-    mongo_client = MongoClient(MONGODB_URI)
-    db = mongo_client["empowHER"]
-    chat_sessions_collection = db["chat_sessions"]
-    chat_messages_collection = db["chat_messages"]
-    job_searches_collection = db["job_searches"]
-    job_results_collection = db["job_results"]
-    
-    # Initialize MongoDB indexes
-    def init_mongodb():
-        """Initialize MongoDB with required collections and indexes"""
-        try:
-            # Set up indexes for chat_sessions
-            chat_sessions_collection.create_index([("session_id", ASCENDING)], unique=True)
-            chat_sessions_collection.create_index([("user_id", ASCENDING)])
-            chat_sessions_collection.create_index([("updated_at", DESCENDING)])
-            chat_sessions_collection.create_index([("is_active", ASCENDING)])
-            
-            # Set up indexes for chat_messages
-            chat_messages_collection.create_index([("session_id", ASCENDING)])
-            chat_messages_collection.create_index([("message_id", ASCENDING)], unique=True)
-            chat_messages_collection.create_index([("timestamp", ASCENDING)])
-            chat_messages_collection.create_index([("role", ASCENDING)])
-            chat_messages_collection.create_index([("content", TEXT)])  # For text search
-
-            # Set up indexes for job searches
-            job_searches_collection.create_index([("search_id", ASCENDING)], unique=True)
-            job_searches_collection.create_index([("user_id", ASCENDING)])
-            job_searches_collection.create_index([("timestamp", DESCENDING)])
-            job_searches_collection.create_index([("query", TEXT)])
-            
-            # Set up indexes for job results
-            job_results_collection.create_index([("job_id", ASCENDING)], unique=True)
-            job_results_collection.create_index([("search_id", ASCENDING)])
-            job_results_collection.create_index([("application_url", ASCENDING)])
-            job_results_collection.create_index([("title", TEXT)])
-            job_results_collection.create_index([("company", TEXT)])
-            job_results_collection.create_index([("is_women_friendly", ASCENDING)])
-            
-            logger.info("MongoDB initialization completed successfully!")
-        except Exception as e:
-            logger.error(f"Error initializing MongoDB: {e}")
+# Async MongoDB access; the connection is verified in the app lifespan
+database = Database(MONGODB_URI)
+
+# Shared Diffbot client, pooled across all requests on this worker
+diffbot_client = DiffbotClient(
+    api_key=DIFFBOT_API_KEY,
+    max_connections=DIFFBOT_MAX_CONNECTIONS,
+    max_concurrency=DIFFBOT_MAX_CONCURRENCY,
+    timeout=DIFFBOT_TIMEOUT_SECONDS
+)
+
+diffbot_governor = Governor(
+    "diffbot",
+    AdaptiveLimiter(max_limit=DIFFBOT_MAX_CONCURRENCY, latency_target_ms=DIFFBOT_LATENCY_TARGET_MS),
+    CircuitBreaker(failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_SECONDS)
+)
+tavily_governor = Governor(
+    "tavily",
+    AdaptiveLimiter(max_limit=TAVILY_MAX_CONCURRENCY, latency_target_ms=TAVILY_LATENCY_TARGET_MS),
+    CircuitBreaker(failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_SECONDS)
+)
+
+extraction_pool = ExtractionPool(workers=EXTRACTION_WORKERS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients on startup and close them on shutdown"""
+    try:
+        # Indexes are managed by migrate.py, not on every worker boot
+        await database.ping()
+        logger.info("MongoDB connection established successfully")
+    except Exception as e:
+        logger.error(f"MongoDB connection error: {e}")
+        raise ValueError(f"Failed to connect to MongoDB: {e}")
     
-    # Initialize MongoDB on startup
-    init_mongodb()
-    logger.info("MongoDB connection established successfully")
-except Exception as e:
-    logger.error(f"MongoDB connection error: {e}")
-    raise ValueError(f"Failed to connect to MongoDB: {e}")
+    await diffbot_client.start()
+    await extraction_pool.start()
+    detail_prefetcher.start()
+    # Loading (or on a first start, building) the job indexes can read all of
+    # job_results, so it runs after startup; searches go remote until it is done
+    index_maintainer = asyncio.ensure_future(maintain_job_indexes())
+    preload = preload_llm_modules() if PRELOAD_LLM_MODULES else None
+    try:
+        yield
+    finally:
+        if preload is not None and not preload.done():
+            preload.cancel()
+        index_maintainer.cancel()
+        await asyncio.gather(index_maintainer, return_exceptions=True)
+        await detail_prefetcher.close()
+        await save_job_indexes()
+        await extraction_pool.close()
+        await diffbot_client.close()
+        database.close()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Women's Tech Job Search API",
     description="API for searching and retrieving job opportunities in tech with a focus on women-friendly roles",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -110,6 +196,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor for the next page of list endpoints that return a bare array
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Security utilities
@@ -147,55 +235,80 @@ async def get_current_user(
         
     return payload.get("id")
 
+def _import_llm_modules():
+    import langchain.chains  # noqa: F401
+    import langchain.memory  # noqa: F401
+    import langchain.prompts  # noqa: F401
+    import langchain_community.tools.tavily_search.tool  # noqa: F401
+    import langchain_groq  # noqa: F401
+
+async def _load_llm_modules():
+    start = time.time()
+    try:
+        await asyncio.to_thread(_import_llm_modules)
+        logger.info(f"LLM modules loaded in {time.time() - start:.2f}s")
+    except Exception as e:
+        # The endpoints import them again and surface the error themselves
+        logger.warning(f"Could not preload LLM modules: {e}")
+
+_llm_modules: Optional[asyncio.Task] = None
+
+def preload_llm_modules() -> asyncio.Task:
+    """Import the langchain modules the chat and search endpoints use, off the event loop (once)"""
+    global _llm_modules
+    if _llm_modules is None:
+        _llm_modules = asyncio.ensure_future(_load_llm_modules())
+    return _llm_modules
+
+async def ensure_llm_modules():
+    """Wait for the langchain imports, so handlers never import them on the event loop"""
+    # Shielded so a cancelled request doesn't abort the import for everyone
+    await asyncio.shield(preload_llm_modules())
+
+_llm: Optional["ChatGroq"] = None
+_tavily_tool: Optional["TavilySearchResults"] = None
+
 # Initialize LLM
-def get_llm():
-    return ChatGroq(
-        groq_api_key=GROQ_API_KEY,
-        model_name="llama3-70b-8192",
-        temperature=0.7,
-        max_tokens=4000  # Limit response tokens
-    )
+def get_llm() -> "ChatGroq":
+    """The shared chat model, created on first use"""
+    global _llm
+    if _llm is None:
+        from langchain_groq import ChatGroq
+        _llm = ChatGroq(
+            groq_api_key=GROQ_API_KEY,
+            model_name="llama3-70b-8192",
+            temperature=0.7,
+            max_tokens=4000  # Limit response tokens
+        )
+    return _llm
 
 # Initialize Tavily Search Tool
-def get_tavily_tool():
-    return TavilySearchResults(
-        tavily_api_key=TAVILY_API_KEY,
-        max_results=15,
-        search_depth="advanced",
-        include_answer=False,
-        include_raw_content=True,
-        include_images=False,
-        include_domains=[
-            "linkedin.com/jobs", "indeed.com", "glassdoor.com", 
-            "dice.com", "techmothers.co", "techcareers.com", 
-            "powertofly.com", "remotewoman.com", "elpha.com", 
-            "fairygodboss.com", "levels.fyi", "angellist.com"
-        ],
-        exclude_domains=[
-            "reddit.com", "quora.com", "facebook.com", "twitter.com",
-            "instagram.com", "youtube.com", "pinterest.com",
-            "wikipedia.org", "blogspot.com", "medium.com", "wordpress.com",
-            "linkedin.com/articles/", "linkedin.com/pulse/", "linkedin.com/news/"
-        ],
-    )
-
-# Women-friendly keywords and companies
-WOMEN_FRIENDLY_KEYWORDS = [
-    'women in tech', 'diversity', 'inclusion', 'equal opportunity', 
-    'women leadership', 'women empowerment', 'female entrepreneurs',
-    'gender equality', 'work-life balance', 'flexible', 'parental leave',
-    'maternity', 'mentorship', 'diverse', 'inclusive', 'equity'
-]
-
-WOMEN_FRIENDLY_COMPANIES = {
-    'accenture', 'adobe', 'akamai', 'atlassian', 'bumble', 'dell', 'etsy', 
-    'general motors', 'hpinc', 'hubspot', 'ibm', 'intuit', 'johnson & johnson', 
-    'mastercard', 'microsoft', 'netflix', 'new relic', 'nvidia', 'paypal', 
-    'salesforce', 'sap', 'shopify', 'slack', 'spotify', 'square', 'stripe', 
-    'twitter', 'uber', 'workday', 'zoom', 'google', 'meta', 'amazon', 'apple',
-    'pinterest', 'airbnb', 'asana', 'dropbox', 'gitlab', 'godaddy', 'linkedin',
-    'mailchimp', 'mongodb', 'zendesk', 'twilio'
-}
+def get_tavily_tool() -> "TavilySearchResults":
+    """The shared Tavily search tool, created on first use"""
+    global _tavily_tool
+    if _tavily_tool is None:
+        from langchain_community.tools.tavily_search.tool import TavilySearchResults
+        _tavily_tool = TavilySearchResults(
+            tavily_api_key=TAVILY_API_KEY,
+            max_results=15,
+            search_depth="advanced",
+            include_answer=False,
+            include_raw_content=True,
+            include_images=False,
+            include_domains=[
+                "linkedin.com/jobs", "indeed.com", "glassdoor.com", 
+                "dice.com", "techmothers.co", "techcareers.com", 
+                "powertofly.com", "remotewoman.com", "elpha.com", 
+                "fairygodboss.com", "levels.fyi", "angellist.com"
+            ],
+            exclude_domains=[
+                "reddit.com", "quora.com", "facebook.com", "twitter.com",
+                "instagram.com", "youtube.com", "pinterest.com",
+                "wikipedia.org", "blogspot.com", "medium.com", "wordpress.com",
+                "linkedin.com/articles/", "linkedin.com/pulse/", "linkedin.com/news/"
+            ],
+        )
+    return _tavily_tool
 
 # Request and response models with enhanced validation
 class SearchQuery(BaseModel):
@@ -206,6 +319,8 @@ class SearchQuery(BaseModel):
     max_results: Optional[int] = Field(default=15, ge=1, le=50, description="Maximum number of results")
     women_friendly_only: Optional[bool] = Field(default=False, description="Only return women-friendly jobs")
     include_articles: Optional[bool] = Field(default=False, description="Include articles and news in results")
+    source: str = Field(default="remote", regex="^(local|remote|hybrid)$", description="Search the stored job index (local), Tavily (remote), or the index first with Tavily when it has too few matches (hybrid); both index sources use Tavily until the index has loaded")
+    deadline_ms: Optional[int] = Field(default=None, ge=100, le=60000, description="Latency budget for /api/search; unfinished jobs are returned as pending and completed in the background")
     
     @validator('query')
     def query_not_empty(cls, v):
@@ -238,6 +353,7 @@ class JobBasic(BaseModel):
     experience_required: Optional[str] = Field(default=None, description="Required experience level")
     application_deadline: Optional[str] = Field(default=None, description="Application deadline")
     job_highlights: Optional[List[str]] = Field(default_factory=list, description="Key job highlights")
+    extracted_at: Optional[datetime] = Field(default=None, description="When the listing was last parsed from Diffbot; unset for placeholders")
 
 class JobDetail(JobBasic):
     description: Optional[str] = Field(default=None, description="Job description")
@@ -257,9 +373,77 @@ class SearchResponse(BaseModel):
     total_results: int = Field(description="Total number of results")
     query_time_ms: int = Field(description="Query execution time in milliseconds")
     women_friendly_count: int = Field(default=0, description="Number of women-friendly jobs found")
+    search_id: Optional[str] = Field(default=None, description="ID to fetch the stored results of this search")
+    is_complete: bool = Field(default=True, description="False when the deadline expired before the search finished; the rest is stored under search_id")
+    pending_urls: List[str] = Field(default_factory=list, description="Job URLs still being extracted when the deadline expired (empty while the URL lookup itself is still running)")
+
+# Cache for job information to prevent redundant API calls:
+# bounded in-process LRU first, then recent documents in job_results
+job_cache = TieredJobCache(
+    l1=LRUTTLCache(
+        max_entries=JOB_CACHE_MAX_ENTRIES,
+        max_bytes=JOB_CACHE_MAX_BYTES,
+        ttl_seconds=JOB_CACHE_TTL_SECONDS
+    ),
+    lookup=database.job_results.find_fresh,
+    loader=lambda doc: JobBasic(**doc),
+    l2_max_age_seconds=JOB_CACHE_L2_MAX_AGE_SECONDS
+)
 
-# Cache for job information to prevent redundant API calls
-job_cache = {}
+# Raw Diffbot analyze payloads, shared by the basic and detail extraction paths
+payload_cache = LRUTTLCache(
+    max_entries=DIFFBOT_PAYLOAD_CACHE_MAX_ENTRIES,
+    max_bytes=DIFFBOT_PAYLOAD_CACHE_MAX_BYTES,
+    ttl_seconds=DIFFBOT_PAYLOAD_CACHE_TTL_SECONDS
+)
+
+# Fully built job details served by /api/job/{job_url}
+detail_cache = LRUTTLCache(
+    max_entries=JOB_DETAIL_CACHE_MAX_ENTRIES,
+    max_bytes=JOB_DETAIL_CACHE_MAX_BYTES,
+    ttl_seconds=JOB_CACHE_TTL_SECONDS
+)
+
+# In-flight Diffbot extractions keyed by URL, shared by concurrent searches
+job_fetches = SingleFlight()
+payload_fetches = SingleFlight()
+detail_fetches = SingleFlight()
+
+# Assembled search responses and Tavily URL lists keyed by normalized query
+search_cache = LRUTTLCache(
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+    max_bytes=JOB_CACHE_MAX_BYTES,
+    ttl_seconds=SEARCH_CACHE_STALE_SECONDS
+)
+# Only fresh URL lists are reused, so a stale-while-revalidate refresh
+# actually asks Tavily again instead of replaying the old result set
+search_url_cache = LRUTTLCache(
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+    max_bytes=JOB_CACHE_MAX_BYTES,
+    ttl_seconds=SEARCH_CACHE_FRESH_SECONDS
+)
+search_flights = SingleFlight()
+search_refresh_tasks = set()
+
+# BM25 index and duplicate fingerprints over stored jobs, loaded or built in the app lifespan
+search_index = JobSearchIndex()
+duplicate_index = DuplicateIndex()
+# Whether the indexes have been loaded, the time up to which they hold every
+# stored job, and what was last saved
+job_index_state = {"ready": False, "watermark": None, "saved_versions": None}
+# Deadline-limited searches still extracting their remaining jobs
+search_completion_tasks = set()
+search_cache_stats = {"stale_hits": 0, "refreshes": 0}
+
+# Streamed chat replies: time to the first token and how each stream ended
+chat_stream_ttft = LatencyRecorder()
+chat_stream_stats = {"completed": 0, "cancelled": 0, "errors": 0}
+# Assistant replies still being written after their stream was cancelled
+chat_save_tasks = set()
+
+# Batched job_results persistence stats
+job_results_write_stats = BulkWriteStats()
+user_jobs_write_stats = BulkWriteStats()
 
 class ChatMessage(BaseModel):
     role: str
@@ -284,7 +468,9 @@ class ChatSession(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     last_message_timestamp: Optional[datetime] = None
     is_active: bool = True
+    # Maintained on every message insert, see ChatSessionRepository.record_message
     message_count: Optional[int] = 0
+    last_message_preview: Optional[str] = None
     
     class Config:
         json_encoders = {
@@ -306,6 +492,7 @@ class JobSearch(BaseModel):
     total_results: int = 0
     women_friendly_count: int = 0
     search_params: Dict[str, Any] = Field(default_factory=dict)
+    is_complete: bool = True
     
     class Config:
         json_encoders = {
@@ -330,8 +517,35 @@ Current conversation:
 Human: {input}
 Assistant:"""
 
-# Initialize memory for each session
-chat_memories = {}
+async def load_chat_memory(session_id: str):
+    """Rebuild a session's conversation memory from its latest chat_messages"""
+    await ensure_llm_modules()
+    from langchain.memory import ConversationBufferMemory
+
+    # Only the window the LLM sees; older messages would be trimmed right away
+    chat_history = await database.chat_messages.recent_for_session(session_id, CHAT_MEMORY_WINDOW)
+    
+    memory = ConversationBufferMemory(
+        memory_key="history",
+        return_messages=True,
+        max_token_limit=2000
+    )
+    
+    # Load previous messages to memory if they exist
+    for msg in chat_history:
+        if msg["role"] == "user":
+            memory.chat_memory.add_user_message(msg["content"])
+        else:
+            memory.chat_memory.add_ai_message(msg["content"])
+    return memory
+
+# Memory for active sessions, bounded by count, size and idle time
+chat_memories = SessionMemoryStore(
+    load_chat_memory,
+    max_sessions=CHAT_MEMORY_MAX_SESSIONS,
+    max_bytes=CHAT_MEMORY_MAX_BYTES,
+    idle_ttl_seconds=CHAT_MEMORY_IDLE_SECONDS
+)
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -341,139 +555,601 @@ async def root():
         "version": "1.1.0"
     }
 
-@app.post("/api/search", response_model=SearchResponse, tags=["Search"])
-async def search_jobs(
-    search_params: SearchQuery,
-    background_tasks: BackgroundTasks,
-    tavily_tool: TavilySearchResults = Depends(get_tavily_tool),
-    user_id: Optional[str] = Query(None, description="Optional user ID for storing search history")
-):
-    start_time = time.time()
+def build_search_query(search_params: SearchQuery) -> str:
+    """Construct the Tavily query string with additional context"""
+    query = "Tech job openings"
     
-    try:
-        # Create a unique search ID
-        search_id = str(uuid.uuid4())
-        
-        # Construct query with additional context
-        query = "Tech job openings"
-        
-        if search_params.query:
-            query += f" {search_params.query}"
-        
-        if search_params.job_type:
-            query += f" {search_params.job_type} positions"
+    if search_params.query:
+        query += f" {search_params.query}"
+    
+    if search_params.job_type:
+        query += f" {search_params.job_type} positions"
+    
+    if search_params.company:
+        query += f" at {search_params.company}"
+    
+    if search_params.location:
+        query += f" in {search_params.location}"
+    
+    # Add keywords for women-friendly and internship opportunities
+    query += " (Women in Tech) (female-friendly workplace) (diversity inclusion)"
+    
+    # Add job-specific keywords if not including articles
+    if not search_params.include_articles:
+        query += " (job posting) (job listing) (hiring) (careers)"
+    
+    return query
+
+class JobSearchRun:
+    """State of a single job search, shared by the buffered and streaming endpoints"""
+    
+    def __init__(self, search_params: SearchQuery, user_id: Optional[str] = None, store_results: bool = True):
+        self.search_params = search_params
+        self.user_id = user_id
+        # Off for runs whose jobs are stored by the searches that adopt them
+        self.store_results = store_results
+        self.search_id = str(uuid.uuid4())
+        self.start_time = time.time()
+        self.jobs: List[JobBasic] = []
+        self.women_friendly_jobs = 0
+        self._pending_writes: List[UpdateOne] = []
+        self._pending_user_writes: List[UpdateOne] = []
+        # URLs whose extraction has started but not finished, in search order
+        self._pending_urls: Dict[str, None] = {}
+        self._result_urls: Set[str] = set()
+        # Jobs taken from the local index, kept out of the shared search cache
+        self._local_urls: Set[str] = set()
+        self._local_women_friendly = 0
+        # Set when the Tavily circuit was open, so no URLs were even looked up
+        self.search_skipped = False
+    
+    def query_time_ms(self) -> int:
+        return int((time.time() - self.start_time) * 1000)
+    
+    async def fetch_job_urls(self, tavily_tool: "TavilySearchResults") -> List[str]:
+        """Run the Tavily search, reusing the URL list of an identical recent query"""
+        query = build_search_query(self.search_params)
+        url_key = query.lower()
+        
+        cached_urls = search_url_cache.get(url_key)
+        if cached_urls is not None:
+            logger.info(f"Using cached search results for: {query}")
+            return cached_urls
+        
+        async def run_tavily():
+            logger.info(f"Searching for: {query}")
+            
+            # Execute search off the event loop, under the shared Tavily governor
+            try:
+                results = await tavily_governor.call(
+                    lambda: asyncio.to_thread(tavily_tool.invoke, {"query": query})
+                )
+            except CircuitOpenError as e:
+                logger.warning(f"{e}; skipping search for: {query}")
+                # None rather than [] so the caller knows not to cache anything
+                return None
+            
+            if not results:
+                logger.warning(f"No search results found for query: {query}")
+                return []
+            
+            logger.info(f"Found {len(results)} search results")
+            
+            # Get job URLs
+            job_urls = []
+            for result in results:
+                if 'url' in result and result['url']:
+                    job_urls.append(result['url'])
+            
+            search_url_cache.set(url_key, job_urls)
+            return job_urls
+        
+        job_urls = await search_flights.do(("urls", url_key), run_tavily)
+        if job_urls is None:
+            self.search_skipped = True
+            return []
+        return job_urls
+    
+    async def iter_jobs(self, tavily_tool: "TavilySearchResults") -> AsyncIterator[JobBasic]:
+        """Yield each job as soon as its extraction finishes"""
+        job_urls = await self.fetch_job_urls(tavily_tool)
+        if not job_urls:
+            return
+        
+        async def fetch_with_url(url: str):
+            try:
+                return await fetch_job_info(url)
+            except Exception as exc:
+                logger.error(f"Error processing {url}: {exc}")
+                return None
+            finally:
+                self._pending_urls.pop(url, None)
+        
+        # Collapse URL variants of jobs seen before paying for any Diffbot call
+        job_urls = unique_job_urls(job_urls)
+        
+        # Fan out on the event loop; the shared Diffbot client caps concurrency
+        job_urls = job_urls[:self.search_params.max_results]
+        self._pending_urls = dict.fromkeys(job_urls)
+        tasks = [asyncio.ensure_future(fetch_with_url(url)) for url in job_urls]
+        try:
+            for future in asyncio.as_completed(tasks):
+                job_info = await future
+                if not job_info:
+                    continue
+                
+                # Skip reposts of a job already in these results
+                job_info = self._collapse_duplicate(job_info)
+                if job_info is None:
+                    continue
+                
+                # Count women-friendly jobs
+                if job_info.is_women_friendly:
+                    self.women_friendly_jobs += 1
+                
+                # Apply women-friendly filter if requested
+                if self.search_params.women_friendly_only and not job_info.is_women_friendly:
+                    continue
+                
+                self.jobs.append(job_info)
+                self._queue_job_result(job_info)
+                
+                yield job_info
+        finally:
+            # Stop outstanding fetches if the consumer went away early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _collapse_duplicate(self, job_info: JobBasic) -> Optional[JobBasic]:
+        """None for a repeat of a job already in this search; copies of a stored
+        job are reported under the URL it was first stored with"""
+        url = job_info.application_url
+        if url in duplicate_index:
+            if url in self._result_urls:
+                return None
+            self._result_urls.add(url)
+            return job_info
         
-        if search_params.company:
-            query += f" at {search_params.company}"
+        job = job_info.dict()
+        fingerprint, identity = job_fingerprint(job), job_identity(job)
+        representative = duplicate_index.find_near_duplicate(fingerprint, identity) if fingerprint is not None else None
+        if representative is None:
+            duplicate_index.add(url, fingerprint, identity=identity)
+            self._result_urls.add(url)
+            return job_info
         
-        if search_params.location:
-            query += f" in {search_params.location}"
+        duplicate_index.add(url, alias_of=representative)
+        if representative in self._result_urls:
+            return None
+        self._result_urls.add(representative)
+        return job_info.copy(update={"application_url": representative})
+    
+    def adopt(self, cached_response: SearchResponse):
+        """Reuse the results assembled by an identical search"""
+        self.jobs = list(cached_response.results)
+        self.women_friendly_jobs = cached_response.women_friendly_count
+        for job_info in self.jobs:
+            self._queue_job_result(job_info)
+    
+    def adopt_local(self, jobs: List[JobBasic], reserved: int = 0):
+        """Add jobs found in the local search index that aren't already in the results.
         
-        # Add keywords for women-friendly and internship opportunities
-        query += " (Women in Tech) (female-friendly workplace) (diversity inclusion)"
+        ``reserved`` slots are left free for extractions still in flight.
+        """
+        seen = {job_info.application_url for job_info in self.jobs}
+        for job_info in jobs:
+            if len(self.jobs) + reserved >= self.search_params.max_results:
+                break
+            if job_info.application_url in seen:
+                continue
+            seen.add(job_info.application_url)
+            self._local_urls.add(job_info.application_url)
+            if job_info.is_women_friendly:
+                self.women_friendly_jobs += 1
+                self._local_women_friendly += 1
+            self.jobs.append(job_info)
+            self._queue_job_result(job_info)
+    
+    def _queue_job_result(self, job_info: JobBasic):
+        # Placeholders from failed fetches would overwrite a good stored copy
+        # and be served back from L2, so only extracted jobs are stored
+        if job_info.extracted_at is None or not self.store_results:
+            return
+        
+        # Keep the local search index in step with job_results
+        search_index.add(job_info.dict())
+        
+        # Store job in MongoDB with reference to this search
+        job_data = job_info.dict()
+        job_data['job_id'] = str(uuid.uuid4())
+        job_data['search_id'] = self.search_id
+        job_data['stored_at'] = datetime.utcnow()
+        
+        # Queue for MongoDB, use upsert to avoid duplicates based on application_url.
+        # search_id is only the latest search; search_ids keeps every search that
+        # returned the job, so earlier searches still list it
+        self._pending_writes.append(UpdateOne(
+            {'application_url': job_info.application_url},
+            {'$set': job_data, '$addToSet': {'search_ids': self.search_id}},
+            upsert=True
+        ))
         
-        # Add job-specific keywords if not including articles
-        if not search_params.include_articles:
-            query += " (job posting) (job listing) (hiring) (careers)"
+        # The user's own association is kept separately, one document per user and job
+        if self.user_id:
+            self._pending_user_writes.append(UpdateOne(
+                {'user_id': self.user_id, 'application_url': job_info.application_url},
+                {'$set': dict(job_data, user_id=self.user_id)},
+                upsert=True
+            ))
+    
+    async def flush_job_results(self):
+        """Write all queued job upserts, one unordered bulk_write per collection"""
+        operations, self._pending_writes = self._pending_writes, []
+        user_operations, self._pending_user_writes = self._pending_user_writes, []
+        await asyncio.gather(
+            self._write_batch("job results", database.job_results, operations, job_results_write_stats),
+            self._write_batch("user jobs", database.user_jobs, user_operations, user_jobs_write_stats)
+        )
+    
+    async def _write_batch(self, name: str, repository, operations: List[UpdateOne], stats: BulkWriteStats):
+        if not operations:
+            return
         
-        logger.info(f"Searching for: {query}")
+        write_start = time.time()
+        try:
+            result = await repository.bulk_write(operations)
+            stats.record(len(operations), (time.time() - write_start) * 1000, result)
+        except BulkWriteError as bwe:
+            # Unordered writes still apply every operation that didn't fail
+            stats.record(len(operations), (time.time() - write_start) * 1000)
+            stats.record_error()
+            logger.error(f"Partial failure storing {name} for search {self.search_id}: {bwe.details.get('writeErrors')}")
+        except Exception as e:
+            stats.record_error()
+            logger.error(f"Error storing {name} for search {self.search_id}: {e}")
+    
+    def is_degraded(self) -> bool:
+        """Whether an open circuit shaped these results, so they must not be cached.
         
-        # Execute search
-        results = tavily_tool.invoke({"query": query})
+        Cached responses would be served for the whole stale window, hiding the
+        recovery and keeping the circuit from ever seeing a probe.
+        """
+        if self.search_skipped:
+            return True
+        # Only placeholders means Diffbot couldn't extract any of the jobs
+        remote_jobs = [job_info for job_info in self.jobs if job_info.application_url not in self._local_urls]
+        return bool(remote_jobs) and all(job_info.extracted_at is None for job_info in remote_jobs)
+    
+    def response(self, pending_urls: Optional[List[str]] = None, is_complete: bool = True) -> SearchResponse:
+        # Built without awaiting, so results and pending_urls describe the same moment
+        return SearchResponse(
+            results=list(self.jobs),
+            total_results=len(self.jobs),
+            query_time_ms=self.query_time_ms(),
+            women_friendly_count=self.women_friendly_jobs,
+            search_id=self.search_id,
+            is_complete=is_complete,
+            pending_urls=pending_urls or []
+        )
+    
+    def remote_response(self) -> SearchResponse:
+        """The results without local index jobs, as cached for identical searches"""
+        jobs = [job_info for job_info in self.jobs if job_info.application_url not in self._local_urls]
+        return SearchResponse(
+            results=jobs,
+            total_results=len(jobs),
+            query_time_ms=self.query_time_ms(),
+            women_friendly_count=self.women_friendly_jobs - self._local_women_friendly
+        )
+    
+    async def finish(self, pending_urls: Optional[List[str]] = None, is_complete: bool = True) -> SearchResponse:
+        """Store the search in MongoDB and build the final response"""
+        # Snapshot first: background extractions may add jobs while we store
+        response = self.response(pending_urls, is_complete)
+        await self.flush_job_results()
         
-        if not results:
-            logger.warning(f"No search results found for query: {query}")
-            
-            # Store empty search in MongoDB
-            job_search = JobSearch(
-                search_id=search_id,
-                user_id=user_id,
-                query=search_params.query,
-                location=search_params.location,
-                job_type=search_params.job_type,
-                company=search_params.company,
-                total_results=0,
-                women_friendly_count=0,
-                search_params=search_params.dict()
-            )
-            
-            # Store search data in MongoDB
-            job_searches_collection.insert_one(job_search.dict())
-            
-            return SearchResponse(
-                results=[],
-                total_results=0,
-                query_time_ms=int((time.time() - start_time) * 1000),
-                women_friendly_count=0
-            )
+        job_search = JobSearch(
+            search_id=self.search_id,
+            user_id=self.user_id,
+            query=self.search_params.query,
+            location=self.search_params.location,
+            job_type=self.search_params.job_type,
+            company=self.search_params.company,
+            total_results=response.total_results,
+            women_friendly_count=response.women_friendly_count,
+            search_params=self.search_params.dict(),
+            is_complete=is_complete
+        )
         
-        logger.info(f"Found {len(results)} search results")
+        # Store search data in MongoDB
+        await database.job_searches.insert(job_search.dict())
         
-        # Get job URLs
-        job_urls = []
-        for result in results:
-            if 'url' in result and result['url']:
-                job_urls.append(result['url'])
+        response.query_time_ms = self.query_time_ms()
+        return response
+    
+    async def finish_within(
+        self,
+        tavily_tool: "TavilySearchResults",
+        budget_seconds: float,
+        local_jobs: Optional[List[JobBasic]] = None
+    ) -> SearchResponse:
+        """Run the search, answering with the jobs done when the budget expires.
+        
+        Unfinished extractions keep running in the background; their jobs are
+        stored under this search_id and the job_searches entry is updated once
+        they are all done. ``local_jobs`` fill the slots the search leaves
+        free, as for hybrid searches without a deadline.
+        """
+        async def collect():
+            async for _ in self.iter_jobs(tavily_tool):
+                pass
+        
+        collecting = asyncio.ensure_future(collect())
+        search_completion_tasks.add(collecting)
+        collecting.add_done_callback(search_completion_tasks.discard)
+        
+        remaining = budget_seconds - (time.time() - self.start_time)
+        done, _ = await asyncio.wait({collecting}, timeout=max(0.0, remaining))
+        if collecting in done:
+            if collecting.exception() is not None:
+                raise collecting.exception()
+            if not self.is_degraded():
+                search_cache.set(search_cache_key(self.search_params), self.remote_response())
+            self.adopt_local(local_jobs or [])
+            return await self.finish()
+        
+        # The Tavily lookup itself may still be running, in which case no URL is
+        # known yet; is_complete tells that apart from a search with no jobs
+        pending_urls = list(self._pending_urls)
+        self.adopt_local(local_jobs or [], reserved=len(pending_urls))
+        response = await self.finish(pending_urls=pending_urls, is_complete=collecting.done())
+        
+        completion = asyncio.ensure_future(self._complete_in_background(collecting))
+        search_completion_tasks.add(completion)
+        completion.add_done_callback(search_completion_tasks.discard)
+        return response
+    
+    async def _complete_in_background(self, collecting: asyncio.Future):
+        await asyncio.wait({collecting})
+        failed = collecting.cancelled() or collecting.exception() is not None
+        if failed:
+            logger.error(f"Search {self.search_id} did not complete in the background")
         
-        # Process job URLs in parallel for better performance
-        jobs = []
-        women_friendly_jobs = 0
+        await self.flush_job_results()
+        try:
+            await database.job_searches.update(self.search_id, {
+                "total_results": len(self.jobs),
+                "women_friendly_count": self.women_friendly_jobs,
+                "is_complete": True
+            })
+        except Exception as e:
+            logger.error(f"Error updating search {self.search_id}: {e}")
         
-        with ThreadPoolExecutor(max_workers=min(10, len(job_urls))) as executor:
-            future_to_url = {executor.submit(fetch_job_info, url): url for url in job_urls[:search_params.max_results]}
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    job_info = future.result()
-                    if job_info:
-                        # Count women-friendly jobs
-                        if job_info.is_women_friendly:
-                            women_friendly_jobs += 1
-                        
-                        # Apply women-friendly filter if requested
-                        if not search_params.women_friendly_only or job_info.is_women_friendly:
-                            jobs.append(job_info)
-                            
-                            # Store job in MongoDB with reference to this search
-                            job_data = job_info.dict()
-                            job_data['job_id'] = str(uuid.uuid4())
-                            job_data['search_id'] = search_id
-                            job_data['stored_at'] = datetime.utcnow()
-                            
-                            # Store in MongoDB, use upsert to avoid duplicates based on application_url
-                            job_results_collection.update_one(
-                                {'application_url': job_info.application_url},
-                                {'$set': job_data},
-                                upsert=True
-                            )
-                except Exception as exc:
-                    logger.error(f"Error processing {url}: {exc}")
-        
-        # Store search in MongoDB
-        job_search = JobSearch(
-            search_id=search_id,
-            user_id=user_id,
-            query=search_params.query,
-            location=search_params.location,
-            job_type=search_params.job_type,
-            company=search_params.company,
-            total_results=len(jobs),
-            women_friendly_count=women_friendly_jobs,
-            search_params=search_params.dict()
+        # Only the complete result set is worth serving to identical searches
+        if not failed and not self.is_degraded():
+            search_cache.set(search_cache_key(self.search_params), self.remote_response())
+        logger.info(f"Search {self.search_id} completed in the background with {len(self.jobs)} jobs")
+
+def search_cache_key(search_params: SearchQuery) -> tuple:
+    """Normalized key for identical searches, ignoring case and extra whitespace"""
+    def normalize(value: Optional[str]) -> str:
+        return " ".join((value or "").lower().split())
+    
+    return (
+        normalize(search_params.query),
+        normalize(search_params.location),
+        normalize(search_params.job_type),
+        normalize(search_params.company),
+        bool(search_params.women_friendly_only),
+        bool(search_params.include_articles),
+        # Different result limits assemble different responses
+        search_params.max_results
+    )
+
+async def execute_search(
+    search_params: SearchQuery,
+    tavily_tool: "TavilySearchResults",
+    store_results: bool = False
+) -> SearchResponse:
+    """Run the full Tavily + Diffbot pipeline and cache the assembled response.
+    
+    Callers that adopt the response store its jobs under their own search; a
+    background refresh has no such caller, so it passes ``store_results``.
+    """
+    search_run = JobSearchRun(search_params, store_results=store_results)
+    async for _ in search_run.iter_jobs(tavily_tool):
+        pass
+    # Indexed jobs must reach job_results too, or the indexes drift from it
+    await search_run.flush_job_results()
+    
+    response = SearchResponse(
+        results=search_run.jobs,
+        total_results=len(search_run.jobs),
+        query_time_ms=search_run.query_time_ms(),
+        women_friendly_count=search_run.women_friendly_jobs
+    )
+    if not search_run.is_degraded():
+        search_cache.set(search_cache_key(search_params), response)
+    return response
+
+def refresh_search_in_background(search_params: SearchQuery, tavily_tool: "TavilySearchResults"):
+    """Revalidate a stale cached search without making the caller wait"""
+    key = search_cache_key(search_params)
+    if key in search_flights:
+        return
+    
+    async def refresh():
+        try:
+            await search_flights.do(key, lambda: execute_search(search_params, tavily_tool, store_results=True))
+            search_cache_stats["refreshes"] += 1
+        except Exception as e:
+            logger.error(f"Error refreshing cached search {key}: {e}")
+    
+    task = asyncio.ensure_future(refresh())
+    search_refresh_tasks.add(task)
+    task.add_done_callback(search_refresh_tasks.discard)
+
+async def get_cached_search(search_params: SearchQuery, tavily_tool: "TavilySearchResults") -> Optional[SearchResponse]:
+    """Return a cached response for this search, scheduling a refresh if it is stale"""
+    cached_response, age = search_cache.get_with_age(search_cache_key(search_params))
+    if cached_response is None:
+        return None
+    
+    if age > SEARCH_CACHE_FRESH_SECONDS:
+        search_cache_stats["stale_hits"] += 1
+        refresh_search_in_background(search_params, tavily_tool)
+    
+    return cached_response
+
+def unique_job_urls(urls: List[str]) -> List[str]:
+    """Resolve known duplicates to their stored URL and drop repeats, keeping order"""
+    unique = {}
+    for url in urls:
+        url = duplicate_index.resolve_url(url)
+        unique.setdefault(canonicalize_url(url), url)
+    return list(unique.values())
+
+def search_local(search_params: SearchQuery) -> List[JobBasic]:
+    """Rank stored jobs against the search with the in-process BM25 index"""
+    query = " ".join(filter(None, [
+        search_params.query,
+        search_params.job_type,
+        search_params.company,
+        search_params.location
+    ]))
+    hits = search_index.search(
+        query,
+        limit=search_params.max_results,
+        women_friendly_only=bool(search_params.women_friendly_only)
+    )
+    return [JobBasic(**job) for _, job in hits]
+
+async def sync_job_indexes(since: Optional[datetime]) -> datetime:
+    """Add jobs stored in job_results since ``since`` (all of them when None) to the indexes.
+    
+    Other workers and earlier runs write job_results too, so this is how every
+    worker's indexes catch up. Adding a job twice is harmless. Returns the
+    watermark to pass next time.
+    """
+    watermark = datetime.utcnow()
+    if since is None:
+        jobs = database.job_results.iter_all()
+    else:
+        # Jobs are stamped when queued but written when their batch flushes
+        jobs = database.job_results.iter_stored_since(since - timedelta(seconds=JOB_INDEX_SYNC_SLACK_SECONDS))
+    async for job in jobs:
+        search_index.add(job)
+        duplicate_index.add_job(job)
+    return watermark
+
+async def load_job_indexes():
+    """Load the persisted search and duplicate indexes and catch them up with job_results"""
+    global search_index, duplicate_index
+    loaded_search_index, loaded_duplicate_index = await asyncio.gather(
+        asyncio.to_thread(JobSearchIndex.load, SEARCH_INDEX_PATH),
+        asyncio.to_thread(DuplicateIndex.load, DUPLICATE_INDEX_PATH)
+    )
+    if loaded_search_index is not None:
+        search_index = loaded_search_index
+    if loaded_duplicate_index is not None:
+        duplicate_index = loaded_duplicate_index
+    
+    # A missing file, or one without a watermark, means reading everything
+    watermarks = [index.watermark for index in (loaded_search_index, loaded_duplicate_index) if index is not None]
+    since = min(watermarks) if len(watermarks) == 2 and None not in watermarks else None
+    job_index_state["watermark"] = await sync_job_indexes(since)
+    job_index_state["ready"] = True
+    await save_job_indexes()
+    
+    logger.info(f"Job indexes ready: {len(search_index)} searchable jobs, {len(duplicate_index)} fingerprints")
+
+async def save_job_indexes():
+    """Write both indexes with the current watermark, if they changed since the last save"""
+    if not job_index_state["ready"]:
+        # A half-loaded index would replace a complete snapshot
+        return
+    versions = (id(search_index), search_index.version, id(duplicate_index), duplicate_index.version)
+    if versions == job_index_state["saved_versions"]:
+        return
+    try:
+        watermark = job_index_state["watermark"]
+        await asyncio.gather(
+            asyncio.to_thread(search_index.save, SEARCH_INDEX_PATH, watermark),
+            asyncio.to_thread(duplicate_index.save, DUPLICATE_INDEX_PATH, watermark)
         )
+        job_index_state["saved_versions"] = versions
+    except Exception as e:
+        logger.error(f"Error saving job indexes: {e}")
+
+async def maintain_job_indexes():
+    """Load the indexes, then catch up with job_results and save every interval,
+    so a crash loses at most one interval"""
+    try:
+        await load_job_indexes()
+    except Exception as e:
+        # Retried below; without a watermark the next sync reads everything
+        logger.error(f"Error loading job indexes: {e}")
+    while True:
+        await asyncio.sleep(JOB_INDEX_SAVE_SECONDS)
+        try:
+            job_index_state["watermark"] = await sync_job_indexes(job_index_state["watermark"])
+        except Exception as e:
+            # Saving without the sync would move the watermark past unseen jobs
+            logger.error(f"Error syncing job indexes: {e}")
+            continue
+        job_index_state["ready"] = True
+        await save_job_indexes()
+
+def search_source(search_params: SearchQuery) -> str:
+    """The requested source, or remote while the job indexes are still loading"""
+    if search_params.source != "remote" and not job_index_state["ready"]:
+        return "remote"
+    return search_params.source
+
+@app.post("/api/search", response_model=SearchResponse, tags=["Search"])
+async def search_jobs(
+    search_params: SearchQuery,
+    tavily_tool=Depends(get_tavily_tool),
+    user_id: Optional[str] = Query(None, description="Optional user ID for storing search history")
+):
+    search_run = JobSearchRun(search_params, user_id)
+    source = search_source(search_params)
+    
+    try:
+        local_jobs = []
+        if source != "remote":
+            local_jobs = search_local(search_params)
+            if source == "local" or len(local_jobs) >= search_params.max_results:
+                search_run.adopt_local(local_jobs)
+                response = await search_run.finish()
+                detail_prefetcher.submit([job.application_url for job in search_run.jobs])
+                return response
+        
+        cached_response = await get_cached_search(search_params, tavily_tool)
+        if cached_response is None and search_params.deadline_ms:
+            # Answer within the latency budget; only completed jobs are prefetched
+            response = await search_run.finish_within(tavily_tool, search_params.deadline_ms / 1000, local_jobs)
+            detail_prefetcher.submit([job.application_url for job in response.results])
+            return response
+        
+        if cached_response is None:
+            # Identical searches already in flight share one pipeline run
+            cached_response = await search_flights.do(
+                search_cache_key(search_params),
+                lambda: execute_search(search_params, tavily_tool)
+            )
         
-        # Store search data in MongoDB
-        job_searches_collection.insert_one(job_search.dict())
+        # Every caller still gets its own search_id and history entry
+        search_run.adopt(cached_response)
+        # Hybrid searches fill any remaining slots from the local index
+        search_run.adopt_local(local_jobs)
+        response = await search_run.finish()
         
-        # Background task to update cache for detailed job info
-        background_tasks.add_task(prefetch_job_details, [job.application_url for job in jobs])
+        # Warm the detail cache for the results, best ranked first
+        detail_prefetcher.submit([job.application_url for job in search_run.jobs])
         
-        return SearchResponse(
-            results=jobs,
-            total_results=len(jobs),
-            query_time_ms=int((time.time() - start_time) * 1000),
-            women_friendly_count=women_friendly_jobs
-        )
+        return response
     
     except Exception as e:
         logger.error(f"Error in search_jobs: {e}")
@@ -481,354 +1157,127 @@ async def search_jobs(
         return SearchResponse(
             results=[], 
             total_results=0,
-            query_time_ms=int((time.time() - start_time) * 1000),
+            query_time_ms=search_run.query_time_ms(),
             women_friendly_count=0
         )
 
-def is_women_friendly(title: str, company: str, text: str) -> bool:
-    """Determine if a job is women-friendly based on title, company, and text content"""
-    
-    # Check if the company is in our list of women-friendly companies
-    if company and any(wfc.lower() in company.lower() for wfc in WOMEN_FRIENDLY_COMPANIES):
-        return True
-    
-    # Check for women-friendly keywords in the job text and title
-    combined_text = (text or "") + " " + (title or "") + " " + (company or "")
-    combined_text = combined_text.lower()
-    
-    # Count the number of women-friendly keywords present
-    keyword_count = sum(1 for keyword in WOMEN_FRIENDLY_KEYWORDS if keyword.lower() in combined_text)
-    
-    # If 2 or more keywords are present, consider it women-friendly
-    return keyword_count >= 2
-
-def extract_skills(text: str) -> List[str]:
-    """Extract skills from job description text"""
-    if not text:
-        return []
-    
-    # Common tech skills to look for
-    tech_skills = [
-        'python', 'javascript', 'typescript', 'java', 'c\+\+', 'c#', 'ruby', 'go', 'php',
-        'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring', 'express',
-        'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'oracle', 'firebase',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ci/cd',
-        'git', 'github', 'gitlab', 'bitbucket', 'agile', 'scrum', 'kanban',
-        'html', 'css', 'sass', 'less', 'tailwind', 'bootstrap',
-        'ai', 'machine learning', 'deep learning', 'data science', 'tensorflow', 'pytorch',
-        'product management', 'ux', 'ui', 'figma', 'sketch', 'adobe xd',
-        'data analysis', 'tableau', 'power bi', 'excel', 'r', 'sas'
-    ]
-    
-    # Find matches
-    skills_found = set()
-    for skill in tech_skills:
-        if re.search(r'\b' + skill + r'\b', text.lower()):
-            # Clean up the skill name (capitalize properly)
-            clean_skill = skill.replace('\\', '')
-            if clean_skill == 'html' or clean_skill == 'css' or clean_skill == 'aws' or clean_skill == 'gcp':
-                skills_found.add(clean_skill.upper())
-            elif clean_skill in ['ai', 'ui', 'ux']:
-                skills_found.add(clean_skill.upper())
+@app.post("/api/search/stream", tags=["Search"])
+async def search_jobs_stream(
+    search_params: SearchQuery,
+    tavily_tool=Depends(get_tavily_tool),
+    user_id: Optional[str] = Query(None, description="Optional user ID for storing search history")
+):
+    """Stream search results as NDJSON.
+    
+    Emits one ``{"type": "job", "job": {...}}`` line per job as soon as it is
+    extracted, then a final ``{"type": "summary", ...}`` line. ``source`` is
+    honoured as in /api/search.
+    """
+    search_run = JobSearchRun(search_params, user_id)
+    source = search_source(search_params)
+    
+    async def frames():
+        try:
+            local_jobs = search_local(search_params) if source != "remote" else []
+            if source == "local" or len(local_jobs) >= search_params.max_results:
+                search_run.adopt_local(local_jobs)
+                for job_info in search_run.jobs:
+                    yield json.dumps({"type": "job", "job": job_info.dict()}, default=str) + "\n"
             else:
-                skills_found.add(clean_skill.title())
+                cached_response = await get_cached_search(search_params, tavily_tool)
+                if cached_response is not None:
+                    search_run.adopt(cached_response)
+                    for job_info in search_run.jobs:
+                        yield json.dumps({"type": "job", "job": job_info.dict()}, default=str) + "\n"
+                else:
+                    async for job_info in search_run.iter_jobs(tavily_tool):
+                        yield json.dumps({"type": "job", "job": job_info.dict()}, default=str) + "\n"
+                    if not search_run.is_degraded():
+                        search_cache.set(search_cache_key(search_params), SearchResponse(
+                            results=search_run.jobs,
+                            total_results=len(search_run.jobs),
+                            query_time_ms=search_run.query_time_ms(),
+                            women_friendly_count=search_run.women_friendly_jobs
+                        ))
+                
+                # Hybrid searches fill any remaining slots from the local index
+                streamed = len(search_run.jobs)
+                search_run.adopt_local(local_jobs)
+                for job_info in search_run.jobs[streamed:]:
+                    yield json.dumps({"type": "job", "job": job_info.dict()}, default=str) + "\n"
+            await search_run.finish()
+        except Exception as e:
+            logger.error(f"Error in search_jobs_stream: {e}")
+        finally:
+            # Keep whatever was extracted even if the client disconnected
+            await asyncio.shield(search_run.flush_job_results())
+            detail_prefetcher.submit([job.application_url for job in search_run.jobs])
+        
+        yield json.dumps({
+            "type": "summary",
+            "search_id": search_run.search_id,
+            "total_results": len(search_run.jobs),
+            "women_friendly_count": search_run.women_friendly_jobs,
+            "query_time_ms": search_run.query_time_ms()
+        }) + "\n"
     
-    return list(skills_found)
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
 
-def fetch_job_info(url: str) -> JobBasic:
+async def fetch_diffbot_payload(url: str) -> Optional[Dict[str, Any]]:
+    """Fetch the raw Diffbot analyze payload for a URL, reusing a cached copy"""
+    cached_payload = payload_cache.get(url)
+    if cached_payload is not None:
+        return cached_payload
+    
+    return await payload_fetches.do(url, lambda: _fetch_diffbot_payload(url))
+
+async def _fetch_diffbot_payload(url: str) -> Optional[Dict[str, Any]]:
+    # Use Diffbot's Analyze API through the shared, pooled client; throttling
+    # and server errors count against the governor like exceptions do
+    response = await diffbot_governor.call(
+        lambda: diffbot_client.analyze(url),
+        is_failure=lambda r: r.status_code == 429 or r.status_code >= 500
+    )
+    
+    if response.status_code != 200:
+        logger.warning(f"Non-200 response from Diffbot: {response.status_code} for {url}")
+        return None
+    
+    data = response.json()
+    logger.info(f"Successfully fetched data from Diffbot for {url}")
+    
+    payload_cache.set(url, data, size=len(response.content))
+    return data
+
+async def fetch_job_info(url: str) -> JobBasic:
     """Fetch rich job information from URL using Diffbot API"""
     # Check cache first
-    if url in job_cache:
-        return job_cache[url]
+    cached_job = await job_cache.get(url)
+    if cached_job is not None:
+        return cached_job
     
+    # Join an identical fetch that is already in flight instead of starting another
+    return await job_fetches.do(url, lambda: _fetch_job_info(url))
+
+async def _fetch_job_info(url: str) -> JobBasic:
+    """Fetch and extract a job from Diffbot, bypassing the job cache"""
     try:
-        # Use Diffbot's Article API with more advanced parameters to get comprehensive information
-        API_URL = f"https://api.diffbot.com/v3/analyze?token={DIFFBOT_API_KEY}&url={url}&fields=links,meta,images,sentiment,facts&discussion=false&timeout=15000"
-        
-        response = requests.get(API_URL, timeout=15)
+        data = await fetch_diffbot_payload(url)
         
         # Handle unsuccessful responses gracefully
-        if response.status_code != 200:
-            logger.warning(f"Non-200 response from Diffbot: {response.status_code} for {url}")
+        if data is None:
             return JobBasic(
                 title="Job Listing",
                 company="Unknown Company",
                 application_url=url
             )
         
-        data = response.json()
-        logger.info(f"Successfully fetched data from Diffbot for {url}")
-        
-        # Extract job information from Diffbot response
-        if 'objects' in data and len(data['objects']) > 0:
-            job_data = data['objects'][0]
-            
-            # Safely extract fields with default values
-            title = job_data.get('title', 'Unknown Job')
-            company = job_data.get('publisher', 'Unknown Company')
-            
-            # Extract text for analysis
-            text = job_data.get('text', '')
-            html = job_data.get('html', '')
-            
-            # Extract summary if available or create one
-            summary = None
-            if job_data.get('summary'):
-                summary = job_data.get('summary')
-            elif len(text) > 100:
-                # Create a more concise summary - first paragraph or first 200 chars
-                paragraphs = text.split('\n\n')
-                if paragraphs and len(paragraphs[0]) > 20:
-                    summary = paragraphs[0].strip()
-                    if len(summary) > 250:
-                        summary = summary[:247] + "..."
-                else:
-                    summary = text[:200] + "..." if len(text) > 200 else text
-            
-            # Find more detailed location info
-            location = None
-            if job_data.get('location'):
-                location = job_data.get('location')
-            elif 'address' in job_data and job_data['address'] and 'locality' in job_data['address']:
-                if job_data['address'].get('region'):
-                    location = f"{job_data['address'].get('locality')}, {job_data['address'].get('region')}"
-                else:
-                    location = job_data['address'].get('locality')
-            
-            # Extract company description
-            company_description = None
-            if 'description' in job_data:
-                company_description = job_data.get('description')
-            elif text:
-                company_pattern = r'(?:about us|about the company|company overview)(?::|.{0,10})(.*?)(?:\n\n|\n\s*\n)'
-                company_match = re.search(company_pattern, text, re.IGNORECASE | re.DOTALL)
-                if company_match:
-                    company_description = company_match.group(1).strip()
-                    if len(company_description) > 150:
-                        company_description = company_description[:147] + "..."
-            
-            # Determine availability (could be inferred from posting date)
-            availability = "Available"
-            posting_date = job_data.get('date')
-            if not posting_date and 'estimatedDate' in job_data:
-                posting_date = job_data['estimatedDate']
-                
-            if posting_date:
-                try:
-                    from dateutil import parser
-                    posted_date = parser.parse(posting_date)
-                    if (datetime.now(posted_date.tzinfo) - posted_date).days > 30:
-                        availability = "May Be Filled"
-                except:
-                    pass
-            
-            # Extract application deadline
-            application_deadline = None
-            deadline_patterns = [
-                r'(?:apply by|application deadline|closing date|deadline)(?::|is|.*?:)?\s*(\w+\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4})',
-                r'(?:apply by|application deadline|closing date|deadline)(?::|is|.*?:)?\s*(\d{1,2}(?:st|nd|rd|th)?\s+\w+,?\s+\d{4})',
-                r'(\d{1,2}/\d{1,2}/\d{4})(?:.*?deadline)'
-            ]
-            
-            for pattern in deadline_patterns:
-                deadline_match = re.search(pattern, text, re.IGNORECASE)
-                if deadline_match:
-                    application_deadline = deadline_match.group(1).strip()
-                    break
-            
-            # Enhanced job type detection
-            job_type = job_data.get('jobType')
-            if not job_type and text:
-                job_type_patterns = {
-                    'full-time': r'full[- ]time|full time',
-                    'part-time': r'part[- ]time|part time',
-                    'contract': r'contract|contractor',
-                    'freelance': r'freelance',
-                    'internship': r'internship|intern',
-                    'remote': r'remote|work from home|wfh',
-                    'hybrid': r'hybrid'
-                }
-                
-                for type_name, pattern in job_type_patterns.items():
-                    if re.search(pattern, text.lower()):
-                        job_type = type_name
-                        break
-            
-            # Enhanced salary extraction
-            salary_range = job_data.get('salaryRange')
-            if not salary_range and text:
-                # Look for salary patterns
-                salary_patterns = [
-                    r'\$\d{2,3}(?:,\d{3})+(?:\s*-\s*\$\d{2,3}(?:,\d{3})+)?(?:\s*per\s*year|\s*annually|\s*/\s*year)?',
-                    r'\$\d{2,3}K\s*-\s*\$\d{2,3}K',
-                    r'\d{2,3},\d{3}\s*-\s*\d{2,3},\d{3}\s*(?:USD|EUR|GBP)?'
-                ]
-                
-                for pattern in salary_patterns:
-                    salary_match = re.search(pattern, text)
-                    if salary_match:
-                        salary_range = salary_match.group(0)
-                        break
-            
-            # Extract education requirements
-            education_required = None
-            edu_patterns = [
-                r'(?:bachelor|master|phd|bs|ms|ba|degree|diploma)',
-                r'(?:education|educational)(?:\s+requirements|\s+qualifications)?(?::|.{0,10})(.*?)(?:\n|\n\n)'
-            ]
-            for pattern in edu_patterns:
-                edu_match = re.search(pattern, text, re.IGNORECASE)
-                if edu_match:
-                    # Extract the sentence containing the education requirement
-                    sentence = re.findall(r'[^.!?]*(?:' + pattern + ')[^.!?]*[.!?]', text, re.IGNORECASE)
-                    if sentence:
-                        education_required = sentence[0].strip()
-                        break
-            
-            # Extract experience requirements
-            experience_required = None
-            exp_patterns = [
-                r'(\d+(?:-\d+)?\+?\s+years?(?:\s+of)?\s+experience)',
-                r'experience(?::|.*?:)?\s+(\d+(?:-\d+)?\+?\s+years)'
-            ]
-            for pattern in exp_patterns:
-                exp_match = re.search(pattern, text, re.IGNORECASE)
-                if exp_match:
-                    experience_required = exp_match.group(1).strip()
-                    break
-            
-            # Extract job highlights
-            job_highlights = []
-            if text:
-                # Look for bullet points after common headers
-                highlight_pattern = r'(?:highlights|why you\'ll love this role|what you\'ll do|responsibilities|key responsibilities)(?::|.{0,10})(.*?)(?:\n\n\w|requirements|qualifications)'
-                highlight_match = re.search(highlight_pattern, text, re.IGNORECASE | re.DOTALL)
-                
-                if highlight_match:
-                    highlight_text = highlight_match.group(1).strip()
-                    # Extract bullet points
-                    if '•' in highlight_text:
-                        points = [p.strip() for p in highlight_text.split('•') if p.strip()]
-                    elif '-' in highlight_text:
-                        points = [p.strip() for p in highlight_text.split('-') if p.strip()]
-                    else:
-                        # Split by new lines if no bullet points
-                        points = [p.strip() for p in highlight_text.split('\n') if p.strip() and len(p.strip()) > 15]
-                    
-                    # Take just 3-5 key highlights
-                    job_highlights = points[:5]
-            
-            # Look for images with better prioritization
-            company_logo_url = None
-            banner_image_url = None
-            additional_images = []
-            
-            # First try to find a logo in the page data
-            if 'logo' in job_data and job_data['logo'] and 'url' in job_data['logo']:
-                company_logo_url = job_data['logo']['url']
-            
-            # Extract all images for further processing
-            if 'images' in job_data:
-                # Sort images by size, prioritizing larger ones for banner
-                sorted_images = sorted(
-                    [img for img in job_data.get('images', []) if img.get('url')],
-                    key=lambda x: (x.get('width', 0) * x.get('height', 0)), 
-                    reverse=True
-                )
-                
-                for img in sorted_images:
-                    img_url = img.get('url')
-                    img_alt = img.get('alt', '').lower()
-                    
-                    # Skip tiny images and icons
-                    if img.get('width', 0) < 100 or img.get('height', 0) < 100:
-                        continue
-                        
-                    # Specific logo detection
-                    if not company_logo_url and ('logo' in img_alt or 'company' in img_alt or 'brand' in img_alt):
-                        company_logo_url = img_url
-                        continue
-                    
-                    # Banner image - want a large, wide image
-                    if not banner_image_url and img.get('width', 0) > 400 and img.get('width', 0) > img.get('height', 0):
-                        banner_image_url = img_url
-                        continue
-                    
-                    # Collect other useful images that might be relevant
-                    additional_images.append(img_url)
-            
-            # If we have additional images but no banner, use the first additional image
-            if not banner_image_url and additional_images:
-                banner_image_url = additional_images[0]
-                additional_images = additional_images[1:]
-            
-            # If no logo found but we have a company name, use a generated one
-            if not company_logo_url and company:
-                company_initial = company.strip()[0].upper() if company.strip() else "C"
-                bg_color = "f8a5c2"  # Pink background
-                company_logo_url = f"https://ui-avatars.com/api/?name={company_initial}&background={bg_color}&color=fff&size=128&bold=true&font-size=0.6"
-            
-            # Determine if job is women-friendly
-            is_women_friendly_job = is_women_friendly(title, company, text)
-            
-            # Extract skills
-            skills = extract_skills(text)
-            
-            # Extract qualifications
-            qualifications = []
-            qualifications_section = re.search(r'(?:requirements|qualifications|what you\'ll need)(?::|.*?:)(.*?)(?:responsibilities|benefits|about us|\n\n\w)', text.lower(), re.DOTALL | re.IGNORECASE)
-            if qualifications_section:
-                qual_text = qualifications_section.group(1).strip()
-                # Extract bullet points
-                if '•' in qual_text:
-                    qualifications = [q.strip() for q in qual_text.split('•') if q.strip()]
-                elif '-' in qual_text:
-                    qualifications = [q.strip() for q in qual_text.split('-') if q.strip()]
-                else:
-                    # Split by new lines if no bullet points
-                    qualifications = [q.strip() for q in qual_text.split('\n') if q.strip()]
-                
-                # Limit to top few qualifications
-                qualifications = [q for q in qualifications[:5] if len(q) > 10]
-            
-            # Determine job category based on title and content
-            category = "Tech Jobs"
-            if any(keyword in title.lower() for keyword in ["data", "analyst", "scientist", "ml", "ai"]):
-                category = "Data Science"
-            elif any(keyword in title.lower() for keyword in ["developer", "engineer", "programmer", "code"]):
-                category = "Software Engineering"
-            elif any(keyword in title.lower() for keyword in ["design", "ux", "ui", "user experience"]):
-                category = "Design"
-            elif any(keyword in title.lower() for keyword in ["product", "manager", "owner"]):
-                category = "Product"
-            elif any(keyword in title.lower() for keyword in ["marketing", "growth", "seo"]):
-                category = "Marketing"
-            
-            # Create job object with enhanced details
-            job_info = JobBasic(
-                title=title,
-                company=company,
-                location=location,
-                job_type=job_type,
-                posting_date=posting_date,
-                salary_range=salary_range,
-                application_url=url,
-                is_women_friendly=is_women_friendly_job,
-                skills=skills,
-                company_logo_url=company_logo_url,
-                banner_image_url=banner_image_url,
-                summary=summary,
-                company_description=company_description,
-                availability=availability,
-                category=category,
-                education_required=education_required,
-                experience_required=experience_required,
-                application_deadline=application_deadline,
-                job_highlights=job_highlights
-            )
-            
+        # CPU-bound parsing runs in the extraction pool when one is configured
+        fields = await extraction_pool.parse(url, data)
+        if fields is not None:
+            job_info = JobBasic(**fields, extracted_at=datetime.utcnow())
             # Cache the result
-            job_cache[url] = job_info
+            job_cache.set(url, job_info)
             
             return job_info
         
@@ -840,6 +1289,21 @@ def fetch_job_info(url: str) -> JobBasic:
             application_url=url
         )
     
+    except CircuitOpenError as e:
+        # Diffbot is unhealthy: serve the last stored copy of the job, however old
+        logger.warning(f"{e}; serving stored job for {url}")
+        try:
+            stored_job = await database.job_results.find_fresh(url, datetime.min)
+        except Exception:
+            stored_job = None
+        if stored_job:
+            return JobBasic(**stored_job)
+        return JobBasic(
+            title="Job Listing",
+            company="Unknown Company",
+            application_url=url
+        )
+    
     except Exception as e:
         # Log the error but return a minimal job basic object
         logger.error(f"Error in fetch_job_info for {url}: {e}")
@@ -849,133 +1313,131 @@ def fetch_job_info(url: str) -> JobBasic:
             application_url=url
         )
 
-def prefetch_job_details(urls: List[str]):
-    """Prefetch and cache job details in the background"""
-    for url in urls:
-        try:
-            if url not in job_cache:
-                fetch_job_info(url)
-        except Exception as e:
-            logger.error(f"Error prefetching job details for {url}: {e}")
+def extract_job_details(basic_info: JobBasic, data: Dict[str, Any]) -> JobDetail:
+    """Build a JobDetail from basic job info and a raw Diffbot analyze payload"""
+    # Extract additional details
+    description = None
+    qualifications = []
+    skills_required = []
+    benefits = []
+    why_women_friendly = []
+    additional_info = {}
+    company_culture = None
+    work_environment = None
+    compensation_details = {}
+    related_jobs = []
+    
+    if 'objects' in data and len(data['objects']) > 0:
+        job_data = data['objects'][0]
+        
+        # Safely extract description
+        description = job_data.get('text')
+        
+        # Try to extract qualifications and skills
+        if description:
+            # Extract sections based on common headers
+            sections = re.split(r'\n\s*(?:Requirements|Qualifications|About the Role|Responsibilities|Benefits|What You\'ll Do|Who You Are|Company Culture|Work Environment)\s*\n', description, flags=re.IGNORECASE)
+            
+            if len(sections) > 1:
+                # First section is usually the job description
+                description = sections[0].strip()
+                
+                # Look for qualifications and requirements
+                for section in sections[1:]:
+                    lines = [line.strip() for line in section.split('\n') if line.strip()]
+                    
+                    section_lower = section.lower()
+                    if any(kw in section_lower for kw in ['qualif', 'require', 'who you are']):
+                        qualifications.extend(lines[:5])  # Take up to 5 lines
+                    
+                    if any(kw in section_lower for kw in ['benefit', 'offer', 'perks']):
+                        benefits.extend(lines[:5])  # Take up to 5 lines
+                    
+                    if any(kw in section_lower for kw in ['company culture', 'values', 'our culture']):
+                        company_culture = '\n'.join(lines[:3])
+                    
+                    if any(kw in section_lower for kw in ['work environment', 'workplace', 'office']):
+                        work_environment = '\n'.join(lines[:3])
+            
+            # Extract women-friendly aspects from the keyword match positions
+            if basic_info.is_women_friendly:
+                why_women_friendly = get_women_friendly_classifier().evidence_sentences(description)
+            
+            # Extract compensation details
+            salary_pattern = r'salary(?:.*?)(\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s*(?:per|/)\s*(?:year|month|hour))?)'
+            salary_match = re.search(salary_pattern, description, re.IGNORECASE)
+            if salary_match:
+                compensation_details['salary'] = salary_match.group(1).strip()
+            
+            equity_pattern = r'equity(?:.*?)([\d\.]+%(?:\s*-\s*[\d\.]+%)?)'
+            equity_match = re.search(equity_pattern, description, re.IGNORECASE)
+            if equity_match:
+                compensation_details['equity'] = equity_match.group(1).strip()
+            
+            bonus_pattern = r'bonus(?:.*?)(\$[\d,]+|\d+%)'
+            bonus_match = re.search(bonus_pattern, description, re.IGNORECASE)
+            if bonus_match:
+                compensation_details['bonus'] = bonus_match.group(1).strip()
+            
+            # Try to extract related jobs
+            if 'links' in job_data:
+                job_links = [link for link in job_data.get('links', []) if 'job' in link.get('url', '').lower()]
+                related_job_titles = []
+                
+                for link in job_links[:5]:  # Limit to 5 related jobs
+                    title = link.get('title')
+                    if title and len(title) < 100:  # Reasonable title length
+                        related_job_titles.append(title)
+                
+                related_jobs = related_job_titles
+        
+        # Create detailed job info
+        detailed_info = JobDetail(
+            **basic_info.dict(),
+            description=description,
+            # JobBasic doesn't carry qualifications; fall back to the requirements section
+            qualifications=qualifications or extract_qualifications(job_data.get('text') or ''),
+            benefits=benefits,
+            why_women_friendly=why_women_friendly,
+            additional_info=additional_info,
+            company_culture=company_culture,
+            work_environment=work_environment,
+            compensation_details=compensation_details,
+            related_jobs=related_jobs
+        )
+        
+        return detailed_info
+    
+    # Fallback to basic info
+    return JobDetail(**basic_info.dict())
 
-def fetch_job_details(url: str) -> JobDetail:
+async def fetch_job_details(url: str) -> JobDetail:
     """Fetch detailed job information from URL using Diffbot"""
+    # Fully built details are cached after the first view
+    cached_detail = detail_cache.get(url)
+    if cached_detail is not None:
+        return cached_detail
+    
+    # A click on a job that is being prefetched joins the prefetch
+    return await detail_fetches.do(url, lambda: _fetch_job_details(url))
+
+async def _fetch_job_details(url: str) -> JobDetail:
     try:
         # First get basic info (which might already be cached)
-        basic_info = fetch_job_info(url)
-        
-        API_URL = f"https://api.diffbot.com/v3/analyze?token={DIFFBOT_API_KEY}&url={url}&fields=links,meta,images,sentiment,facts&discussion=false&timeout=15000"
+        basic_info = await fetch_job_info(url)
         
-        response = requests.get(API_URL, timeout=15)
+        # Reuses the raw payload fetched for the basic info when still cached
+        data = await fetch_diffbot_payload(url)
         
         # Handle unsuccessful responses
-        if response.status_code != 200:
+        if data is None:
             # Return basic job info with empty additional fields
             return JobDetail(**basic_info.dict())
         
-        data = response.json()
-        
-        # Extract additional details
-        description = None
-        qualifications = []
-        skills_required = []
-        benefits = []
-        why_women_friendly = []
-        additional_info = {}
-        company_culture = None
-        work_environment = None
-        compensation_details = {}
-        related_jobs = []
-        
-        if 'objects' in data and len(data['objects']) > 0:
-            job_data = data['objects'][0]
-            
-            # Safely extract description
-            description = job_data.get('text')
-            
-            # Try to extract qualifications and skills
-            if description:
-                # Extract sections based on common headers
-                sections = re.split(r'\n\s*(?:Requirements|Qualifications|About the Role|Responsibilities|Benefits|What You\'ll Do|Who You Are|Company Culture|Work Environment)\s*\n', description, flags=re.IGNORECASE)
-                
-                if len(sections) > 1:
-                    # First section is usually the job description
-                    description = sections[0].strip()
-                    
-                    # Look for qualifications and requirements
-                    for section in sections[1:]:
-                        lines = [line.strip() for line in section.split('\n') if line.strip()]
-                        
-                        section_lower = section.lower()
-                        if any(kw in section_lower for kw in ['qualif', 'require', 'who you are']):
-                            qualifications.extend(lines[:5])  # Take up to 5 lines
-                        
-                        if any(kw in section_lower for kw in ['benefit', 'offer', 'perks']):
-                            benefits.extend(lines[:5])  # Take up to 5 lines
-                        
-                        if any(kw in section_lower for kw in ['company culture', 'values', 'our culture']):
-                            company_culture = '\n'.join(lines[:3])
-                        
-                        if any(kw in section_lower for kw in ['work environment', 'workplace', 'office']):
-                            work_environment = '\n'.join(lines[:3])
-                
-                # Extract women-friendly aspects
-                if basic_info.is_women_friendly:
-                    for keyword in WOMEN_FRIENDLY_KEYWORDS:
-                        if keyword in description.lower():
-                            # Find the sentence containing the keyword
-                            sentences = re.split(r'(?<=[.!?])\s+', description)
-                            for sentence in sentences:
-                                if keyword in sentence.lower():
-                                    why_women_friendly.append(sentence.strip())
-                                    break
-                
-                # Extract compensation details
-                salary_pattern = r'salary(?:.*?)(\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s*(?:per|/)\s*(?:year|month|hour))?)'
-                salary_match = re.search(salary_pattern, description, re.IGNORECASE)
-                if salary_match:
-                    compensation_details['salary'] = salary_match.group(1).strip()
-                
-                equity_pattern = r'equity(?:.*?)([\d\.]+%(?:\s*-\s*[\d\.]+%)?)'
-                equity_match = re.search(equity_pattern, description, re.IGNORECASE)
-                if equity_match:
-                    compensation_details['equity'] = equity_match.group(1).strip()
-                
-                bonus_pattern = r'bonus(?:.*?)(\$[\d,]+|\d+%)'
-                bonus_match = re.search(bonus_pattern, description, re.IGNORECASE)
-                if bonus_match:
-                    compensation_details['bonus'] = bonus_match.group(1).strip()
-                
-                # Try to extract related jobs
-                if 'links' in job_data:
-                    job_links = [link for link in job_data.get('links', []) if 'job' in link.get('url', '').lower()]
-                    related_job_titles = []
-                    
-                    for link in job_links[:5]:  # Limit to 5 related jobs
-                        title = link.get('title')
-                        if title and len(title) < 100:  # Reasonable title length
-                            related_job_titles.append(title)
-                    
-                    related_jobs = related_job_titles
-            
-            # Create detailed job info
-            detailed_info = JobDetail(
-                **basic_info.dict(),
-                description=description,
-                qualifications=qualifications or basic_info.qualifications,
-                benefits=benefits,
-                why_women_friendly=why_women_friendly,
-                additional_info=additional_info,
-                company_culture=company_culture,
-                work_environment=work_environment,
-                compensation_details=compensation_details,
-                related_jobs=related_jobs
-            )
-            
-            return detailed_info
+        detailed_info = extract_job_details(basic_info, data)
+        detail_cache.set(url, detailed_info)
         
-        # Fallback to basic info
-        return JobDetail(**basic_info.dict())
+        return detailed_info
     
     except Exception as e:
         logger.error(f"Error in fetch_job_details for {url}: {e}")
@@ -990,6 +1452,21 @@ def fetch_job_details(url: str) -> JobDetail:
                 application_url=url
             )
 
+async def warm_job_detail(url: str):
+    """Build and cache a job's details ahead of the user opening it"""
+    if diffbot_governor.breaker.state == CircuitBreaker.OPEN:
+        # Nothing would be cached; leave Diffbot's capacity to foreground requests
+        return
+    await fetch_job_details(url)
+
+# Search results are queued here in rank order to warm the detail cache
+detail_prefetcher = DetailPrefetcher(
+    build=warm_job_detail,
+    is_cached=lambda url: url in detail_cache,
+    workers=PREFETCH_WORKERS,
+    max_queue_size=PREFETCH_QUEUE_SIZE
+)
+
 @app.get("/api/job/{job_url:path}", response_model=JobDetail, tags=["Job Details"])
 async def get_job_details(job_url: str):
     """Get detailed information about a specific job"""
@@ -998,7 +1475,7 @@ async def get_job_details(job_url: str):
         job_url = job_url.replace('___', '://')
         
         # Get detailed job info
-        job_details = fetch_job_details(job_url)
+        job_details = await fetch_job_details(job_url)
         
         return job_details
     
@@ -1011,18 +1488,60 @@ async def get_statistics():
     """Get statistics about the job search API"""
     return {
         "cache_size": len(job_cache),
+        "job_cache": job_cache.stats(),
+        "job_fetch_coalescing": job_fetches.stats(),
+        "diffbot_payload_cache": payload_cache.stats(),
+        "diffbot_fetch_coalescing": payload_fetches.stats(),
+        "job_detail_cache": detail_cache.stats(),
+        "job_detail_prefetch": detail_prefetcher.stats(),
+        "extraction_pool": extraction_pool.stats(),
+        "diffbot_governor": diffbot_governor.stats(),
+        "tavily_governor": tavily_governor.stats(),
+        "job_results_writes": job_results_write_stats.stats(),
+        "user_jobs_writes": user_jobs_write_stats.stats(),
+        "search_cache": {
+            **search_cache.stats(),
+            **search_cache_stats,
+            "fresh_seconds": SEARCH_CACHE_FRESH_SECONDS
+        },
+        "search_url_cache": search_url_cache.stats(),
+        "search_index": dict(search_index.stats(), ready=job_index_state["ready"]),
+        "duplicate_index": duplicate_index.stats(),
+        "search_coalescing": search_flights.stats(),
+        "chat_memory": chat_memories.stats(),
+        "chat_stream": {
+            **chat_stream_stats,
+            "time_to_first_token": chat_stream_ttft.stats()
+        },
         "api_version": "1.1.0",
         "women_friendly_companies_count": len(WOMEN_FRIENDLY_COMPANIES),
         "status": "healthy"
     }
 
+def check_cursor(cursor: Optional[str]):
+    """Reject a malformed pagination cursor with a 400"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+def wants_total(include_total: Optional[bool], cursor: Optional[str], skip: int) -> bool:
+    """Counting is opt-in past the first page, so deep pages stay one index seek"""
+    if include_total is not None:
+        return include_total
+    return not cursor and skip == 0
+
 @app.get("/api/job-searches", tags=["Job Search"])
 async def get_job_searches(
     user_id: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
-    skip: int = Query(0, ge=0)
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: first page only)")
 ):
     """Get job search history, optionally filtered by user ID"""
+    check_cursor(cursor)
     try:
         # Build query
         query = {}
@@ -1030,13 +1549,8 @@ async def get_job_searches(
             query["user_id"] = user_id
             
         # Fetch searches from MongoDB
-        total = job_searches_collection.count_documents(query)
-        searches = list(job_searches_collection.find(
-            query, 
-            sort=[("timestamp", DESCENDING)],
-            skip=skip,
-            limit=limit
-        ))
+        total = await database.job_searches.count(query) if wants_total(include_total, cursor, skip) else None
+        searches, next_cursor = await database.job_searches.page(query, limit=limit, cursor=cursor, skip=skip)
         
         # Convert ObjectId to string
         for search in searches:
@@ -1046,7 +1560,8 @@ async def get_job_searches(
             "searches": searches,
             "total": total,
             "limit": limit,
-            "skip": skip
+            "skip": skip,
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Error getting job searches: {e}")
@@ -1057,23 +1572,27 @@ async def get_job_search_results(
     search_id: str,
     limit: int = Query(50, ge=1, le=100),
     skip: int = Query(0, ge=0),
-    women_friendly_only: bool = Query(False)
+    women_friendly_only: bool = Query(False),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: first page only)")
 ):
     """Get job results for a specific search"""
+    check_cursor(cursor)
     try:
         # Build query
-        query = {"search_id": search_id}
+        query = {"search_ids": search_id}
         if women_friendly_only:
             query["is_women_friendly"] = True
             
         # Fetch jobs from MongoDB
-        total = job_results_collection.count_documents(query)
-        jobs = list(job_results_collection.find(
+        total = await database.job_results.count(query) if wants_total(include_total, cursor, skip) else None
+        jobs, next_cursor = await database.job_results.page(
             query,
             sort=[("company", ASCENDING), ("title", ASCENDING)],
-            skip=skip,
-            limit=limit
-        ))
+            limit=limit,
+            cursor=cursor,
+            skip=skip
+        )
         
         # Convert ObjectId to string
         for job in jobs:
@@ -1083,7 +1602,8 @@ async def get_job_search_results(
             "jobs": jobs,
             "total": total,
             "limit": limit,
-            "skip": skip
+            "skip": skip,
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Error getting job search results: {e}")
@@ -1093,43 +1613,24 @@ async def get_job_search_results(
 async def get_saved_jobs(
     user_id: str = Query(..., description="User ID for retrieving saved jobs"),
     limit: int = Query(50, ge=1, le=100),
-    skip: int = Query(0, ge=0)
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: first page only)")
 ):
     """Get saved jobs for a specific user"""
+    check_cursor(cursor)
     try:
         # This endpoint assumes you have a system for users saving jobs
-        # For now, we'll return all women-friendly jobs from the user's searches
-        
-        # First get all searches by this user
-        user_searches = job_searches_collection.find(
-            {"user_id": user_id},
-            projection={"search_id": 1}
-        )
-        
-        search_ids = [search["search_id"] for search in user_searches]
-        
-        if not search_ids:
-            return {
-                "jobs": [],
-                "total": 0,
-                "limit": limit,
-                "skip": skip
-            }
-        
-        # Now get women-friendly jobs from those searches
+        # For now, we'll return all women-friendly jobs from the user's searches,
+        # kept per user in user_jobs as searches store their results
         query = {
-            "search_id": {"$in": search_ids},
+            "user_id": user_id,
             "is_women_friendly": True
         }
             
-        # Fetch jobs from MongoDB
-        total = job_results_collection.count_documents(query)
-        jobs = list(job_results_collection.find(
-            query,
-            sort=[("stored_at", DESCENDING)],
-            skip=skip,
-            limit=limit
-        ))
+        # One query on the (user_id, is_women_friendly, stored_at) index
+        total = await database.user_jobs.count(query) if wants_total(include_total, cursor, skip) else None
+        jobs, next_cursor = await database.user_jobs.page(query, limit=limit, cursor=cursor, skip=skip)
         
         # Convert ObjectId to string
         for job in jobs:
@@ -1139,7 +1640,8 @@ async def get_saved_jobs(
             "jobs": jobs,
             "total": total,
             "limit": limit,
-            "skip": skip
+            "skip": skip,
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Error getting saved jobs: {e}")
@@ -1152,29 +1654,15 @@ async def save_job(
 ):
     """Save a job for a user"""
     try:
-        # Create a collection for saved jobs if it doesn't exist
-        if "saved_jobs" not in db.list_collection_names():
-            saved_jobs_collection = db["saved_jobs"]
-            # Create indexes
-            saved_jobs_collection.create_index([("user_id", ASCENDING)])
-            saved_jobs_collection.create_index([("job_id", ASCENDING)])
-            saved_jobs_collection.create_index([("application_url", ASCENDING)])
-            saved_jobs_collection.create_index([("saved_at", DESCENDING)])
-        else:
-            saved_jobs_collection = db["saved_jobs"]
-        
         # Generate a unique job ID if not provided
         job_id = str(uuid.uuid4())
         
         # Check if this job is already saved by this user
-        existing_job = saved_jobs_collection.find_one({
-            "user_id": user_id,
-            "application_url": job_data.application_url
-        })
+        existing_job = await database.saved_jobs.find(user_id, job_data.application_url)
         
         if existing_job:
             # Job already saved, remove it (toggle behavior)
-            saved_jobs_collection.delete_one({"_id": existing_job["_id"]})
+            await database.saved_jobs.delete_by_id(existing_job["_id"])
             return {
                 "success": True,
                 "message": "Job removed from saved jobs",
@@ -1188,7 +1676,7 @@ async def save_job(
         job_dict["saved_at"] = datetime.utcnow()
         
         # Save to MongoDB
-        saved_jobs_collection.insert_one(job_dict)
+        await database.saved_jobs.insert(job_dict)
         
         return {
             "success": True,
@@ -1204,21 +1692,16 @@ async def save_job(
 async def get_user_saved_jobs(
     user_id: str,
     limit: int = Query(50, ge=1, le=100),
-    skip: int = Query(0, ge=0)
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: first page only)")
 ):
     """Get all saved jobs for a specific user"""
+    check_cursor(cursor)
     try:
-        # Get the saved_jobs collection
-        saved_jobs_collection = db["saved_jobs"]
-        
         # Query for this user's saved jobs
-        total = saved_jobs_collection.count_documents({"user_id": user_id})
-        saved_jobs = list(saved_jobs_collection.find(
-            {"user_id": user_id},
-            sort=[("saved_at", DESCENDING)],
-            skip=skip,
-            limit=limit
-        ))
+        total = await database.saved_jobs.count_for_user(user_id) if wants_total(include_total, cursor, skip) else None
+        saved_jobs, next_cursor = await database.saved_jobs.page_for_user(user_id, limit=limit, cursor=cursor, skip=skip)
         
         # Convert ObjectId to string
         for job in saved_jobs:
@@ -1233,6 +1716,7 @@ async def get_user_saved_jobs(
             "total": total,
             "limit": limit,
             "skip": skip,
+            "next_cursor": next_cursor,
             "jobs": saved_jobs
         }
     except Exception as e:
@@ -1246,16 +1730,10 @@ async def delete_saved_job(
 ):
     """Delete a saved job for a user"""
     try:
-        # Get the saved_jobs collection
-        saved_jobs_collection = db["saved_jobs"]
-        
         # Delete the saved job
-        result = saved_jobs_collection.delete_one({
-            "user_id": user_id,
-            "job_id": job_id
-        })
+        deleted_count = await database.saved_jobs.delete(user_id, job_id)
         
-        if result.deleted_count == 0:
+        if deleted_count == 0:
             return {
                 "success": False,
                 "message": "Job not found or already removed"
@@ -1274,6 +1752,7 @@ async def analyze_chat_history(chat_history: List[ChatMessage]):
     """Analyze chat history to provide insights and recommendations"""
     try:
         # Use LLM to analyze the conversation
+        await ensure_llm_modules()
         llm = get_llm()
         messages = [{"role": msg.role, "content": msg.content} for msg in chat_history]
         
@@ -1298,6 +1777,7 @@ async def analyze_chat_history(chat_history: List[ChatMessage]):
 async def suggest_resources(chat_history: List[ChatMessage]):
     """Suggest learning resources based on chat history"""
     try:
+        await ensure_llm_modules()
         llm = get_llm()
         messages = [{"role": msg.role, "content": msg.content} for msg in chat_history]
         
@@ -1318,118 +1798,118 @@ async def suggest_resources(chat_history: List[ChatMessage]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/chat/new", response_model=ChatResponse, tags=["Chat"])
-async def chat_with_llama(
-    request: ChatRequest,
-    current_user_id: Optional[str] = Depends(get_current_user)
-):
-    try:
-        # Validate request
-        if not request.message or not request.message.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="Message cannot be empty"
-            )
+CHAT_PROMPT_TEMPLATE = """You are an AI assistant focused on supporting women in tech careers. Be helpful, encouraging, and professional.
 
-        # Validate API key
-        if not GROQ_API_KEY:
-            logger.error("GROQ_API_KEY is not configured")
-            raise HTTPException(
-                status_code=500,
-                detail="Chat service is not properly configured. Please check GROQ_API_KEY."
-            )
+Current conversation:
+{history}
+Human: {input}
+Assistant:"""
 
-        # Use authenticated user ID if available, otherwise use the one from request
-        # This ensures compatibility with both authenticated and unauthenticated requests
-        actual_user_id = current_user_id or request.user_id
+async def open_chat_session(request: ChatRequest, current_user_id: Optional[str]):
+    """Validate a chat request and return its session ID and conversation memory"""
+    # Validate request
+    if not request.message or not request.message.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Message cannot be empty"
+        )
 
-        # Get or create session
-        session_id = request.session_id or str(uuid.uuid4())
-        
-        # Check if session exists in MongoDB
-        session_data = chat_sessions_collection.find_one({"session_id": session_id})
-        
-        if not session_data:
-            # Create new session
-            new_session = ChatSession(
-                session_id=session_id,
-                user_id=actual_user_id
-            )
-            chat_sessions_collection.insert_one(new_session.dict())
-            logger.info(f"Created new chat session: {session_id}")
-        else:
-            # Check if the user has access to this session
-            if session_data.get("user_id") and actual_user_id and session_data.get("user_id") != actual_user_id:
-                raise HTTPException(
-                    status_code=403,
-                    detail="You don't have access to this chat session"
-                )
-            
-            # Update session last active timestamp
-            chat_sessions_collection.update_one(
-                {"session_id": session_id},
-                {"$set": {
-                    "updated_at": datetime.utcnow(),
-                    "is_active": True,
-                    # Update user_id if it wasn't set before but we have it now
-                    "user_id": actual_user_id or session_data.get("user_id")
-                }}
-            )
+    # Validate API key
+    if not GROQ_API_KEY:
+        logger.error("GROQ_API_KEY is not configured")
+        raise HTTPException(
+            status_code=500,
+            detail="Chat service is not properly configured. Please check GROQ_API_KEY."
+        )
 
-        try:
-            # Initialize LLM
-            llm = ChatGroq(
-                groq_api_key=GROQ_API_KEY,
-                model_name="llama3-70b-8192",
-                temperature=0.7,
-                max_tokens=4000
-            )
-        except Exception as e:
-            logger.error(f"Failed to initialize LLM: {str(e)}")
+    # Use authenticated user ID if available, otherwise use the one from request
+    # This ensures compatibility with both authenticated and unauthenticated requests
+    actual_user_id = current_user_id or request.user_id
+
+    # Get or create session
+    session_id = request.session_id or str(uuid.uuid4())
+    
+    # Check if session exists in MongoDB
+    session_data = await database.chat_sessions.get(session_id)
+    
+    if not session_data:
+        # Create new session
+        new_session = ChatSession(
+            session_id=session_id,
+            user_id=actual_user_id
+        )
+        await database.chat_sessions.create(new_session.dict())
+        logger.info(f"Created new chat session: {session_id}")
+    else:
+        # Check if the user has access to this session
+        if session_data.get("user_id") and actual_user_id and session_data.get("user_id") != actual_user_id:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to initialize chat service. Please try again."
+                status_code=403,
+                detail="You don't have access to this chat session"
             )
+        
+        # Update session last active timestamp
+        await database.chat_sessions.update(session_id, {
+            "updated_at": datetime.utcnow(),
+            "is_active": True,
+            # Update user_id if it wasn't set before but we have it now
+            "user_id": actual_user_id or session_data.get("user_id")
+        })
 
-        # Get or create memory
-        if session_id not in chat_memories:
-            # Try to load from MongoDB
-            chat_history = list(chat_messages_collection.find(
-                {"session_id": session_id},
-                sort=[("timestamp", 1)]
-            ))
-            
-            memory = ConversationBufferMemory(
-                memory_key="history",
-                return_messages=True,
-                max_token_limit=2000
-            )
-            
-            # Load previous messages to memory if they exist
-            if chat_history:
-                for msg in chat_history:
-                    if msg["role"] == "user":
-                        memory.chat_memory.add_user_message(msg["content"])
-                    else:
-                        memory.chat_memory.add_ai_message(msg["content"])
-            
-            chat_memories[session_id] = memory
-        else:
-            memory = chat_memories[session_id]
+    # The caller builds the LLM next; make sure that won't import on the loop
+    await ensure_llm_modules()
+    
+    # Get memory, loading it from MongoDB if the session isn't resident
+    memory = await chat_memories.get(session_id)
+
+    # Trim memory if needed (just for the LLM context window)
+    if len(memory.chat_memory.messages) > CHAT_MEMORY_WINDOW:
+        memory.chat_memory.messages = memory.chat_memory.messages[-CHAT_MEMORY_WINDOW:]
+
+    return session_id, memory
+
+def get_chat_llm():
+    try:
+        # Initialize LLM
+        return get_llm()
+    except Exception as e:
+        logger.error(f"Failed to initialize LLM: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to initialize chat service. Please try again."
+        )
+
+async def save_chat_message(session_id: str, role: str, content: str) -> Dict[str, Any]:
+    """Store a message and bump the session's counter, preview and timestamp"""
+    message = ChatMessage(
+        role=role,
+        content=content,
+        session_id=session_id,
+        message_id=str(ObjectId())
+    )
+    message_data = message.dict()
+    await asyncio.gather(
+        database.chat_messages.insert(message_data),
+        database.chat_sessions.record_message(session_id, message_data)
+    )
+    return message_data
+
+@app.post("/api/chat/new", response_model=ChatResponse, tags=["Chat"])
+async def chat_with_llama(
+    request: ChatRequest,
+    current_user_id: Optional[str] = Depends(get_current_user)
+):
+    await ensure_llm_modules()
+    from langchain.chains import ConversationChain
+    from langchain.prompts import PromptTemplate
 
-        # Trim memory if needed (just for the LLM context window)
-        if len(memory.chat_memory.messages) > 10:
-            memory.chat_memory.messages = memory.chat_memory.messages[-10:]
+    try:
+        session_id, memory = await open_chat_session(request, current_user_id)
+        llm = get_chat_llm()
 
         try:
             # Save user message to MongoDB
-            user_message = ChatMessage(
-                role="user",
-                content=request.message,
-                session_id=session_id,
-                message_id=str(ObjectId())
-            )
-            chat_messages_collection.insert_one(user_message.dict())
+            await save_chat_message(session_id, "user", request.message)
             
             # Create conversation chain
             conversation = ConversationChain(
@@ -1437,12 +1917,7 @@ async def chat_with_llama(
                 memory=memory,
                 prompt=PromptTemplate(
                     input_variables=["history", "input"],
-                    template="""You are an AI assistant focused on supporting women in tech careers. Be helpful, encouraging, and professional.
-
-Current conversation:
-{history}
-Human: {input}
-Assistant:"""
+                    template=CHAT_PROMPT_TEMPLATE
                 ),
                 verbose=True
             )
@@ -1452,30 +1927,17 @@ Assistant:"""
             
             if not response or not response.strip():
                 raise ValueError("Empty response received from LLM")
-                
-            # Save AI response to MongoDB
-            ai_message_id = str(ObjectId())
-            ai_message = ChatMessage(
-                role="assistant",
-                content=response.strip(),
-                session_id=session_id,
-                message_id=ai_message_id
-            )
-            chat_messages_collection.insert_one(ai_message.dict())
             
-            # Update session last message timestamp
-            chat_sessions_collection.update_one(
-                {"session_id": session_id},
-                {"$set": {
-                    "last_message_timestamp": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }}
-            )
+            # The memory grew by this exchange
+            chat_memories.touch(session_id, memory)
+                
+            # Save AI response to MongoDB; also updates the session's last message timestamp
+            ai_message_data = await save_chat_message(session_id, "assistant", response.strip())
 
             return ChatResponse(
                 response=response.strip(),
                 session_id=session_id,
-                message_id=ai_message_id
+                message_id=ai_message_data["message_id"]
             )
 
         except ValueError as ve:
@@ -1500,14 +1962,100 @@ Assistant:"""
             detail="An unexpected error occurred. Please try again."
         )
 
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/chat/stream", tags=["Chat"])
+async def chat_with_llama_stream(
+    request: ChatRequest,
+    current_user_id: Optional[str] = Depends(get_current_user)
+):
+    """Stream the assistant's reply as Server-Sent Events.
+    
+    Emits a ``session`` event once the user message is stored, one ``token``
+    event per chunk from the model, then ``done`` with the stored assistant
+    message ID (or ``error``). The reply is saved when the stream ends, with
+    whatever was generated if the client disconnects first.
+    """
+    try:
+        session_id, memory = await open_chat_session(request, current_user_id)
+        llm = get_chat_llm()
+        # Persisted up front so the turn survives a dropped stream
+        user_message_data = await save_chat_message(session_id, "user", request.message)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred. Please try again."
+        )
+
+    prompt = CHAT_PROMPT_TEMPLATE.format(history=memory.buffer_as_str, input=request.message)
+
+    async def events():
+        chunks: List[str] = []
+        outcome = "cancelled"
+        start = time.time()
+        try:
+            yield sse_event("session", {"session_id": session_id, "user_message_id": user_message_data["message_id"]})
+            async for chunk in llm.astream(prompt):
+                if not chunk.content:
+                    continue
+                if not chunks:
+                    chat_stream_ttft.record((time.time() - start) * 1000)
+                chunks.append(chunk.content)
+                yield sse_event("token", {"content": chunk.content})
+            outcome = "completed"
+        except Exception as e:
+            outcome = "errors"
+            logger.error(f"Error in chat stream: {str(e)}")
+            yield sse_event("error", {"detail": "Failed to process your message. Please try again."})
+        finally:
+            chat_stream_stats[outcome] += 1
+            response = "".join(chunks).strip()
+            ai_message_data = None
+            if response:
+                memory.save_context({"input": request.message}, {"output": response})
+                chat_memories.touch(session_id, memory)
+                # A disconnected client cancels this generator; the save carries on
+                saving = asyncio.ensure_future(save_chat_message(session_id, "assistant", response))
+                chat_save_tasks.add(saving)
+                saving.add_done_callback(chat_save_tasks.discard)
+                try:
+                    ai_message_data = await asyncio.shield(saving)
+                except Exception as e:
+                    logger.error(f"Error saving streamed chat reply: {str(e)}")
+        
+        if outcome == "completed":
+            if ai_message_data is None:
+                yield sse_event("error", {"detail": "Received an invalid response. Please try again."})
+            else:
+                yield sse_event("done", {"session_id": session_id, "message_id": ai_message_data["message_id"]})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/chat/history/{session_id}", response_model=List[ChatMessage], tags=["Chat"])
 async def get_chat_history(
     session_id: str, 
-    limit: int = 50, 
-    skip: int = 0,
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
     current_user_id: Optional[str] = Depends(get_current_user)
 ):
-    """Get chat history for a specific session"""
+    """Get chat history for a specific session.
+    
+    Pages go back in time from the newest message; each page is returned in
+    ascending order and the cursor for the next (older) page is sent in the
+    ``X-Next-Cursor`` header.
+    """
+    check_cursor(cursor)
     try:
         # Validate session_id format
         if not session_id or len(session_id) < 8:
@@ -1517,7 +2065,7 @@ async def get_chat_history(
             )
             
         # Check if session exists
-        session = chat_sessions_collection.find_one({"session_id": session_id})
+        session = await database.chat_sessions.get(session_id)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -1532,12 +2080,15 @@ async def get_chat_history(
             )
             
         # Get messages from MongoDB
-        messages = list(chat_messages_collection.find(
-            {"session_id": session_id},
-            sort=[("timestamp", -1)],  # Sort by timestamp descending (newest first)
-            skip=skip,
-            limit=limit
-        ))
+        # Newest page first, re-sorted ascending below
+        messages, next_cursor = await database.chat_messages.page_for_session(
+            session_id,
+            limit=limit,
+            cursor=cursor,
+            skip=skip
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         # Convert to ChatMessage models and return
         chat_messages = []
@@ -1561,13 +2112,16 @@ async def get_chat_history(
 
 @app.get("/api/chat/sessions", response_model=List[ChatSession], tags=["Chat"])
 async def get_chat_sessions(
-    limit: int = 20, 
-    skip: int = 0, 
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    skip: int = Query(0, ge=0),
     active_only: bool = True,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
     current_user_id: Optional[str] = Depends(get_current_user),
     user_id: Optional[str] = None
 ):
-    """Get list of chat sessions for a user"""
+    """Get list of chat sessions for a user, most recently updated first"""
+    check_cursor(cursor)
     try:
         # Prefer authenticated user_id over query parameter
         actual_user_id = current_user_id or user_id
@@ -1580,12 +2134,9 @@ async def get_chat_sessions(
             query["is_active"] = True
             
         # Get sessions from MongoDB
-        sessions = list(chat_sessions_collection.find(
-            query,
-            sort=[("updated_at", -1)],  # Sort by last updated time
-            skip=skip,
-            limit=limit
-        ))
+        sessions, next_cursor = await database.chat_sessions.page(query, limit=limit, cursor=cursor, skip=skip)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         # Convert to ChatSession models
         chat_sessions = []
@@ -1594,14 +2145,8 @@ async def get_chat_sessions(
             if "_id" in session:
                 session["_id"] = str(session["_id"])
                 
-            # Count messages for this session
-            message_count = chat_messages_collection.count_documents({"session_id": session["session_id"]})
-            
-            # Create session object with additional info
-            session_obj = ChatSession(**session)
-            session_obj.message_count = message_count
-            
-            chat_sessions.append(session_obj)
+            # message_count and last_message_preview are stored on the session
+            chat_sessions.append(ChatSession(**session))
             
         return chat_sessions
         
@@ -1621,7 +2166,7 @@ async def delete_session(
     """Delete a chat session"""
     try:
         # Check if session exists and belongs to the user
-        session = chat_sessions_collection.find_one({"session_id": session_id})
+        session = await database.chat_sessions.get(session_id)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -1636,21 +2181,20 @@ async def delete_session(
             )
         
         # Delete session from MongoDB
-        result = chat_sessions_collection.delete_one({"session_id": session_id})
+        deleted_count = await database.chat_sessions.delete(session_id)
         
-        if result.deleted_count == 0:
+        if deleted_count == 0:
             raise HTTPException(
                 status_code=404,
                 detail="Session not found"
             )
             
         # Delete from in-memory storage as well
-        if session_id in chat_memories:
-            del chat_memories[session_id]
+        chat_memories.discard(session_id)
             
         # Optionally delete associated messages
         if delete_messages:
-            chat_messages_collection.delete_many({"session_id": session_id})
+            await database.chat_messages.delete_for_session(session_id)
             
         return {"status": "success", "message": "Session deleted"}
     except HTTPException as he:
@@ -1670,7 +2214,7 @@ async def clear_memory(
     """Clear memory for a chat session"""
     try:
         # Check if session exists and belongs to the user
-        session = chat_sessions_collection.find_one({"session_id": session_id})
+        session = await database.chat_sessions.get(session_id)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -1684,14 +2228,10 @@ async def clear_memory(
                 detail="You don't have access to this chat session"
             )
             
-        if session_id in chat_memories:
-            del chat_memories[session_id]
+        chat_memories.discard(session_id)
             
         # Also update session in MongoDB
-        chat_sessions_collection.update_one(
-            {"session_id": session_id},
-            {"$set": {"is_active": False}}
-        )
+        await database.chat_sessions.update(session_id, {"is_active": False})
         
         return {"status": "success", "message": "Memory cleared"}
     except HTTPException as he:
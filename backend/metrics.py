@@ -0,0 +1,74 @@
+import threading
+from collections import deque
+from typing import Any, Dict
+
+
+class LatencyRecorder:
+    """Keeps a rolling window of latency samples in milliseconds"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self._samples.append(latency_ms)
+            self.count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count}
+
+        def percentile(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 2)
+
+        return {
+            "count": self.count,
+            "avg_ms": round(sum(samples) / len(samples), 2),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(samples[-1], 2),
+        }
+
+
+class BulkWriteStats:
+    """Counters for batched MongoDB writes, used to size the batches"""
+
+    def __init__(self):
+        self.batches = 0
+        self.documents = 0
+        self.max_batch_size = 0
+        self.upserted = 0
+        self.modified = 0
+        self.matched = 0
+        self.errors = 0
+        self.latency = LatencyRecorder()
+
+    def record(self, batch_size: int, latency_ms: float, result=None):
+        self.batches += 1
+        self.documents += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.latency.record(latency_ms)
+        if result is not None:
+            self.upserted += result.upserted_count
+            self.modified += result.modified_count
+            self.matched += result.matched_count
+
+    def record_error(self):
+        self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "documents": self.documents,
+            "avg_batch_size": round(self.documents / self.batches, 2) if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "upserted": self.upserted,
+            "modified": self.modified,
+            "matched": self.matched,
+            "errors": self.errors,
+            "latency": self.latency.stats(),
+        }
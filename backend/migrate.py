@@ -0,0 +1,315 @@
+"""Declarative MongoDB indexes and the command that applies them.
+
+Every index the API relies on is listed once in ``INDEXES``. Running
+
+    python -m backend.migrate            # from the repository root
+    python migrate.py                    # from backend/
+
+compares that spec with the indexes that exist, drops the ones listed in
+``RETIRED``, and builds whatever is missing. API workers never issue index DDL
+themselves, so a deploy or a worker restart costs no round trips and never
+blocks on a build. ``--dry-run`` prints the plan without changing anything and
+``--explain`` checks each query shape in ``HOT_QUERIES`` against the server's
+query planner.
+
+This module only depends on pymongo so it can run without the API's
+dependencies installed.
+"""
+import argparse
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, MongoClient
+
+# Load environment variables
+load_dotenv()
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+DATABASE_NAME = "empowHER"
+
+Keys = List[Tuple[str, Any]]
+
+
+@dataclass
+class Index:
+    keys: Keys
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        # MongoDB's default name, so indexes created before this spec match
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def model(self) -> IndexModel:
+        # Ignored (always on) since MongoDB 4.2, where builds only lock briefly
+        return IndexModel(self.keys, name=self.name, unique=self.unique, background=True)
+
+
+@dataclass
+class HotQuery:
+    """A query shape the API runs on every request of some endpoint"""
+    description: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Keys = field(default_factory=list)
+    limit: int = 50
+
+
+# Compound indexes list the equality filters first, then the sort key and the
+# _id tiebreaker used by keyset pagination, so listings never sort in memory
+INDEXES: Dict[str, List[Index]] = {
+    "chat_sessions": [
+        Index([("session_id", ASCENDING)], unique=True),
+        Index([("updated_at", DESCENDING)]),
+        Index([("user_id", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)]),
+        Index([("user_id", ASCENDING), ("is_active", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "chat_messages": [
+        Index([("message_id", ASCENDING)], unique=True),
+        Index([("content", TEXT)]),  # For text search
+        Index([("session_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "job_searches": [
+        Index([("search_id", ASCENDING)], unique=True),
+        Index([("timestamp", DESCENDING)]),
+        Index([("query", TEXT)]),
+        Index([("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "job_results": [
+        Index([("job_id", ASCENDING)], unique=True),
+        Index([("application_url", ASCENDING)]),
+        # Job index catch-up after restarts and between workers
+        Index([("stored_at", DESCENDING)]),
+        # A collection can only have one text index
+        Index([("title", TEXT), ("company", TEXT)]),
+        # Multikey: a job is listed under every search that returned it
+        Index([("search_ids", ASCENDING), ("company", ASCENDING), ("title", ASCENDING), ("_id", ASCENDING)]),
+    ],
+    "user_jobs": [
+        Index([("user_id", ASCENDING), ("application_url", ASCENDING)], unique=True),
+        Index([("user_id", ASCENDING), ("is_women_friendly", ASCENDING), ("stored_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "saved_jobs": [
+        Index([("job_id", ASCENDING)]),
+        Index([("saved_at", DESCENDING)]),
+        Index([("user_id", ASCENDING), ("application_url", ASCENDING)]),
+        Index([("user_id", ASCENDING), ("saved_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+}
+
+# Indexes created by earlier versions that are dropped when the migration runs.
+# Single-field indexes that prefix a compound index above, and ones on a lone
+# boolean that no query filters by alone, only cost writes.
+RETIRED: Dict[str, List[str]] = {
+    "chat_sessions": ["user_id_1", "is_active_1"],
+    "chat_messages": ["session_id_1", "timestamp_1", "role_1"],
+    "job_searches": ["user_id_1"],
+    # Replaced by the combined title/company text index
+    "job_results": [
+        "search_id_1", "is_women_friendly_1", "title_text", "company_text",
+        # Results are listed by search_ids since backfill_search_ids.py
+        "search_id_1_company_1_title_1__id_1",
+    ],
+    "saved_jobs": ["user_id_1", "application_url_1"],
+}
+
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery("session lookup", "chat_sessions", {"session_id": "s"}, limit=1),
+    HotQuery("sessions for a user", "chat_sessions", {"user_id": "u"}, [("updated_at", DESCENDING), ("_id", DESCENDING)], 20),
+    HotQuery(
+        "active sessions for a user", "chat_sessions", {"user_id": "u", "is_active": True},
+        [("updated_at", DESCENDING), ("_id", DESCENDING)], 20
+    ),
+    HotQuery("chat memory rehydration", "chat_messages", {"session_id": "s"}, [("timestamp", DESCENDING), ("_id", DESCENDING)], 10),
+    HotQuery("session messages page", "chat_messages", {"session_id": "s"}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    HotQuery("searches for a user", "job_searches", {"user_id": "u"}, [("timestamp", DESCENDING), ("_id", DESCENDING)], 20),
+    HotQuery("search lookup", "job_searches", {"search_id": "s"}, limit=1),
+    HotQuery(
+        "search results", "job_results", {"search_ids": "s"},
+        [("company", ASCENDING), ("title", ASCENDING), ("_id", ASCENDING)]
+    ),
+    HotQuery(
+        "women-friendly search results", "job_results", {"search_ids": "s", "is_women_friendly": True},
+        [("company", ASCENDING), ("title", ASCENDING), ("_id", ASCENDING)]
+    ),
+    HotQuery(
+        "fresh job lookup", "job_results",
+        {"application_url": "https://example.com/job", "extracted_at": {"$gte": datetime.min}}, limit=1
+    ),
+    HotQuery("job index catch-up", "job_results", {"stored_at": {"$gte": datetime.min}}, limit=0),
+    HotQuery(
+        "jobs from a user's searches", "user_jobs", {"user_id": "u", "is_women_friendly": True},
+        [("stored_at", DESCENDING), ("_id", DESCENDING)]
+    ),
+    HotQuery("saved jobs for a user", "saved_jobs", {"user_id": "u"}, [("saved_at", DESCENDING), ("_id", DESCENDING)]),
+    HotQuery("saved job toggle", "saved_jobs", {"user_id": "u", "application_url": "https://example.com/job"}, limit=1),
+]
+
+
+@dataclass
+class Plan:
+    collection: str
+    create: List[Index] = field(default_factory=list)
+    drop: List[str] = field(default_factory=list)
+    # Same name as a spec index but different keys or options; never touched
+    conflicts: List[str] = field(default_factory=list)
+    # Neither in the spec nor retired; reported only
+    unmanaged: List[str] = field(default_factory=list)
+
+    @property
+    def changes(self) -> bool:
+        return bool(self.create or self.drop)
+
+
+def _matches(index: Index, existing: Dict[str, Any]) -> bool:
+    if bool(existing.get("unique")) != index.unique:
+        return False
+    if any(direction == TEXT for _, direction in index.keys):
+        # Text indexes are stored as _fts/_ftsx keys plus per-field weights
+        return set(existing.get("weights", {})) == {key for key, _ in index.keys}
+    return [(key, int(direction)) for key, direction in existing["key"]] == index.keys
+
+
+def plan_collection(collection: str, existing: Dict[str, Dict[str, Any]]) -> Plan:
+    """Diff the spec for ``collection`` against its ``index_information()``"""
+    plan = Plan(collection)
+    wanted = {index.name: index for index in INDEXES.get(collection, [])}
+    retired = set(RETIRED.get(collection, []))
+
+    for name, info in existing.items():
+        if name == "_id_":
+            continue
+        if name in retired:
+            plan.drop.append(name)
+        elif name in wanted:
+            if not _matches(wanted[name], info):
+                plan.conflicts.append(name)
+        else:
+            plan.unmanaged.append(name)
+
+    plan.create = [index for name, index in wanted.items() if name not in existing]
+    return plan
+
+
+def plan_database(db) -> List[Plan]:
+    collections = set(db.list_collection_names())
+    plans = []
+    for collection in INDEXES:
+        existing = db[collection].index_information() if collection in collections else {}
+        plans.append(plan_collection(collection, existing))
+    return plans
+
+
+def apply(db, plans: List[Plan]):
+    for plan in plans:
+        collection = db[plan.collection]
+        # Drop first: retired text indexes block creating the new one
+        for name in plan.drop:
+            print(f"  {plan.collection}: dropping {name}")
+            collection.drop_index(name)
+        if plan.create:
+            for index in plan.create:
+                print(f"  {plan.collection}: building {index.name}")
+            collection.create_indexes([index.model() for index in plan.create])
+
+
+def print_plan(plans: List[Plan]):
+    for plan in plans:
+        if not (plan.changes or plan.conflicts or plan.unmanaged):
+            print(f"{plan.collection}: up to date")
+            continue
+        print(f"{plan.collection}:")
+        for index in plan.create:
+            print(f"  + {index.name}{' (unique)' if index.unique else ''}")
+        for name in plan.drop:
+            print(f"  - {name}")
+        for name in plan.conflicts:
+            print(f"  ! {name} differs from the spec; drop it by hand to rebuild")
+        for name in plan.unmanaged:
+            print(f"  ? {name} is not in the spec")
+
+
+def _plan_stages(node: Any, stages: List[Dict[str, Any]]):
+    """Flatten an explain() plan tree, classic and slot-based engines alike"""
+    if isinstance(node, dict):
+        if "stage" in node:
+            stages.append(node)
+        for key in ("queryPlan", "inputStage", "inputStages", "innerStage", "outerStage"):
+            if key in node:
+                _plan_stages(node[key], stages)
+    elif isinstance(node, list):
+        for child in node:
+            _plan_stages(child, stages)
+
+
+def explain_query(db, query: HotQuery) -> Tuple[bool, str]:
+    """Whether ``query`` is answered from an index without an in-memory sort"""
+    cursor = db[query.collection].find(query.filter)
+    if query.sort:
+        cursor = cursor.sort(query.sort)
+    if query.limit:
+        cursor = cursor.limit(query.limit)
+    explained = cursor.explain()
+
+    stages: List[Dict[str, Any]] = []
+    _plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}), stages)
+    names = {stage["stage"] for stage in stages}
+    indexes = sorted({stage["indexName"] for stage in stages if stage.get("indexName")})
+
+    if "COLLSCAN" in names:
+        return False, "collection scan"
+    if "SORT" in names:
+        return False, f"in-memory sort after {', '.join(indexes) or 'scan'}"
+    return True, ", ".join(indexes) or "/".join(sorted(names))
+
+
+def explain_all(db) -> bool:
+    ok = True
+    for query in HOT_QUERIES:
+        covered, detail = explain_query(db, query)
+        ok = ok and covered
+        print(f"  {'ok  ' if covered else 'FAIL'} {query.collection}: {query.description} ({detail})")
+    return ok
+
+
+def migrate(uri: str = MONGODB_URI, database: str = DATABASE_NAME, dry_run: bool = False, explain: bool = False) -> bool:
+    """Bring the database's indexes in line with the spec; False on any problem"""
+    try:
+        # Connect to MongoDB
+        print("Connecting to MongoDB...")
+        client = MongoClient(uri)
+        db = client[database]
+
+        plans = plan_database(db)
+        print_plan(plans)
+        if not dry_run and any(plan.changes for plan in plans):
+            print("Applying index changes...")
+            apply(db, plans)
+            print("Index migration completed successfully!")
+
+        ok = not any(plan.conflicts for plan in plans)
+        if explain:
+            print("Checking hot queries...")
+            ok = explain_all(db) and ok
+        return ok
+
+    except Exception as e:
+        print(f"Error migrating MongoDB indexes: {e}")
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create and check the API's MongoDB indexes")
+    parser.add_argument("--uri", default=MONGODB_URI, help="MongoDB connection string (default: $MONGODB_URI)")
+    parser.add_argument("--database", default=DATABASE_NAME)
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without changing anything")
+    parser.add_argument("--explain", action="store_true", help="Check that every hot query uses an index")
+    args = parser.parse_args(argv)
+    return 0 if migrate(args.uri, args.database, dry_run=args.dry_run, explain=args.explain) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
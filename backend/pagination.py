@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination for MongoDB listings.
+
+A cursor is an opaque token holding the sort-key values of the last document
+on a page. The next page starts with a range filter on those keys, so every
+page costs one index seek no matter how deep it is, unlike ``skip`` which
+walks over every earlier document.
+"""
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import json_util
+from pymongo import ASCENDING
+
+SortSpec = List[Tuple[str, int]]
+
+
+class InvalidCursorError(ValueError):
+    """The cursor token could not be decoded"""
+
+
+def with_tiebreaker(sort: SortSpec) -> SortSpec:
+    """Append _id so the sort order is total and cursors never skip or repeat"""
+    if any(field == "_id" for field, _ in sort):
+        return list(sort)
+    return list(sort) + [("_id", sort[-1][1] if sort else ASCENDING)]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    # Extended JSON keeps datetimes and ObjectIds exact
+    return base64.urlsafe_b64encode(json_util.dumps(list(values)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+    if not isinstance(values, list):
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> Dict[str, Any]:
+    """Documents strictly after ``values`` in ``sort`` order"""
+    if len(values) != len(sort):
+        raise InvalidCursorError("Cursor does not match this listing")
+
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {sort[j][0]: values[j] for j in range(i)}
+        clause[field] = {"$gt" if direction == ASCENDING else "$lt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+async def find_page(
+    collection,
+    query: Dict[str, Any],
+    sort: SortSpec,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of ``collection`` and the cursor for the next page (None on the last).
+
+    ``skip`` is only honoured without a cursor, for clients that still page by
+    offset.
+    """
+    if limit < 1:
+        # pymongo reads limit=0 as "no limit"; a page always has one document
+        raise ValueError(f"Page limit must be at least 1, got {limit}")
+    sort = with_tiebreaker(sort)
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor))]}
+        skip = 0
+
+    # One extra document tells us whether another page exists
+    docs = await collection.find(query, projection, sort=sort, skip=skip, limit=limit + 1).to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1].get(field) for field, _ in sort])
@@ -0,0 +1,114 @@
+import asyncio
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class DetailPrefetcher:
+    """Bounded priority queue plus a small worker pool that warms job details.
+
+    Searches submit their result URLs in rank order; lower ranks are built
+    first, across all searches, so the cards a user is most likely to open are
+    warmed first. URLs already cached, queued or being built are skipped, and
+    when the queue is full new work is dropped rather than queued behind it.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[str], Awaitable[Any]],
+        is_cached: Callable[[str], bool],
+        workers: int = 4,
+        max_queue_size: int = 500,
+    ):
+        self.build = build
+        self.is_cached = is_cached
+        self.workers = max(0, workers)
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._queued: Set[str] = set()
+        self._active: Set[str] = set()
+        self._sequence = itertools.count()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.completed = 0
+        self.not_cached = 0
+        self.failed = 0
+
+    def start(self):
+        """Start the workers (called from the app lifespan)"""
+        if self._tasks or self.workers == 0:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queue_size)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        logger.info(f"Detail prefetcher started ({self.workers} workers, queue of {self.max_queue_size})")
+
+    async def close(self):
+        """Stop the workers and discard queued work"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._queued.clear()
+
+    def submit(self, urls: List[str]):
+        """Queue URLs for warming, in rank order; never blocks"""
+        if self._queue is None:
+            return
+        self.submitted += len(urls)
+        for rank, url in enumerate(urls):
+            if url in self._queued or url in self._active or self.is_cached(url):
+                self.deduplicated += 1
+                continue
+            try:
+                self._queue.put_nowait((rank, next(self._sequence), url))
+            except asyncio.QueueFull:
+                # Under pressure the rest of this search is lower ranked anyway
+                self.dropped += len(urls) - rank
+                return
+            self._queued.add(url)
+
+    async def _work(self):
+        while True:
+            _, _, url = await self._queue.get()
+            self._queued.discard(url)
+            # A user may have opened the job while it waited in the queue
+            if self.is_cached(url) or url in self._active:
+                self.deduplicated += 1
+                self._queue.task_done()
+                continue
+
+            self._active.add(url)
+            try:
+                await self.build(url)
+                # Builds may skip caching (e.g. while Diffbot is down or a page
+                # has no details), and those don't make the cache any warmer
+                if self.is_cached(url):
+                    self.completed += 1
+                else:
+                    self.not_cached += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error prefetching job details for {url}: {e}")
+            finally:
+                self._active.discard(url)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "active": len(self._active),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "not_cached": self.not_cached,
+            "failed": self.failed,
+        }
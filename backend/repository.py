@@ -0,0 +1,221 @@
+"""Async MongoDB data access for the job search API.
+
+Every collection the API touches is wrapped in a small repository class on top
+of Motor, so route handlers await their queries instead of blocking the event
+loop with synchronous pymongo calls.
+"""
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import DESCENDING
+
+from pagination import SortSpec, find_page
+
+logger = logging.getLogger(__name__)
+
+# A page of documents and the cursor for the next one
+Page = Tuple[List[Dict[str, Any]], Optional[str]]
+
+MESSAGE_PREVIEW_LENGTH = 120
+
+
+def message_preview(content: str) -> str:
+    """Single-line, truncated message text shown in session listings"""
+    text = " ".join((content or "").split())
+    if len(text) > MESSAGE_PREVIEW_LENGTH:
+        text = text[:MESSAGE_PREVIEW_LENGTH - 3] + "..."
+    return text
+
+
+class ChatSessionRepository:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"session_id": session_id})
+
+    async def create(self, session: Dict[str, Any]):
+        await self.collection.insert_one(session)
+
+    async def update(self, session_id: str, fields: Dict[str, Any]):
+        await self.collection.update_one({"session_id": session_id}, {"$set": fields})
+
+    async def record_message(self, session_id: str, message: Dict[str, Any]):
+        """Bump the session's message counter and preview in one atomic update"""
+        await self.collection.update_one(
+            {"session_id": session_id},
+            {
+                "$inc": {"message_count": 1},
+                "$set": {
+                    "last_message_preview": message_preview(message["content"]),
+                    "last_message_timestamp": message["timestamp"],
+                    "updated_at": message["timestamp"],
+                },
+            }
+        )
+
+    async def page(self, query: Dict[str, Any], limit: int = 20, cursor: Optional[str] = None, skip: int = 0) -> Page:
+        return await find_page(self.collection, query, [("updated_at", DESCENDING)], limit, cursor=cursor, skip=skip)
+
+    async def delete(self, session_id: str) -> int:
+        result = await self.collection.delete_one({"session_id": session_id})
+        return result.deleted_count
+
+
+class ChatMessageRepository:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def insert(self, message: Dict[str, Any]):
+        await self.collection.insert_one(message)
+
+    async def recent_for_session(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Role and content of the last ``limit`` messages, oldest first"""
+        # Walks the (session_id, timestamp, _id) index backwards from the newest message
+        cursor = self.collection.find(
+            {"session_id": session_id},
+            projection={"_id": 0, "role": 1, "content": 1},
+            sort=[("timestamp", DESCENDING), ("_id", DESCENDING)],
+            limit=limit
+        )
+        messages = await cursor.to_list(length=limit)
+        messages.reverse()
+        return messages
+
+    async def page_for_session(self, session_id: str, limit: int = 50, cursor: Optional[str] = None, skip: int = 0) -> Page:
+        """Newest messages first"""
+        return await find_page(
+            self.collection, {"session_id": session_id}, [("timestamp", DESCENDING)], limit, cursor=cursor, skip=skip
+        )
+
+    async def delete_for_session(self, session_id: str):
+        await self.collection.delete_many({"session_id": session_id})
+
+
+class JobSearchRepository:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def insert(self, search: Dict[str, Any]):
+        await self.collection.insert_one(search)
+
+    async def update(self, search_id: str, fields: Dict[str, Any]):
+        await self.collection.update_one({"search_id": search_id}, {"$set": fields})
+
+    async def count(self, query: Dict[str, Any]) -> int:
+        return await self.collection.count_documents(query)
+
+    async def page(self, query: Dict[str, Any], limit: int = 20, cursor: Optional[str] = None, skip: int = 0) -> Page:
+        return await find_page(self.collection, query, [("timestamp", DESCENDING)], limit, cursor=cursor, skip=skip)
+
+
+class JobResultRepository:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def find_fresh(self, application_url: str, fresh_after: datetime) -> Optional[Dict[str, Any]]:
+        """The stored job for a URL if it was extracted from Diffbot after ``fresh_after``.
+
+        ``stored_at`` is re-stamped whenever a search returns the job, so it
+        says nothing about how old the listing data is.
+        """
+        return await self.collection.find_one(
+            {"application_url": application_url, "extracted_at": {"$gte": fresh_after}},
+            projection={"_id": 0}
+        )
+
+    async def iter_all(self) -> AsyncIterator[Dict[str, Any]]:
+        """Every stored job, without the per-search bookkeeping fields"""
+        cursor = self.collection.find({}, projection={"_id": 0, "job_id": 0, "search_id": 0, "search_ids": 0, "stored_at": 0})
+        async for job in cursor:
+            yield job
+
+    async def iter_stored_since(self, since: datetime) -> AsyncIterator[Dict[str, Any]]:
+        """Jobs written by any search since ``since``, in the same shape as ``iter_all``"""
+        cursor = self.collection.find(
+            {"stored_at": {"$gte": since}},
+            projection={"_id": 0, "job_id": 0, "search_id": 0, "search_ids": 0, "stored_at": 0}
+        )
+        async for job in cursor:
+            yield job
+
+    async def bulk_write(self, operations: Sequence[Any]):
+        return await self.collection.bulk_write(list(operations), ordered=False)
+
+    async def count(self, query: Dict[str, Any]) -> int:
+        return await self.collection.count_documents(query)
+
+    async def page(
+        self,
+        query: Dict[str, Any],
+        sort: SortSpec,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Page:
+        return await find_page(self.collection, query, sort, limit, cursor=cursor, skip=skip)
+
+
+class UserJobRepository:
+    """Jobs from each user's searches, one document per (user_id, application_url)"""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def bulk_write(self, operations: Sequence[Any]):
+        return await self.collection.bulk_write(list(operations), ordered=False)
+
+    async def count(self, query: Dict[str, Any]) -> int:
+        return await self.collection.count_documents(query)
+
+    async def page(self, query: Dict[str, Any], limit: int = 50, cursor: Optional[str] = None, skip: int = 0) -> Page:
+        """Most recently stored first"""
+        return await find_page(self.collection, query, [("stored_at", DESCENDING)], limit, cursor=cursor, skip=skip)
+
+
+class SavedJobRepository:
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def find(self, user_id: str, application_url: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"user_id": user_id, "application_url": application_url})
+
+    async def insert(self, job: Dict[str, Any]):
+        await self.collection.insert_one(job)
+
+    async def delete_by_id(self, _id: Any):
+        await self.collection.delete_one({"_id": _id})
+
+    async def delete(self, user_id: str, job_id: str) -> int:
+        result = await self.collection.delete_one({"user_id": user_id, "job_id": job_id})
+        return result.deleted_count
+
+    async def count_for_user(self, user_id: str) -> int:
+        return await self.collection.count_documents({"user_id": user_id})
+
+    async def page_for_user(self, user_id: str, limit: int = 50, cursor: Optional[str] = None, skip: int = 0) -> Page:
+        return await find_page(
+            self.collection, {"user_id": user_id}, [("saved_at", DESCENDING)], limit, cursor=cursor, skip=skip
+        )
+
+
+class Database:
+    """Motor client plus one repository per collection"""
+
+    def __init__(self, uri: str, name: str = "empowHER"):
+        self.client = AsyncIOMotorClient(uri)
+        self.db = self.client[name]
+        self.chat_sessions = ChatSessionRepository(self.db["chat_sessions"])
+        self.chat_messages = ChatMessageRepository(self.db["chat_messages"])
+        self.job_searches = JobSearchRepository(self.db["job_searches"])
+        self.job_results = JobResultRepository(self.db["job_results"])
+        self.user_jobs = UserJobRepository(self.db["user_jobs"])
+        self.saved_jobs = SavedJobRepository(self.db["saved_jobs"])
+
+    async def ping(self):
+        await self.client.admin.command("ping")
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,233 @@
+"""In-process BM25 search over stored jobs.
+
+Jobs are indexed as they are written to job_results, so repeat searches can be
+answered from our own corpus without another Tavily round trip. The index is
+persisted as gzipped JSON holding the documents and their postings, so startup
+only has to read it back instead of re-tokenizing every job. The file records
+a watermark: jobs stored after it are not in the file and are caught up from
+job_results on load.
+"""
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+# Matches are worth more in some fields than others
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "company": 2.0,
+    "skills": 2.0,
+    "location": 1.5,
+    "summary": 1.0,
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with',
+    'job', 'jobs', 'position', 'positions', 'role', 'roles',
+}
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping symbols that matter for skills (c++, c#)"""
+    return [token for token in _TOKEN_RE.findall((text or '').lower()) if token not in STOPWORDS]
+
+
+def _field_text(job: Dict[str, Any], name: str) -> str:
+    value = job.get(name)
+    if isinstance(value, list):
+        return ' '.join(str(item) for item in value)
+    return value or ''
+
+
+class JobSearchIndex:
+    """Inverted index over title, company, skills, summary and location.
+
+    Documents are keyed by application_url, matching the job_results upsert
+    key, so re-adding a job replaces its previous postings.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._doc_ids: Dict[str, int] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._total_length = 0.0
+        self._next_id = 0
+        self.searches = 0
+        # Bumped on every change, so callers can skip saving an unchanged index
+        self.version = 0
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._doc_ids
+
+    @staticmethod
+    def _term_weights(job: Dict[str, Any]) -> Counter:
+        weights: Counter = Counter()
+        for name, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(job, name)):
+                weights[token] += weight
+        return weights
+
+    def _remove(self, url: str):
+        doc_id = self._doc_ids.pop(url, None)
+        if doc_id is None:
+            return
+        job = self._docs.pop(doc_id)
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in self._term_weights(job):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _insert(self, job: Dict[str, Any], weights: Counter):
+        doc_id = self._next_id
+        self._next_id += 1
+        self._doc_ids[job["application_url"]] = doc_id
+        self._docs[doc_id] = job
+        length = sum(weights.values())
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[doc_id] = weight
+
+    def add(self, job: Dict[str, Any]):
+        """Index a job, replacing any earlier version with the same URL"""
+        url = job.get("application_url")
+        if not url:
+            return
+        weights = self._term_weights(job)
+        with self._lock:
+            self._remove(url)
+            self._insert(job, weights)
+            self.version += 1
+
+    def add_many(self, jobs: Iterable[Dict[str, Any]]):
+        for job in jobs:
+            self.add(job)
+
+    def remove(self, url: str):
+        with self._lock:
+            self._remove(url)
+            self.version += 1
+
+    def search(
+        self,
+        query: str,
+        limit: int = 15,
+        women_friendly_only: bool = False,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Best matching jobs for the query as (BM25 score, job) pairs"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            self.searches += 1
+            doc_count = len(self._docs)
+            if doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for doc_id, score in ranked:
+                job = self._docs[doc_id]
+                if women_friendly_only and not job.get("is_women_friendly"):
+                    continue
+                results.append((score, job))
+                if len(results) >= limit:
+                    break
+            return results
+
+    def save(self, path: str, watermark: Optional[datetime] = None):
+        """Write the index to ``path`` as gzipped JSON, compacting document ids.
+
+        ``watermark`` is the time up to which the index holds every stored job.
+        """
+        with self._lock:
+            ids = {doc_id: new_id for new_id, doc_id in enumerate(self._docs)}
+            data = {
+                "version": INDEX_FORMAT_VERSION,
+                "watermark": watermark.isoformat() if watermark else None,
+                "docs": [self._docs[doc_id] for doc_id in ids],
+                "lengths": [self._doc_lengths[doc_id] for doc_id in ids],
+                # term -> flat [doc, weight, doc, weight, ...]
+                "postings": {
+                    term: [value for doc_id, weight in postings.items() for value in (ids[doc_id], weight)]
+                    for term, postings in self._postings.items()
+                },
+            }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Per process, so workers sharing the file never write the same temp file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), default=str)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> Optional["JobSearchIndex"]:
+        """Read an index written by ``save``; None if missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index {path}: {e}")
+            return None
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            return None
+
+        index = cls(**kwargs)
+        if data.get("watermark"):
+            index.watermark = datetime.fromisoformat(data["watermark"])
+        for doc_id, (job, length) in enumerate(zip(data["docs"], data["lengths"])):
+            index._doc_ids[job["application_url"]] = doc_id
+            index._docs[doc_id] = job
+            index._doc_lengths[doc_id] = length
+            index._total_length += length
+        index._next_id = len(index._docs)
+        for term, flat in data["postings"].items():
+            index._postings[term] = dict(zip(flat[::2], flat[1::2]))
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._postings),
+            "searches": self.searches,
+        }
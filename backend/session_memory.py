@@ -0,0 +1,93 @@
+"""Conversation memory for active chat sessions.
+
+Every message is already persisted in chat_messages, so the in-process memory
+is only a cache: sessions are evicted least-recently-used first once the
+entry or byte budget is exceeded, or after sitting idle, and rebuilt from the
+stored messages the next time they are used.
+"""
+import logging
+import sys
+from typing import Any, Awaitable, Callable, Dict
+
+from job_cache import LRUTTLCache
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def memory_size(memory: Any) -> int:
+    """Approximate bytes held by a langchain memory's messages"""
+    messages = getattr(getattr(memory, "chat_memory", None), "messages", None) or []
+    return sys.getsizeof(memory) + sum(
+        sys.getsizeof(message) + sys.getsizeof(getattr(message, "content", "")) for message in messages
+    )
+
+
+class SessionMemoryStore:
+    """Bounded map of session_id to conversation memory.
+
+    ``load`` rebuilds a session's memory from storage and is called at most
+    once at a time per session. Idle time is measured from the last ``get`` or
+    ``touch``, so a session in active use is never expired.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], Awaitable[Any]],
+        max_sessions: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_ttl_seconds: float = 1800,
+        sizeof: Callable[[Any], int] = memory_size,
+    ):
+        self.load = load
+        self._cache = LRUTTLCache(
+            max_entries=max_sessions, max_bytes=max_bytes, ttl_seconds=idle_ttl_seconds, sizeof=sizeof
+        )
+        self._loads = SingleFlight()
+        self.rehydrations = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._cache
+
+    async def get(self, session_id: str) -> Any:
+        """The session's memory, rebuilt from storage if it isn't resident"""
+        memory = self._cache.get(session_id)
+        if memory is not None:
+            # Restart the idle clock
+            self._cache.set(session_id, memory)
+            return memory
+        return await self._loads.do(session_id, lambda: self._rehydrate(session_id))
+
+    async def _rehydrate(self, session_id: str) -> Any:
+        memory = await self.load(session_id)
+        self.rehydrations += 1
+        self._cache.set(session_id, memory)
+        return memory
+
+    def touch(self, session_id: str, memory: Any):
+        """Re-measure a resident session after its memory changed.
+
+        Sessions cleared or evicted in the meantime are left out; they are
+        rebuilt from storage when next used.
+        """
+        if session_id in self._cache:
+            self._cache.set(session_id, memory)
+
+    def discard(self, session_id: str):
+        self._cache.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        cache = self._cache.stats()
+        return {
+            "resident": cache["entries"],
+            "bytes": cache["bytes"],
+            "max_sessions": cache["max_entries"],
+            "max_bytes": cache["max_bytes"],
+            "idle_ttl_seconds": cache["ttl_seconds"],
+            "evictions": cache["evictions"],
+            "expirations": cache["expirations"],
+            "rehydrations": self.rehydrations,
+        }
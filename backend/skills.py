@@ -0,0 +1,126 @@
+"""Skill taxonomy and single-scan skill matcher.
+
+The taxonomy is loaded from a plain-text data file and compiled once into a
+single trie-shaped regex, so matching costs one pass over the text no matter
+how many skills the taxonomy holds.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_SKILLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills.txt")
+
+# Acronyms displayed in upper case rather than title case
+UPPERCASE_SKILLS = {'html', 'css', 'aws', 'gcp', 'ai', 'ui', 'ux'}
+
+
+@dataclass
+class SkillMatch:
+    """A skill found in a text, with every position it occurs at"""
+    name: str
+    display: str
+    positions: List[int] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.positions)
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie of the given words.
+
+    Shared prefixes are factored out (``git(?:hub|lab)?``), so the regex engine
+    walks at most one branch per character instead of trying every word.
+    Longer continuations are tried before a word ends, so the longest skill at
+    a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if ends_here else group
+
+    return build(trie)
+
+
+class SkillTaxonomy:
+    """Known skills compiled into one matcher"""
+
+    def __init__(self, skills: Iterable[str], display_names: Optional[Dict[str, str]] = None):
+        self.display_names: Dict[str, str] = {}
+        for skill in skills:
+            name = skill.strip().lower()
+            if name:
+                self.display_names[name] = self._default_display(name)
+        for name, display in (display_names or {}).items():
+            self.display_names[name.strip().lower()] = display
+
+        # Lookarounds instead of \b so skills ending in symbols (c++, c#) match too
+        self._pattern = re.compile(
+            r'(?<!\w)(' + trie_pattern(self.display_names) + r')(?!\w)'
+        )
+
+    def __len__(self) -> int:
+        return len(self.display_names)
+
+    @staticmethod
+    def _default_display(name: str) -> str:
+        return name.upper() if name in UPPERCASE_SKILLS else name.title()
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_SKILLS_FILE) -> "SkillTaxonomy":
+        """Load a taxonomy file: one skill per line, optional ``| Display`` suffix"""
+        skills = []
+        display_names = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                name, _, display = line.partition('|')
+                name = name.strip()
+                skills.append(name)
+                if display.strip():
+                    display_names[name] = display.strip()
+        return cls(skills, display_names)
+
+    def match(self, text: str) -> List[SkillMatch]:
+        """Find all skills in one scan, in order of first appearance"""
+        if not text:
+            return []
+
+        matches: Dict[str, SkillMatch] = {}
+        for found in self._pattern.finditer(text.lower()):
+            name = found.group(1)
+            skill_match = matches.get(name)
+            if skill_match is None:
+                skill_match = matches[name] = SkillMatch(name=name, display=self.display_names[name])
+            skill_match.positions.append(found.start(1))
+        return list(matches.values())
+
+    def extract(self, text: str) -> List[str]:
+        """Display names of every skill mentioned in the text"""
+        return [skill_match.display for skill_match in self.match(text)]
+
+
+_default_taxonomy: Optional[SkillTaxonomy] = None
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """The shared taxonomy, loaded from SKILLS_FILE on first use"""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = SkillTaxonomy.from_file(os.getenv("SKILLS_FILE", DEFAULT_SKILLS_FILE))
+    return _default_taxonomy
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from datetime import datetime
+
+from dedup import MAX_HAMMING_DISTANCE, DuplicateIndex, canonicalize_url, job_fingerprint, job_identity
+
+JOB = {
+    "application_url": "https://boards.example.com/acme/jobs/123",
+    "title": "Senior Backend Engineer",
+    "company": "Acme",
+    "summary": "Acme is hiring a senior backend engineer to design and run the services behind our payments platform, working closely with product and infrastructure teams.",
+    "job_highlights": ["Own the ledger service end to end", "Mentor two junior engineers"],
+}
+
+
+def test_canonicalize_url_drops_tracking_and_cosmetic_differences():
+    canonical = canonicalize_url("https://example.com/jobs/123?gh_jid=9&id=4")
+    assert canonicalize_url("http://www.Example.com/jobs/123/?id=4&utm_source=tavily&gh_jid=9#apply") == canonical
+    assert canonicalize_url("https://example.com/jobs/123?id=4&trk=feed&refId=abc&gh_jid=9") == canonical
+    assert canonicalize_url("https://example.com/jobs/124?id=4&gh_jid=9") != canonical
+
+
+def test_reposted_job_is_a_near_duplicate():
+    index = DuplicateIndex()
+    index.add_job(JOB)
+
+    repost = dict(JOB, application_url="https://mirror.example.org/view/acme-senior-backend-engineer",
+                  summary=JOB["summary"].replace("closely", "directly"))
+    assert index.find_near_duplicate(job_fingerprint(repost), job_identity(repost)) == JOB["application_url"]
+
+    other = dict(JOB, title="Product Designer", summary="Design onboarding flows and the mobile app experience for small business owners across three markets.")
+    assert index.find_near_duplicate(job_fingerprint(other), job_identity(other)) is None
+
+
+def test_roles_sharing_company_boilerplate_are_not_duplicates():
+    blurb = ("Acme builds the payments platform used by forty thousand small businesses across Europe. "
+             "We are a remote first team that values written communication, ownership and calm weeks. "
+             "Our engineers, designers and analysts work in small squads that own a product area end to end, "
+             "from discovery through launch and support, and every squad ships to customers several times a week.")
+    highlights = ["Remote first across Europe", "Four day work week", "Learning budget of 2000 EUR",
+                  "Equity for every employee", "Parental leave of 26 weeks"]
+    backend = dict(JOB, summary=blurb, job_highlights=highlights)
+    frontend = dict(backend, application_url="https://boards.example.com/acme/jobs/456", title="Staff Frontend Engineer")
+    # The shared text swamps the titles, so only the identity tells them apart
+    assert bin(job_fingerprint(backend) ^ job_fingerprint(frontend)).count("1") <= MAX_HAMMING_DISTANCE
+
+    index = DuplicateIndex()
+    index.add_job(backend)
+    assert index.find_near_duplicate(job_fingerprint(frontend), job_identity(frontend)) is None
+
+    repost = dict(backend, application_url="https://mirror.example.org/view/acme-backend", title="Senior  backend engineer")
+    assert index.find_near_duplicate(job_fingerprint(repost), job_identity(repost)) == JOB["application_url"]
+
+
+def test_short_jobs_are_not_fingerprinted():
+    assert job_fingerprint({"title": "Job Listing", "company": "Unknown Company"}) is None
+
+
+def test_aliases_resolve_and_survive_save_and_load():
+    index = DuplicateIndex()
+    index.add_job(JOB)
+    index.add("https://mirror.example.org/view/1?utm_medium=x", alias_of=JOB["application_url"])
+    # Catching up re-adds jobs already known; that is not a change worth saving
+    version = index.version
+    index.add_job(JOB)
+    assert index.version == version
+
+    watermark = datetime(2024, 5, 1, 12, 30)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dedup.json.gz")
+        index.save(path, watermark)
+        loaded = DuplicateIndex.load(path)
+
+    assert loaded.watermark == watermark
+
+    assert loaded.resolve_url("https://www.mirror.example.org/view/1") == JOB["application_url"]
+    assert loaded.resolve_url("https://boards.example.com/acme/jobs/123?utm_source=a") == JOB["application_url"]
+    assert JOB["application_url"] in loaded
+    assert loaded.find_near_duplicate(job_fingerprint(JOB), job_identity(JOB)) == JOB["application_url"]
+
+
+if __name__ == "__main__":
+    test_canonicalize_url_drops_tracking_and_cosmetic_differences()
+    test_reposted_job_is_a_near_duplicate()
+    test_roles_sharing_company_boilerplate_are_not_duplicates()
+    test_short_jobs_are_not_fingerprinted()
+    test_aliases_resolve_and_survive_save_and_load()
+    print("Dedup tests passed")
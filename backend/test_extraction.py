@@ -0,0 +1,315 @@
+import re
+
+from extraction import extract_qualifications, extract_text_fields
+from skills import SkillTaxonomy, get_skill_taxonomy
+from women_friendly import WOMEN_FRIENDLY_KEYWORDS, get_women_friendly_classifier
+
+# Representative job page texts, including edge cases for every field
+CORPUS = [
+    "",
+    "Short text.",
+    """Senior Software Engineer
+
+About us: We are a fast-growing fintech company building tools for small businesses.
+
+Responsibilities:
+• Build and maintain backend services
+• Work with product managers on new features
+• Mentor junior engineers
+
+Requirements:
+- 5+ years of experience with Python
+- Bachelor's degree in Computer Science or related field.
+- Familiarity with AWS and Docker
+
+Benefits: health insurance, parental leave, flexible hours.
+Salary: $120,000 - $150,000 per year. This is a full-time position.
+Apply by March 15th, 2025.
+""",
+    """Data Science Intern (Remote)
+
+What you'll do
+Analyze customer behaviour with large datasets and present findings to stakeholders
+Build dashboards in Tableau for the marketing organisation
+
+Qualifications: currently pursuing a master or PhD. Experience: 1-2 years preferred.
+Compensation $40K - $55K depending on location. Application deadline: 30 April 2025
+We are an equal opportunity employer committed to diversity and inclusion.
+""",
+    """Contract UX designer, hybrid in Berlin.
+
+Company overview - a design studio with 40 people
+
+Education requirements: a diploma in design or equivalent portfolio
+Pay: 65,000 - 80,000 EUR
+Please submit before 12/31/2025, the deadline for this role.
+""",
+    """Part-time frontend developer wanted. Work from home possible.
+Key responsibilities: building React components that are accessible and fast, and writing tests for them
+requirements follow below
+We need 3 years experience with TypeScript.
+""",
+    """Highlights: great team - remote friendly - stock options
+Qualifications: what you'll need: strong communication skills and a BS in engineering
+about us we build rockets
+""",
+    """Freelance writer. No degree needed! Experience: 10+ years
+Educational qualifications: none. Closing date is June 1, 2026
+""" * 3,
+]
+
+
+def legacy_extract(text: str) -> dict:
+    """The original inline extraction from fetch_job_info, kept as the reference"""
+    company_description = None
+    if text:
+        company_pattern = r'(?:about us|about the company|company overview)(?::|.{0,10})(.*?)(?:\n\n|\n\s*\n)'
+        company_match = re.search(company_pattern, text, re.IGNORECASE | re.DOTALL)
+        if company_match:
+            company_description = company_match.group(1).strip()
+            if len(company_description) > 150:
+                company_description = company_description[:147] + "..."
+
+    application_deadline = None
+    deadline_patterns = [
+        r'(?:apply by|application deadline|closing date|deadline)(?::|is|.*?:)?\s*(\w+\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4})',
+        r'(?:apply by|application deadline|closing date|deadline)(?::|is|.*?:)?\s*(\d{1,2}(?:st|nd|rd|th)?\s+\w+,?\s+\d{4})',
+        r'(\d{1,2}/\d{1,2}/\d{4})(?:.*?deadline)'
+    ]
+    for pattern in deadline_patterns:
+        deadline_match = re.search(pattern, text, re.IGNORECASE)
+        if deadline_match:
+            application_deadline = deadline_match.group(1).strip()
+            break
+
+    job_type = None
+    if text:
+        job_type_patterns = {
+            'full-time': r'full[- ]time|full time',
+            'part-time': r'part[- ]time|part time',
+            'contract': r'contract|contractor',
+            'freelance': r'freelance',
+            'internship': r'internship|intern',
+            'remote': r'remote|work from home|wfh',
+            'hybrid': r'hybrid'
+        }
+        for type_name, pattern in job_type_patterns.items():
+            if re.search(pattern, text.lower()):
+                job_type = type_name
+                break
+
+    salary_range = None
+    if text:
+        salary_patterns = [
+            r'\$\d{2,3}(?:,\d{3})+(?:\s*-\s*\$\d{2,3}(?:,\d{3})+)?(?:\s*per\s*year|\s*annually|\s*/\s*year)?',
+            r'\$\d{2,3}K\s*-\s*\$\d{2,3}K',
+            r'\d{2,3},\d{3}\s*-\s*\d{2,3},\d{3}\s*(?:USD|EUR|GBP)?'
+        ]
+        for pattern in salary_patterns:
+            salary_match = re.search(pattern, text)
+            if salary_match:
+                salary_range = salary_match.group(0)
+                break
+
+    education_required = None
+    edu_patterns = [
+        r'(?:bachelor|master|phd|bs|ms|ba|degree|diploma)',
+        r'(?:education|educational)(?:\s+requirements|\s+qualifications)?(?::|.{0,10})(.*?)(?:\n|\n\n)'
+    ]
+    for pattern in edu_patterns:
+        edu_match = re.search(pattern, text, re.IGNORECASE)
+        if edu_match:
+            sentence = re.findall(r'[^.!?]*(?:' + pattern + ')[^.!?]*[.!?]', text, re.IGNORECASE)
+            if sentence:
+                education_required = sentence[0].strip()
+                break
+
+    experience_required = None
+    exp_patterns = [
+        r'(\d+(?:-\d+)?\+?\s+years?(?:\s+of)?\s+experience)',
+        r'experience(?::|.*?:)?\s+(\d+(?:-\d+)?\+?\s+years)'
+    ]
+    for pattern in exp_patterns:
+        exp_match = re.search(pattern, text, re.IGNORECASE)
+        if exp_match:
+            experience_required = exp_match.group(1).strip()
+            break
+
+    job_highlights = []
+    if text:
+        highlight_pattern = r'(?:highlights|why you\'ll love this role|what you\'ll do|responsibilities|key responsibilities)(?::|.{0,10})(.*?)(?:\n\n\w|requirements|qualifications)'
+        highlight_match = re.search(highlight_pattern, text, re.IGNORECASE | re.DOTALL)
+        if highlight_match:
+            highlight_text = highlight_match.group(1).strip()
+            if '•' in highlight_text:
+                points = [p.strip() for p in highlight_text.split('•') if p.strip()]
+            elif '-' in highlight_text:
+                points = [p.strip() for p in highlight_text.split('-') if p.strip()]
+            else:
+                points = [p.strip() for p in highlight_text.split('\n') if p.strip() and len(p.strip()) > 15]
+            job_highlights = points[:5]
+
+    qualifications = []
+    qualifications_section = re.search(r'(?:requirements|qualifications|what you\'ll need)(?::|.*?:)(.*?)(?:responsibilities|benefits|about us|\n\n\w)', text.lower(), re.DOTALL | re.IGNORECASE)
+    if qualifications_section:
+        qual_text = qualifications_section.group(1).strip()
+        if '•' in qual_text:
+            qualifications = [q.strip() for q in qual_text.split('•') if q.strip()]
+        elif '-' in qual_text:
+            qualifications = [q.strip() for q in qual_text.split('-') if q.strip()]
+        else:
+            qualifications = [q.strip() for q in qual_text.split('\n') if q.strip()]
+        qualifications = [q for q in qualifications[:5] if len(q) > 10]
+
+    return {
+        "application_deadline": application_deadline,
+        "job_type": job_type,
+        "salary_range": salary_range,
+        "education_required": education_required,
+        "experience_required": experience_required,
+        "job_highlights": job_highlights,
+        "qualifications": qualifications,
+        "company_description": company_description,
+    }
+
+
+def test_extraction_matches_legacy_output():
+    """The precompiled extractor must produce exactly what the inline regexes did"""
+    for text in CORPUS:
+        extracted = extract_text_fields(text)
+        expected = legacy_extract(text)
+        for name, value in expected.items():
+            if name == "qualifications":
+                # Extracted on their own, see the next test
+                continue
+            assert getattr(extracted, name) == value, f"{name} differs for text: {text[:40]!r}"
+
+
+def test_qualifications_are_extracted_on_their_own():
+    """Job details need the requirements section without the other fields"""
+    for text in CORPUS:
+        assert extract_qualifications(text) == legacy_extract(text)["qualifications"]
+    assert extract_qualifications(CORPUS[2])
+
+
+def test_job_type_priority_does_not_depend_on_position():
+    """One combined scan still prefers earlier types over earlier matches"""
+    texts = [
+        "Hybrid role, remote days allowed, part time or full time",
+        "An internship that can be remote",
+        "wfh contractor",
+        "Work from home, no contract, freelancers welcome",
+        "nothing relevant here",
+    ]
+    for text in texts:
+        assert extract_text_fields(text).job_type == legacy_extract(text)["job_type"]
+    assert extract_text_fields(texts[0]).job_type == "full-time"
+
+
+def test_extraction_skips_unwanted_fields():
+    """Fields already present in structured data are not re-extracted"""
+    extracted = extract_text_fields(
+        CORPUS[2],
+        want_job_type=False,
+        want_salary=False,
+        want_company_description=False
+    )
+    assert extracted.job_type is None
+    assert extracted.salary_range is None
+    assert extracted.company_description is None
+    assert extracted.experience_required == legacy_extract(CORPUS[2])["experience_required"]
+
+
+LEGACY_TECH_SKILLS = [
+    'python', 'javascript', 'typescript', 'java', r'c\+\+', 'c#', 'ruby', 'go', 'php',
+    'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring', 'express',
+    'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'oracle', 'firebase',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ci/cd',
+    'git', 'github', 'gitlab', 'bitbucket', 'agile', 'scrum', 'kanban',
+    'html', 'css', 'sass', 'less', 'tailwind', 'bootstrap',
+    'ai', 'machine learning', 'deep learning', 'data science', 'tensorflow', 'pytorch',
+    'product management', 'ux', 'ui', 'figma', 'sketch', 'adobe xd',
+    'data analysis', 'tableau', 'power bi', 'excel', 'r', 'sas'
+]
+
+
+def legacy_extract_skills(text: str) -> set:
+    """The original per-skill regex loop from extract_skills, kept as the reference"""
+    skills_found = set()
+    for skill in LEGACY_TECH_SKILLS:
+        if re.search(r'\b' + skill + r'\b', text.lower()):
+            clean_skill = skill.replace('\\', '')
+            if clean_skill in ('html', 'css', 'aws', 'gcp', 'ai', 'ui', 'ux'):
+                skills_found.add(clean_skill.upper())
+            else:
+                skills_found.add(clean_skill.title())
+    return skills_found
+
+
+def test_skill_taxonomy_matches_legacy_output():
+    """The single-scan matcher finds the same skills with the same display casing"""
+    taxonomy = get_skill_taxonomy()
+    texts = CORPUS + [
+        "We use Python, React and Node. GitHub and git, AWS/GCP, machine learning, CI/CD, Power BI, UX/UI. R and Go.",
+        "Java and JavaScript, NoSQL and MySQL, no plain sequel. Tailwind-based HTML/CSS with less or sass.",
+    ]
+    for text in texts:
+        assert set(taxonomy.extract(text)) == legacy_extract_skills(text), f"skills differ for text: {text[:40]!r}"
+
+
+def test_skill_taxonomy_counts_positions_and_symbols():
+    taxonomy = SkillTaxonomy(["go", "git", "github", "c++"], display_names={"github": "GitHub"})
+    matches = {m.name: m for m in taxonomy.match("Git, GitHub and Go. More git. C++ too")}
+    assert matches["git"].count == 2
+    assert matches["git"].positions == [0, 25]
+    assert matches["github"].display == "GitHub"
+    assert matches["go"].count == 1
+    # Skills ending in symbols match on their own, unlike with a trailing \b
+    assert "c++" in matches
+
+
+def legacy_why_women_friendly(description: str) -> list:
+    """The original per-keyword sentence scan from fetch_job_details"""
+    why_women_friendly = []
+    for keyword in WOMEN_FRIENDLY_KEYWORDS:
+        if keyword in description.lower():
+            sentences = re.split(r'(?<=[.!?])\s+', description)
+            for sentence in sentences:
+                if keyword in sentence.lower():
+                    why_women_friendly.append(sentence.strip())
+                    break
+    return why_women_friendly
+
+
+def test_women_friendly_evidence_matches_legacy_output():
+    classifier = get_women_friendly_classifier()
+    texts = CORPUS + [
+        "We value Diversity. Our culture is inclusive! Flexible hours and parental leave. Mentorship, equity and diverse teams.",
+    ]
+    for text in texts:
+        assert classifier.evidence_sentences(text) == legacy_why_women_friendly(text)
+
+
+def test_women_friendly_company_index():
+    classifier = get_women_friendly_classifier()
+    assert classifier.match_company("Google LLC") == "google"
+    assert classifier.match_company("Johnson & Johnson Services, Inc.") == "johnson & johnson"
+    assert classifier.match_company("Facebook") == "meta"
+    assert classifier.match_company("salesforcecareers") == "salesforce"
+    assert classifier.match_company("Acme Widgets") is None
+
+    assessment = classifier.classify("Engineer", "Acme", "We support women in tech and offer parental leave.")
+    assert assessment.is_women_friendly
+    assert assessment.keywords == ["women in tech", "parental leave"]
+
+
+if __name__ == "__main__":
+    test_extraction_matches_legacy_output()
+    test_qualifications_are_extracted_on_their_own()
+    test_job_type_priority_does_not_depend_on_position()
+    test_extraction_skips_unwanted_fields()
+    test_skill_taxonomy_matches_legacy_output()
+    test_skill_taxonomy_counts_positions_and_symbols()
+    test_women_friendly_evidence_matches_legacy_output()
+    test_women_friendly_company_index()
+    print("Extraction, skill and women-friendly output match the legacy implementation")
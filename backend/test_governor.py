@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+from governor import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, Governor
+
+
+def test_limiter_grows_additively_and_backs_off_multiplicatively():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=8, initial_limit=4, latency_target_ms=100)
+        await limiter.acquire()
+        await limiter.release(50, ok=True)
+        assert limiter.limit == 4.25
+
+        await limiter.acquire()
+        await limiter.release(500, ok=True)
+        assert limiter.limit == 2.125
+
+        await limiter.acquire()
+        await limiter.release(10, ok=False)
+        await limiter.acquire()
+        await limiter.release(10, ok=False)
+        # Never below min_limit, and cancelled calls (no latency) don't adapt
+        assert limiter.limit == 1
+        await limiter.acquire()
+        await limiter.release(None, ok=False)
+        assert limiter.limit == 1
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.stats()["increases"] == 1 and limiter.stats()["decreases"] == 3
+    assert limiter.in_flight == 0
+
+
+def test_limiter_blocks_callers_beyond_the_limit():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=2, latency_target_ms=100)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        await limiter.release(10, ok=True)
+        await asyncio.wait_for(waiting, 1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(run())
+
+
+def test_breaker_opens_probes_half_open_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+
+    # A failed probe reopens at once
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.times_opened == 2
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.consecutive_failures == 0
+    assert breaker.allow() and breaker.allow()
+    assert breaker.rejected == 2
+
+
+def test_governor_call_trips_rejects_and_recovers():
+    async def run():
+        governor = Governor(
+            "test",
+            AdaptiveLimiter(max_limit=4, latency_target_ms=1000),
+            CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        )
+        calls = []
+
+        async def respond(status):
+            calls.append(status)
+            return status
+
+        for _ in range(2):
+            assert await governor.call(lambda: respond(503), is_failure=lambda status: status >= 500) == 503
+        assert governor.breaker.state == CircuitBreaker.OPEN
+        assert governor.limiter.limit == 1
+
+        try:
+            await governor.call(lambda: respond(200))
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError as e:
+            assert e.name == "test"
+        assert calls == [503, 503]
+
+        await asyncio.sleep(0.06)
+        assert await governor.call(lambda: respond(200)) == 200
+        assert governor.breaker.state == CircuitBreaker.CLOSED
+        return governor
+
+    governor = asyncio.run(run())
+    assert governor.stats()["calls"] == 3 and governor.stats()["failures"] == 2
+    assert governor.limiter.in_flight == 0
+
+
+def test_cancelled_probe_frees_the_half_open_slot():
+    async def run():
+        governor = Governor(
+            "test",
+            AdaptiveLimiter(max_limit=1),
+            CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        )
+
+        async def fail():
+            raise RuntimeError("down")
+
+        try:
+            await governor.call(fail)
+        except RuntimeError:
+            pass
+        assert governor.breaker.state == CircuitBreaker.OPEN
+
+        probe = asyncio.ensure_future(governor.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        assert governor.breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        assert await governor.call(lambda: asyncio.sleep(0, result="ok")) == "ok"
+        assert governor.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_limiter_grows_additively_and_backs_off_multiplicatively()
+    test_limiter_blocks_callers_beyond_the_limit()
+    test_breaker_opens_probes_half_open_and_closes()
+    test_governor_call_trips_rejects_and_recovers()
+    test_cancelled_probe_frees_the_half_open_slot()
+    print("Governor tests passed")
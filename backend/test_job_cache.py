@@ -0,0 +1,96 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from job_cache import LRUTTLCache, TieredJobCache
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LRUTTLCache(max_entries=2, sizeof=lambda value: 1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_skips_oversized_values():
+    cache = LRUTTLCache(max_entries=10, max_bytes=100, sizeof=len)
+    cache.set("a", "x" * 40)
+    cache.set("b", "x" * 40)
+    cache.set("c", "x" * 40)
+    assert "a" not in cache and cache.stats()["bytes"] == 80
+
+    # A value larger than the whole budget is not cached and flushes nothing
+    cache.set("huge", "x" * 101)
+    assert "huge" not in cache and len(cache) == 2
+
+    # Replacing an entry releases its old size
+    cache.set("b", "x")
+    assert cache.stats()["bytes"] == 41
+
+
+def test_entries_expire_and_report_their_age():
+    cache = LRUTTLCache(ttl_seconds=0.05)
+    cache.set("a", "value")
+    value, age = cache.get_with_age("a")
+    assert value == "value" and 0 <= age < 0.05
+
+    time.sleep(0.06)
+    assert cache.get_with_age("a") == (None, None)
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["hits"] == 1 and stats["misses"] == 1
+
+
+def make_tiered(docs, **kwargs):
+    lookups = []
+
+    async def lookup(url, fresh_after):
+        lookups.append((url, fresh_after))
+        doc = docs.get(url)
+        if isinstance(doc, Exception):
+            raise doc
+        return doc
+
+    cache = TieredJobCache(LRUTTLCache(sizeof=lambda value: 1), lookup, loader=dict, **kwargs)
+    return cache, lookups
+
+
+def test_l2_hits_are_promoted_to_l1():
+    async def run():
+        cache, lookups = make_tiered({"https://a": {"title": "A"}}, l2_max_age_seconds=3600)
+        assert await cache.get("https://a") == {"title": "A"}
+        assert await cache.get("https://a") == {"title": "A"}
+        assert await cache.get("https://b") is None
+        return cache, lookups
+
+    cache, lookups = asyncio.run(run())
+    # The second read was served by L1
+    assert [url for url, _ in lookups] == ["https://a", "https://b"]
+    fresh_after = lookups[0][1]
+    assert datetime.utcnow() - timedelta(seconds=3601) < fresh_after < datetime.utcnow()
+    assert cache.stats()["l2"]["hits"] == 1 and cache.stats()["l2"]["misses"] == 1
+
+
+def test_l2_errors_and_disabled_l2_are_misses():
+    async def run():
+        cache, lookups = make_tiered({"https://a": RuntimeError("down")})
+        assert await cache.get("https://a") is None
+        disabled, disabled_lookups = make_tiered({"https://a": {"title": "A"}}, l2_max_age_seconds=0)
+        assert await disabled.get("https://a") is None
+        return cache, disabled_lookups
+
+    cache, disabled_lookups = asyncio.run(run())
+    assert cache.stats()["l2"]["errors"] == 1
+    assert disabled_lookups == []
+
+
+if __name__ == "__main__":
+    test_least_recently_used_entries_are_evicted()
+    test_byte_budget_evicts_and_skips_oversized_values()
+    test_entries_expire_and_report_their_age()
+    test_l2_hits_are_promoted_to_l1()
+    test_l2_errors_and_disabled_l2_are_misses()
+    print("Job cache tests passed")
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime
+
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from pagination import InvalidCursorError, decode_cursor, encode_cursor, find_page, keyset_filter, with_tiebreaker
+
+
+def test_cursor_round_trips_datetimes_and_object_ids():
+    values = [datetime(2024, 5, 1, 12, 30, 15, 123000), ObjectId("65f1c0ffee0000000000abcd"), "Acme", 3, None]
+    token = encode_cursor(values)
+    assert "=" not in token
+    assert decode_cursor(token) == values
+
+
+def test_bad_cursors_are_rejected():
+    for token in ["not base64!", encode_cursor([1])[:-2] + "$$", "eyJhIjogMX0"]:
+        try:
+            decode_cursor(token)
+            assert False, f"expected InvalidCursorError for {token!r}"
+        except InvalidCursorError:
+            pass
+
+
+def test_tiebreaker_follows_the_last_sort_direction():
+    assert with_tiebreaker([("updated_at", DESCENDING)]) == [("updated_at", DESCENDING), ("_id", DESCENDING)]
+    assert with_tiebreaker([("_id", ASCENDING)]) == [("_id", ASCENDING)]
+
+
+def test_keyset_filter_handles_mixed_directions_and_the_id_tiebreaker():
+    last_id = ObjectId()
+    sort = with_tiebreaker([("company", ASCENDING), ("stored_at", DESCENDING)])
+    stored_at = datetime(2024, 5, 1)
+    assert keyset_filter(sort, ["Acme", stored_at, last_id]) == {"$or": [
+        {"company": {"$gt": "Acme"}},
+        {"company": "Acme", "stored_at": {"$lt": stored_at}},
+        {"company": "Acme", "stored_at": stored_at, "_id": {"$lt": last_id}},
+    ]}
+
+    try:
+        keyset_filter(sort, ["Acme"])
+        assert False, "expected InvalidCursorError"
+    except InvalidCursorError:
+        pass
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class FakeCollection:
+    """Sorted, skipped and limited in memory; only ascending _id sorts are needed here"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def find(self, query, projection, sort, skip, limit):
+        self.calls.append((query, limit))
+        return FakeCursor(self.docs[skip:skip + limit])
+
+
+def test_find_page_returns_a_cursor_only_when_more_remain():
+    async def run():
+        collection = FakeCollection([{"_id": i} for i in range(3)])
+        first = await find_page(collection, {}, [("_id", ASCENDING)], limit=2)
+        last = await find_page(collection, {}, [("_id", ASCENDING)], limit=3)
+        try:
+            await find_page(collection, {}, [("_id", ASCENDING)], limit=0)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        return collection, first, last
+
+    collection, (docs, next_cursor), (all_docs, no_cursor) = asyncio.run(run())
+    assert docs == [{"_id": 0}, {"_id": 1}] and decode_cursor(next_cursor) == [1]
+    assert len(all_docs) == 3 and no_cursor is None
+    # Each page asks for one extra document, and limit=0 never reached the collection
+    assert [limit for _, limit in collection.calls] == [3, 4]
+
+
+if __name__ == "__main__":
+    test_cursor_round_trips_datetimes_and_object_ids()
+    test_bad_cursors_are_rejected()
+    test_tiebreaker_follows_the_last_sort_direction()
+    test_keyset_filter_handles_mixed_directions_and_the_id_tiebreaker()
+    test_find_page_returns_a_cursor_only_when_more_remain()
+    print("Pagination tests passed")
@@ -0,0 +1,94 @@
+import asyncio
+
+from prefetch import DetailPrefetcher
+
+
+def make_prefetcher(**kwargs):
+    cache = set()
+    built = []
+    gate = asyncio.Event()
+
+    async def build(url):
+        built.append(url)
+        await gate.wait()
+        if not url.startswith("uncacheable"):
+            cache.add(url)
+
+    prefetcher = DetailPrefetcher(build=build, is_cached=lambda url: url in cache, **kwargs)
+    return prefetcher, built, gate, cache
+
+
+async def drain(prefetcher):
+    await asyncio.wait_for(prefetcher._queue.join(), 1)
+
+
+def test_lower_ranks_are_built_first_across_searches():
+    async def run():
+        prefetcher, built, gate, _ = make_prefetcher(workers=1)
+        gate.set()
+        prefetcher.start()
+        prefetcher.submit(["a0", "a1", "a2"])
+        prefetcher.submit(["b0", "b1"])
+        await drain(prefetcher)
+        await prefetcher.close()
+        return prefetcher, built
+
+    prefetcher, built = asyncio.run(run())
+    assert built == ["a0", "b0", "a1", "b1", "a2"]
+    assert prefetcher.stats()["completed"] == 5
+
+
+def test_cached_queued_and_in_flight_urls_are_skipped():
+    async def run():
+        prefetcher, built, gate, cache = make_prefetcher(workers=1)
+        cache.add("cached")
+        prefetcher.start()
+        prefetcher.submit(["a", "b", "b", "cached"])
+        await asyncio.sleep(0.01)
+        # "a" is being built and "b" is still queued
+        prefetcher.submit(["a", "b"])
+        gate.set()
+        await drain(prefetcher)
+        await prefetcher.close()
+        return prefetcher, built
+
+    prefetcher, built = asyncio.run(run())
+    assert built == ["a", "b"]
+    assert prefetcher.stats()["deduplicated"] == 4
+
+
+def test_full_queue_drops_the_rest_of_the_search():
+    async def run():
+        prefetcher, built, gate, _ = make_prefetcher(workers=1, max_queue_size=2)
+        prefetcher.start()
+        prefetcher.submit(["a", "b", "c", "d"])
+        gate.set()
+        await drain(prefetcher)
+        await prefetcher.close()
+        return prefetcher, built
+
+    prefetcher, built = asyncio.run(run())
+    assert built == ["a", "b"]
+    assert prefetcher.stats()["dropped"] == 2
+
+
+def test_builds_that_cache_nothing_are_not_completed():
+    async def run():
+        prefetcher, _, gate, _ = make_prefetcher(workers=2)
+        gate.set()
+        prefetcher.start()
+        prefetcher.submit(["a", "uncacheable"])
+        await drain(prefetcher)
+        await prefetcher.close()
+        return prefetcher
+
+    stats = asyncio.run(run()).stats()
+    assert stats["completed"] == 1 and stats["not_cached"] == 1 and stats["failed"] == 0
+
+
+if __name__ == "__main__":
+    test_lower_ranks_are_built_first_across_searches()
+    test_cached_queued_and_in_flight_urls_are_skipped()
+    test_full_queue_drops_the_rest_of_the_search()
+    test_builds_that_cache_nothing_are_not_completed()
+    print("Prefetch tests passed")
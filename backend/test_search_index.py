@@ -0,0 +1,70 @@
+import os
+import tempfile
+from datetime import datetime
+
+from search_index import JobSearchIndex, tokenize
+
+JOBS = [
+    {"application_url": "https://a.example/1", "title": "Senior Python Engineer", "company": "Stripe",
+     "skills": ["Python", "AWS"], "summary": "Build payment APIs", "location": "Remote", "is_women_friendly": True},
+    {"application_url": "https://a.example/2", "title": "Frontend Developer", "company": "Etsy",
+     "skills": ["React", "TypeScript"], "summary": "Python tooling a plus", "location": "Brooklyn, NY", "is_women_friendly": False},
+    {"application_url": "https://a.example/3", "title": "C++ Engineer", "company": "Nvidia",
+     "skills": ["C++"], "summary": "GPU drivers", "location": "Santa Clara, CA", "is_women_friendly": True},
+]
+
+
+def build_index() -> JobSearchIndex:
+    index = JobSearchIndex()
+    index.add_many(dict(job) for job in JOBS)
+    return index
+
+
+def test_tokenize_keeps_skill_symbols_and_drops_stopwords():
+    assert tokenize("C++ and C# jobs for the Web") == ["c++", "c#", "web"]
+
+
+def test_title_matches_rank_above_summary_matches():
+    urls = [job["application_url"] for _, job in build_index().search("python")]
+    assert urls == ["https://a.example/1", "https://a.example/2"]
+
+
+def test_readding_a_job_replaces_its_postings():
+    index = build_index()
+    index.add(dict(JOBS[1], summary="No backend work"))
+    assert len(index) == 3
+    assert [job["application_url"] for _, job in index.search("python")] == ["https://a.example/1"]
+
+    index.remove("https://a.example/1")
+    assert index.search("python") == []
+
+
+def test_women_friendly_filter_and_limit():
+    index = build_index()
+    assert {job["company"] for _, job in index.search("engineer", women_friendly_only=True)} == {"Stripe", "Nvidia"}
+    assert len(index.search("engineer", limit=1)) == 1
+    assert index.search("c++")[0][1]["company"] == "Nvidia"
+
+
+def test_save_and_load_round_trip():
+    index = build_index()
+    index.remove("https://a.example/2")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.json.gz")
+        index.save(path, datetime(2024, 5, 1, 12, 30))
+        loaded = JobSearchIndex.load(path)
+
+    assert loaded is not None and len(loaded) == 2
+    assert loaded.watermark == datetime(2024, 5, 1, 12, 30)
+    assert loaded.search("engineer") == index.search("engineer")
+    loaded.add(dict(JOBS[1]))
+    assert "https://a.example/2" in loaded
+
+
+if __name__ == "__main__":
+    test_tokenize_keeps_skill_symbols_and_drops_stopwords()
+    test_title_matches_rank_above_summary_matches()
+    test_readding_a_job_replaces_its_postings()
+    test_women_friendly_filter_and_limit()
+    test_save_and_load_round_trip()
+    print("Search index tests passed")
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from session_memory import SessionMemoryStore
+
+
+def make_store(**kwargs):
+    loads = []
+
+    async def load(session_id):
+        loads.append(session_id)
+        await asyncio.sleep(0)
+        return [f"history of {session_id}"]
+
+    return SessionMemoryStore(load, sizeof=lambda memory: 100 * len(memory), **kwargs), loads
+
+
+def test_misses_rehydrate_once_and_hits_stay_resident():
+    async def run():
+        store, loads = make_store()
+        first, second = await asyncio.gather(store.get("a"), store.get("a"))
+        assert first is second
+        assert await store.get("a") is first
+        return store, loads
+
+    store, loads = asyncio.run(run())
+    assert loads == ["a"]
+    assert store.stats()["rehydrations"] == 1 and "a" in store
+
+
+def test_least_recently_used_sessions_are_evicted_and_reloaded():
+    async def run():
+        store, loads = make_store(max_sessions=2)
+        await store.get("a")
+        await store.get("b")
+        await store.get("a")
+        await store.get("c")
+        assert "b" not in store and "a" in store
+        await store.get("b")
+        return store, loads
+
+    store, loads = asyncio.run(run())
+    assert loads == ["a", "b", "c", "b"]
+    assert store.stats()["evictions"] == 2 and len(store) == 2
+
+
+def test_byte_budget_counts_grown_memories():
+    async def run():
+        store, _ = make_store(max_bytes=350)
+        a = await store.get("a")
+        await store.get("b")
+        a.extend(["user", "assistant"])
+        store.touch("a", a)
+        return store
+
+    store = asyncio.run(run())
+    assert "b" not in store and "a" in store
+    assert store.stats()["bytes"] == 300
+
+
+def test_idle_sessions_expire_and_discard_is_final():
+    async def run():
+        store, loads = make_store(idle_ttl_seconds=0.05)
+        memory = await store.get("a")
+        time.sleep(0.06)
+        assert await store.get("a") is not memory
+
+        store.discard("a")
+        store.touch("a", memory)
+        assert "a" not in store
+        return store, loads
+
+    store, loads = asyncio.run(run())
+    assert loads == ["a", "a"]
+    assert store.stats()["expirations"] == 1
+
+
+if __name__ == "__main__":
+    test_misses_rehydrate_once_and_hits_stay_resident()
+    test_least_recently_used_sessions_are_evicted_and_reloaded()
+    test_byte_budget_counts_grown_memories()
+    test_idle_sessions_expire_and_discard_is_final()
+    print("Session memory tests passed")
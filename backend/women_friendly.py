@@ -0,0 +1,192 @@
+"""Women-friendly job classifier.
+
+Company names are looked up in a normalized index (exact names, aliases and
+prefixes) instead of being substring-scanned one by one, and all keywords are
+found with a single multi-pattern regex that also reports where they matched.
+"""
+import bisect
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from skills import trie_pattern
+
+# Women-friendly keywords and companies
+WOMEN_FRIENDLY_KEYWORDS = [
+    'women in tech', 'diversity', 'inclusion', 'equal opportunity',
+    'women leadership', 'women empowerment', 'female entrepreneurs',
+    'gender equality', 'work-life balance', 'flexible', 'parental leave',
+    'maternity', 'mentorship', 'diverse', 'inclusive', 'equity'
+]
+
+WOMEN_FRIENDLY_COMPANIES = {
+    'accenture', 'adobe', 'akamai', 'atlassian', 'bumble', 'dell', 'etsy',
+    'general motors', 'hpinc', 'hubspot', 'ibm', 'intuit', 'johnson & johnson',
+    'mastercard', 'microsoft', 'netflix', 'new relic', 'nvidia', 'paypal',
+    'salesforce', 'sap', 'shopify', 'slack', 'spotify', 'square', 'stripe',
+    'twitter', 'uber', 'workday', 'zoom', 'google', 'meta', 'amazon', 'apple',
+    'pinterest', 'airbnb', 'asana', 'dropbox', 'gitlab', 'godaddy', 'linkedin',
+    'mailchimp', 'mongodb', 'zendesk', 'twilio'
+}
+
+# Other names the same employers commonly appear under
+WOMEN_FRIENDLY_COMPANY_ALIASES = {
+    'hp': 'hpinc',
+    'hp inc': 'hpinc',
+    'j&j': 'johnson & johnson',
+    'jnj': 'johnson & johnson',
+    'gm': 'general motors',
+    'facebook': 'meta',
+    'meta platforms': 'meta',
+    'alphabet': 'google',
+    'aws': 'amazon',
+    'block': 'square',
+    'x corp': 'twitter',
+    'new relic inc': 'new relic',
+}
+
+# Names at least this long also match as a prefix of a token ("googlecareers")
+MIN_PREFIX_LENGTH = 5
+
+_TOKEN_RE = re.compile(r'[a-z0-9&]+')
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def normalize_company(name: str) -> str:
+    """Lowercase a company name and drop punctuation other than '&'"""
+    return ' '.join(_TOKEN_RE.findall((name or '').lower()))
+
+
+@dataclass
+class KeywordHit:
+    keyword: str
+    start: int
+    end: int
+
+
+@dataclass
+class WomenFriendlyAssessment:
+    """Classification result together with the evidence behind it"""
+    is_women_friendly: bool
+    company_match: Optional[str] = None
+    keyword_hits: List[KeywordHit] = field(default_factory=list)
+
+    @property
+    def keywords(self) -> List[str]:
+        """Distinct matched keywords in order of first appearance"""
+        return list(dict.fromkeys(hit.keyword for hit in self.keyword_hits))
+
+
+class WomenFriendlyClassifier:
+    def __init__(
+        self,
+        companies: Iterable[str] = WOMEN_FRIENDLY_COMPANIES,
+        keywords: Iterable[str] = WOMEN_FRIENDLY_KEYWORDS,
+        aliases: Optional[Dict[str, str]] = None,
+        min_keywords: int = 2,
+    ):
+        self.keywords = [keyword.lower() for keyword in keywords]
+        self.min_keywords = min_keywords
+
+        # Normalized name -> canonical company
+        self.company_index: Dict[str, str] = {}
+        for company in companies:
+            self.company_index[normalize_company(company)] = company
+        for alias, company in (aliases if aliases is not None else WOMEN_FRIENDLY_COMPANY_ALIASES).items():
+            self.company_index[normalize_company(alias)] = company
+
+        self._max_name_tokens = max((len(name.split()) for name in self.company_index), default=0)
+        self._prefix_lengths = sorted(
+            {len(name) for name in self.company_index if ' ' not in name and len(name) >= MIN_PREFIX_LENGTH},
+            reverse=True
+        )
+
+        # Lookahead so overlapping keywords at different offsets are all reported
+        self._keyword_pattern = re.compile('(?=(' + trie_pattern(self.keywords) + '))')
+
+    def match_company(self, company: str) -> Optional[str]:
+        """Canonical women-friendly company named in ``company``, if any"""
+        normalized = normalize_company(company)
+        if not normalized:
+            return None
+
+        exact = self.company_index.get(normalized)
+        if exact:
+            return exact
+
+        # Any run of whole tokens, e.g. "Google LLC" or "Amazon Web Services"
+        tokens = normalized.split()
+        for size in range(min(self._max_name_tokens, len(tokens)), 0, -1):
+            for i in range(len(tokens) - size + 1):
+                match = self.company_index.get(' '.join(tokens[i:i + size]))
+                if match:
+                    return match
+
+        # Names glued to other words, e.g. "salesforcecareers"
+        for token in tokens:
+            for length in self._prefix_lengths:
+                if len(token) > length:
+                    match = self.company_index.get(token[:length])
+                    if match:
+                        return match
+
+        return None
+
+    def find_keywords(self, text: str) -> List[KeywordHit]:
+        """Every keyword occurrence in ``text`` with its character span"""
+        if not text:
+            return []
+        return [
+            KeywordHit(keyword=m.group(1), start=m.start(), end=m.start() + len(m.group(1)))
+            for m in self._keyword_pattern.finditer(text.lower())
+        ]
+
+    def classify(self, title: str, company: str, text: str) -> WomenFriendlyAssessment:
+        """Women-friendly if the employer is known to be, or 2+ keywords appear"""
+        company_match = self.match_company(company) if company else None
+        if company_match:
+            return WomenFriendlyAssessment(is_women_friendly=True, company_match=company_match)
+
+        combined_text = (text or "") + " " + (title or "") + " " + (company or "")
+        hits = self.find_keywords(combined_text)
+        distinct_keywords = {hit.keyword for hit in hits}
+        return WomenFriendlyAssessment(
+            is_women_friendly=len(distinct_keywords) >= self.min_keywords,
+            keyword_hits=hits
+        )
+
+    def evidence_sentences(self, text: str) -> List[str]:
+        """For each keyword in the text, the sentence where it first appears"""
+        hits = self.find_keywords(text)
+        if not hits:
+            return []
+
+        first_hit: Dict[str, int] = {}
+        for hit in hits:
+            first_hit.setdefault(hit.keyword, hit.start)
+
+        # Sentence spans computed once and searched by offset
+        starts = [0]
+        ends = []
+        for separator in _SENTENCE_BREAK_RE.finditer(text):
+            ends.append(separator.start())
+            starts.append(separator.end())
+        ends.append(len(text))
+
+        sentences = []
+        for keyword in self.keywords:
+            if keyword in first_hit:
+                i = bisect.bisect_right(starts, first_hit[keyword]) - 1
+                sentences.append(text[starts[i]:ends[i]].strip())
+        return sentences
+
+
+_default_classifier: Optional[WomenFriendlyClassifier] = None
+
+
+def get_women_friendly_classifier() -> WomenFriendlyClassifier:
+    """The shared classifier built from the default company and keyword lists"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = WomenFriendlyClassifier()
+    return _default_classifier